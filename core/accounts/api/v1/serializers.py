@@ -6,6 +6,7 @@ from django.contrib.auth import authenticate
 from django.shortcuts import get_object_or_404
 from django.core import exceptions
 from ...models import User, Profile
+from core import images
 
 
 class RegistrationSerializers(serializers.ModelSerializer):
@@ -124,6 +125,7 @@ class ProfileSerializer(serializers.ModelSerializer):
     Serializer for Profile model plus email field
     """
     email = serializers.CharField(source="user.email", read_only=True)
+    image_renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
@@ -133,8 +135,17 @@ class ProfileSerializer(serializers.ModelSerializer):
             "first_name",
             "last_name",
             "image",
+            "image_renditions",
             "description"]
 
+    def get_image_renditions(self, obj):
+        """
+        URLs of the resized JPEG and WebP versions of the image, by width.
+        """
+        return images.rendition_urls(
+            obj.image.storage, obj.image_renditions, self.context.get("request")
+        )
+
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
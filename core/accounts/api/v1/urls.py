@@ -21,4 +21,5 @@ urlpatterns = [
     path('activation/resend/', views.ActivationResendAPIView.as_view(), name="activation-resend"),
     path('reset-password/email/', views.EmailResetPasswordView.as_view(), name="reset-password-email"),
     path('reset-password/<str:token>', views.ResetPasswordView.as_view(), name="reset-password"),
+    path("auth-stats/", views.AuthenticationStatsAPIView.as_view(), name="auth-stats"),
 ]
@@ -2,7 +2,7 @@ from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
 from rest_framework import generics
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework_simplejwt.views import TokenObtainPairView
@@ -10,7 +10,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from jwt.exceptions import ExpiredSignatureError, InvalidSignatureError, DecodeError
 from django.shortcuts import get_object_or_404
 from django.conf import settings
-from mail_templated import EmailMessage
+from django.db import transaction
 
 from accounts.models import User, Profile
 from .serializers import (
@@ -23,10 +23,23 @@ from .serializers import (
     EmailResetPasswordSerializer,
     ResetPasswordSerializer,
 )
-from .utils import EmailThread
+from ...authentication import stats as auth_stats
+from ...throttling import IPRateThrottle, EmailRateThrottle
+from ...tasks import send_templated_email
 import jwt
 
 
+def queue_email(template_name, context, recipient_list):
+    """
+    Send a templated email from a celery worker once the request commits.
+    """
+    transaction.on_commit(
+        lambda: send_templated_email.delay(
+            template_name, context, 'admin@admin.com', recipient_list
+        )
+    )
+
+
 class RegistrationApiView(generics.GenericAPIView):
     """
     Post user with email and password
@@ -36,6 +49,8 @@ class RegistrationApiView(generics.GenericAPIView):
 
     """
     serializer_class = RegistrationSerializers
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = "registration"
 
     def post(self, request, *args, **kwargs):
         serializer = RegistrationSerializers(data=request.data)
@@ -44,8 +59,7 @@ class RegistrationApiView(generics.GenericAPIView):
             email = serializer.validated_data["email"]
             user_obj = get_object_or_404(User, email=email)
             token = self.get_token_for_user(user_obj)
-            email_obj = EmailMessage('email/activation_email.tpl', {'token': token}, 'admin@admin.com', [email])
-            EmailThread(email_obj).start()
+            queue_email('email/activation_email.tpl', {'token': token}, [email])
             data = {"email": email}
             return Response(data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status.HTTP_400_BAD_REQUEST)
@@ -64,6 +78,8 @@ class CustomObtainAuthToken(ObtainAuthToken):
     Response contain token, user id and email of user
     """
     serializer_class = CustomAuthTokenSerializer
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = "login"
 
     def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(
@@ -148,6 +164,8 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     Expects email and password in request data.
     """
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = "login"
 
 class EmailTesting(generics.GenericAPIView):
     """
@@ -156,8 +174,7 @@ class EmailTesting(generics.GenericAPIView):
     def get(self, request, *args, **kwargs):
         user_obj = get_object_or_404(User, email='user@gmail.com')
         token = self.get_token_for_user(user_obj)
-        email_obj = EmailMessage('email/activation_email.tpl', {'token': token}, 'admin@admin.com', ['user@gmail.com'])
-        EmailThread(email_obj).start()
+        queue_email('email/activation_email.tpl', {'token': token}, ['user@gmail.com'])
         return Response('email sent')
     
     def get_token_for_user(self, user):
@@ -199,14 +216,15 @@ class ActivationResendAPIView(generics.GenericAPIView):
     Sending email with jwt token
     """
     serializer_class = ActivationResendSerializer
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = "activation-resend"
 
     def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
         user_obj = serializer.validated_data['user_obj']
         token = self.get_token_for_user(user_obj)
-        email_obj = EmailMessage('email/activation_email.tpl', {'token': token}, 'admin@admin.com', [user_obj.email])
-        EmailThread(email_obj).start()
+        queue_email('email/activation_email.tpl', {'token': token}, [user_obj.email])
         return Response({'details': 'User activation resend successfuly!'}, status=status.HTTP_200_OK)
     
     def get_token_for_user(self, user):
@@ -223,14 +241,15 @@ class EmailResetPasswordView(generics.GenericAPIView):
     The url for get new password build with jwttoken.
     """
     serializer_class = EmailResetPasswordSerializer
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = "reset-password"
 
     def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
         user_obj = serializer.validated_data['user_obj']
         token = self.get_token_for_user(user_obj)
-        email_obj = EmailMessage('email/reset_password_email.tpl', {'token': token}, 'admin@admin.com', [user_obj.email])
-        EmailThread(email_obj).start()
+        queue_email('email/reset_password_email.tpl', {'token': token}, [user_obj.email])
         return Response({'details': 'Email sent successfuly!'}, status=status.HTTP_200_OK)
     
     def get_token_for_user(self, user):
@@ -263,3 +282,18 @@ class ResetPasswordView(generics.GenericAPIView):
         return Response(
                 {"detail": "Password change successfuly!"}, status=status.HTTP_200_OK
         )
+
+
+class AuthenticationStatsAPIView(APIView):
+    """
+    Calls, outcomes and time spent per authentication class.
+    DELETE resets the counters. Restricted to admin users.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(auth_stats.get())
+
+    def delete(self, request):
+        auth_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
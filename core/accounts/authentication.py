@@ -0,0 +1,259 @@
+"""
+Authentication classes that resolve users from the cache, and the
+configurable authentication chains that run them.
+
+Authenticated users are cached by primary key and auth tokens by a hash
+of their key for ``ACCOUNTS_AUTH_CACHE_TIMEOUT`` seconds, so most API
+calls authenticate without a query. The receivers at the bottom of
+accounts/models.py drop the entries when a user is saved or deleted
+(password changes, is_active flips) and when a token is deleted.
+Queryset updates skip those signals; their changes show up once the
+entries expire.
+
+ChainedAuthentication, the only DRF default class, picks the classes to
+try per view from settings.API_AUTHENTICATION_CHAINS and times each of
+them, so the cost of credential checks can be read from the stats
+endpoint.
+"""
+from collections import Counter
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext_lazy as _
+from django_redis import get_redis_connection
+from functools import lru_cache
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, TokenAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+import copy
+import hashlib
+import threading
+import time
+
+
+def user_cache_key(user_id):
+    return f"accounts:auth:user:{user_id}"
+
+
+def token_cache_key(key):
+    # Token keys are credentials, keep them out of the cache key space
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return f"accounts:auth:token:{digest}"
+
+
+def get_cached_user(user_id):
+    return cache.get(user_cache_key(user_id))
+
+
+def cache_user(user):
+    """
+    Cache ``user`` without the related objects loaded on it, like the
+    auth_token TokenAuthentication joins in, so no token key is stored.
+    """
+    # Model copies get their own _state and fields_cache
+    cached = copy.copy(user)
+    cached._state.fields_cache = {}
+    cached.__dict__.pop("_prefetched_objects_cache", None)
+    cache.set(user_cache_key(user.pk), cached, settings.ACCOUNTS_AUTH_CACHE_TIMEOUT)
+
+
+def invalidate_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def invalidate_token(key):
+    cache.delete(token_cache_key(key))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication with cached users. Only active users are cached,
+    and the user id claim must hold the primary key, simplejwt's default.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = get_cached_user(user_id) if user_id is not None else None
+        if user is None:
+            user = super().get_user(validated_token)
+            cache_user(user)
+        elif api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise exceptions.AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        return user
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication with cached tokens and users.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = cache.get(token_cache_key(key))
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            cache.set(
+                token_cache_key(key),
+                (token.user_id, token.created),
+                settings.ACCOUNTS_AUTH_CACHE_TIMEOUT,
+            )
+            cache_user(user)
+            return user, token
+
+        user_id, created = cached
+        user = get_cached_user(user_id)
+        if user is None:
+            user = get_user_model().objects.filter(pk=user_id).first()
+            if user is None or not user.is_active:
+                raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+            cache_user(user)
+        token = self.get_model()(key=key, user=user, created=created)
+        return user, token
+
+
+DEFAULT_CHAIN = "default"
+
+
+@lru_cache(maxsize=None)
+def load_chain(paths):
+    return [import_string(path) for path in paths]
+
+
+def get_chain_name(request):
+    """
+    The chain of a request: the view's ``authentication_chain``, else the
+    chain named after its URL namespace, e.g. "blog:api-v2" or "api-v2",
+    else the default one.
+    """
+    view = (request.parser_context or {}).get("view")
+    name = getattr(view, "authentication_chain", None)
+    if name is not None:
+        return name
+    match = getattr(request._request, "resolver_match", None)
+    if match is not None and match.namespaces:
+        for candidate in (match.namespace, match.namespaces[-1]):
+            if candidate in settings.API_AUTHENTICATION_CHAINS:
+                return candidate
+    return DEFAULT_CHAIN
+
+
+class AuthenticationStats:
+    """
+    Per-authenticator call counts and time spent, by outcome. Counts are
+    added up in process and written to Redis hashes at most every
+    ``flush_interval`` seconds, so recording costs no round trip.
+    """
+    key_prefix = "accounts:auth-stats"
+    outcomes = ("authenticated", "skipped", "failed")
+    flush_interval = 10
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.last_flush = time.monotonic()
+
+    def record(self, name, outcome, elapsed):
+        now = time.monotonic()
+        with self.lock:
+            self.counts[(name, outcome)] += 1
+            self.counts[(name, f"{outcome}_us")] += int(elapsed * 1000000)
+            due = now - self.last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            counts, self.counts = self.counts, Counter()
+            self.last_flush = time.monotonic()
+        if not counts:
+            return
+        client = get_redis_connection("default")
+        with client.pipeline(transaction=False) as pipe:
+            for (name, field), value in counts.items():
+                pipe.sadd(self.key_prefix, name)
+                pipe.hincrby(f"{self.key_prefix}:{name}", field, value)
+            pipe.execute()
+
+    def get(self):
+        """
+        Return the counters of every authenticator, including this
+        process's unflushed ones.
+        """
+        self.flush()
+        client = get_redis_connection("default")
+        names = sorted(name.decode() for name in client.smembers(self.key_prefix))
+        with client.pipeline(transaction=False) as pipe:
+            for name in names:
+                pipe.hgetall(f"{self.key_prefix}:{name}")
+            rows = pipe.execute()
+        stats = {}
+        for name, row in zip(names, rows):
+            values = {field.decode(): int(value) for field, value in row.items()}
+            entry = {outcome: values.get(outcome, 0) for outcome in self.outcomes}
+            total_us = sum(values.get(f"{outcome}_us", 0) for outcome in self.outcomes)
+            calls = sum(entry.values())
+            entry["calls"] = calls
+            entry["total_ms"] = round(total_us / 1000, 3)
+            entry["mean_ms"] = round(total_us / 1000 / calls, 3) if calls else 0
+            stats[name] = entry
+        return stats
+
+    def reset(self):
+        with self.lock:
+            self.counts = Counter()
+        client = get_redis_connection("default")
+        names = [name.decode() for name in client.smembers(self.key_prefix)]
+        client.delete(self.key_prefix, *(f"{self.key_prefix}:{name}" for name in names))
+
+
+stats = AuthenticationStats()
+
+
+class ChainedAuthentication(BaseAuthentication):
+    """
+    Try the authentication classes of the request's chain in order, see
+    get_chain_name. Put cheap checks first: Basic credentials cost a full
+    password hash on every request, so it belongs last or nowhere.
+    """
+
+    def __init__(self):
+        self.authenticators = None
+        self.authenticator = None
+
+    def get_authenticators(self, request):
+        if self.authenticators is None:
+            chains = settings.API_AUTHENTICATION_CHAINS
+            paths = chains.get(get_chain_name(request), chains[DEFAULT_CHAIN])
+            self.authenticators = [cls() for cls in load_chain(tuple(paths))]
+        return self.authenticators
+
+    def authenticate(self, request):
+        for authenticator in self.get_authenticators(request):
+            name = f"{type(authenticator).__module__}.{type(authenticator).__name__}"
+            start = time.perf_counter()
+            try:
+                user_auth_tuple = authenticator.authenticate(request)
+            except exceptions.APIException:
+                stats.record(name, "failed", time.perf_counter() - start)
+                raise
+            if user_auth_tuple is None:
+                stats.record(name, "skipped", time.perf_counter() - start)
+                continue
+            stats.record(name, "authenticated", time.perf_counter() - start)
+            self.authenticator = authenticator
+            return user_auth_tuple
+        return None
+
+    def authenticate_header(self, request):
+        # DRF asks the first class for the WWW-Authenticate header
+        authenticators = self.get_authenticators(request)
+        if authenticators:
+            return authenticators[0].authenticate_header(request)
+        return None
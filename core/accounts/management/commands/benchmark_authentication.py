@@ -0,0 +1,70 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import RefreshToken
+
+import statistics
+import time
+
+from ...authentication import CachedJWTAuthentication, CachedTokenAuthentication
+from ...models import User
+
+
+class Command(BaseCommand):
+    """
+    Measure the authentication overhead of one request with the stock
+    and the cached Token and JWT authentication classes. The user is
+    created inside a transaction that is rolled back.
+    """
+    help = 'benchmark per-request authentication with and without the cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        with transaction.atomic():
+            user = User.objects.create_user(
+                email='benchmark@benchmark.com', password='Zz@12345'
+            )
+            token = Token.objects.create(user=user)
+            access = RefreshToken.for_user(user).access_token
+            cases = [
+                ('token', f'Token {token.key}', TokenAuthentication,
+                 CachedTokenAuthentication),
+                ('jwt', f'Bearer {access}', JWTAuthentication,
+                 CachedJWTAuthentication),
+            ]
+            for label, header, stock, cached in cases:
+                factory = APIRequestFactory()
+                request = Request(factory.get('/', HTTP_AUTHORIZATION=header))
+                before = self.measure(stock(), request, repeat)
+                cache.clear()
+                after = self.measure(cached(), request, repeat)
+                self.report(label, before, after)
+            transaction.set_rollback(True)
+
+    def measure(self, authenticator, request, repeat):
+        # Warm up, so the cached classes are measured on cache hits
+        authenticator.authenticate(request)
+        with CaptureQueriesContext(connection) as queries:
+            authenticator.authenticate(request)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            authenticator.authenticate(request)
+            timings.append((time.perf_counter() - start) * 1000000)
+        return statistics.median(timings), len(queries)
+
+    def report(self, label, before, after):
+        self.stdout.write(
+            f'{label:>6}: stock {before[0]:8.1f} us ({before[1]} queries)'
+            f' | cached {after[0]:8.1f} us ({after[1]} queries)'
+            f' | {before[0] / after[0]:5.1f}x'
+        )
@@ -0,0 +1,124 @@
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+from mail_templated import EmailMessage
+from rest_framework.test import APIClient
+from unittest.mock import patch
+
+import threading
+import time
+
+from ... import tasks
+
+
+class SimulatedSMTPBackend(EmailBackend):
+    """
+    In-memory backend with the cost profile of an SMTP server: opening a
+    connection takes ``connect_ms`` and every message ``send_ms``.
+    """
+    connect_ms = 0
+    send_ms = 0
+    opened = 0
+    lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connected = False
+
+    def open(self):
+        if self.connected:
+            return False
+        time.sleep(self.connect_ms / 1000)
+        with self.lock:
+            SimulatedSMTPBackend.opened += 1
+        self.connected = True
+        return True
+
+    def close(self):
+        self.connected = False
+
+    def send_messages(self, messages):
+        new_connection = self.open()
+        time.sleep(self.send_ms * len(messages) / 1000)
+        sent = super().send_messages(messages)
+        if new_connection:
+            self.close()
+        return sent
+
+
+class Command(BaseCommand):
+    """
+    Compare registration throughput and email delivery of the former
+    thread-per-email sending with the celery task. Emails go to a
+    simulated SMTP server and the celery queue is drained in-process,
+    like a single worker would. Passwords use a fast hasher so the
+    email path dominates. Users are created inside a transaction that
+    is rolled back.
+    """
+    help = 'benchmark account registration with threaded and celery emails'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--connect-ms', type=float, default=30)
+        parser.add_argument('--send-ms', type=float, default=5)
+
+    def handle(self, *args, **options):
+        SimulatedSMTPBackend.connect_ms = options['connect_ms']
+        SimulatedSMTPBackend.send_ms = options['send_ms']
+        backend = f'{__name__}.SimulatedSMTPBackend'
+        hashers = ['django.contrib.auth.hashers.MD5PasswordHasher']
+        with override_settings(EMAIL_BACKEND=backend, PASSWORD_HASHERS=hashers):
+            for mode in ('threads', 'celery'):
+                with transaction.atomic():
+                    self.report(mode, *self.run(mode, options['users']))
+                    transaction.set_rollback(True)
+
+    def run(self, mode, users):
+        SimulatedSMTPBackend.opened = 0
+        tasks.close_email_connection()
+        threads, queued = [], []
+
+        def send_in_thread(template_name, context, recipient_list):
+            # The removed EmailThread: one thread and connection per email
+            message = EmailMessage(
+                template_name, context, 'admin@admin.com', recipient_list
+            )
+            thread = threading.Thread(target=message.send)
+            thread.start()
+            threads.append(thread)
+
+        def send_with_celery(template_name, context, recipient_list):
+            queued.append((template_name, context, 'admin@admin.com', recipient_list))
+
+        sender = send_in_thread if mode == 'threads' else send_with_celery
+        client = APIClient()
+        url = reverse('accounts:api-v1:registration')
+        peak_threads = threading.active_count()
+        with patch('accounts.api.v1.views.queue_email', sender):
+            start = time.perf_counter()
+            for i in range(users):
+                password = 'Zz12345#'
+                client.post(url, {
+                    'email': f'benchmark{i}@benchmark.com',
+                    'password': password,
+                    'password1': password,
+                })
+                peak_threads = max(peak_threads, threading.active_count())
+            requests = time.perf_counter() - start
+            for thread in threads:
+                thread.join()
+            for message in queued:
+                tasks.send_templated_email(*message)
+            delivered = time.perf_counter() - start
+        tasks.close_email_connection()
+        return users, requests, delivered, SimulatedSMTPBackend.opened, peak_threads
+
+    def report(self, mode, users, requests, delivered, connections, peak_threads):
+        self.stdout.write(
+            f'{mode:>8}: {users / requests:8.1f} registrations per second'
+            f' | all emails sent after {delivered * 1000:8.1f} ms'
+            f' | {connections:5d} SMTP connections'
+            f' | {peak_threads:4d} peak threads'
+        )
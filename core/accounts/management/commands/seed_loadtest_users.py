@@ -0,0 +1,84 @@
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+import csv
+import random
+
+from blog.models import Post, Category
+from ...models import User, Profile
+
+category_list = [
+    'IT',
+    'Fun',
+    'Movie',
+    'Photo'
+]
+
+
+class Command(BaseCommand):
+    """
+    Create verified users for the locust suite, each with a few live
+    posts, and write their credentials to a CSV file that
+    locust/locustfile.py reads. Running it again reuses existing users
+    and resets their password.
+    """
+    help = 'seed users and posts for the load tests'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--posts-per-user', type=int, default=5)
+        parser.add_argument('--password', default='Zz@12345')
+        parser.add_argument('--email-format', default='loadtest{}@example.com')
+        parser.add_argument('--output', default='locust/credentials.csv')
+
+    def handle(self, *args, **options):
+        fake = Faker()
+        password = options['password']
+        # One hash for every user, hashing per user would dominate seeding
+        hashed = make_password(password)
+        emails = [options['email_format'].format(i) for i in range(options['users'])]
+
+        with transaction.atomic():
+            categories = [
+                Category.objects.get_or_create(name=name)[0] for name in category_list
+            ]
+            existing = set(
+                User.objects.filter(email__in=emails).values_list('email', flat=True)
+            )
+            User.objects.filter(email__in=existing).update(
+                password=hashed, is_verified=True, is_active=True
+            )
+            for email in emails:
+                if email not in existing:
+                    # Saved one by one, post_save creates the profile
+                    User.objects.create(email=email, password=hashed, is_verified=True)
+
+            # Saved one by one, so the search index and list caches follow
+            profiles = Profile.objects.filter(user__email__in=emails).exclude(
+                post__isnull=False
+            )
+            posts = 0
+            for profile in profiles:
+                for _ in range(options['posts_per_user']):
+                    Post.objects.create(
+                        author=profile,
+                        title=fake.sentence(),
+                        content=fake.paragraph(nb_sentences=5),
+                        category=random.choice(categories),
+                        status=True,
+                        published_date=timezone.now(),
+                    )
+                    posts += 1
+
+        with open(options['output'], 'w', newline='') as output:
+            writer = csv.writer(output)
+            writer.writerow(['email', 'password'])
+            for email in emails:
+                writer.writerow([email, password])
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(emails)} users ({len(emails) - len(existing)} new) and '
+            f'{posts} posts, credentials written to {options["output"]}'
+        ))
@@ -0,0 +1,58 @@
+"""
+Request-scoped access to the profile of the requesting user.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.functional import SimpleLazyObject
+
+from .models import Profile
+
+
+def get_profile(request):
+    """
+    Profile of the request's user, loaded once per request and user;
+    None for anonymous users.
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return None
+    profile = getattr(request, "_cached_profile", None)
+    if profile is None or profile.user_id != user.pk:
+        profile = Profile.objects.get(user_id=user.pk)
+        # profile.user is already at hand, don't query it again
+        profile.user = user
+        request._cached_profile = profile
+    return profile
+
+
+class ProfileMiddleware:
+    """
+    Set ``request.profile`` to a lazy profile of the requesting user.
+    The query runs on first use, so it picks up the user DRF
+    authenticates, and requests that never touch the profile skip it.
+    Anonymous requests get a falsy profile.
+
+    It runs in either mode, so ASGI requests reach the async views
+    without a thread hop. Async code must not touch the profile, its
+    query is synchronous.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        self.process_request(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        self.process_request(request)
+        return await self.get_response(request)
+
+    def process_request(self, request):
+        request.profile = SimpleLazyObject(lambda: get_profile(request))
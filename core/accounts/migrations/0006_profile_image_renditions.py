@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-10-18 20:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_alter_profile_user"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="image_renditions",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -1,11 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.models import (
     BaseUserManager,
     AbstractBaseUser,
     PermissionsMixin,
 )
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 class UserManager(BaseUserManager):
@@ -64,10 +64,19 @@ class Profile(models.Model):
     first_name = models.CharField(max_length=250)
     last_name = models.CharField(max_length=250)
     image = models.ImageField(blank=True, null=True)
+    # Resized and WebP versions of image, written by accounts.tasks
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     description = models.TextField()
     created_date = models.DateTimeField(auto_now_add=True)
     updated_date = models.DateTimeField(auto_now=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored image, so only new uploads get rendered
+        instance._loaded_image = instance.__dict__.get("image")
+        return instance
+
     @property
     def display_name(self):
         full_name = f"{self.first_name or ''} {self.last_name or ''}".strip()
@@ -83,3 +92,44 @@ def save_profile(sender, instance, created, **kwargs):
     """
     if created:
         Profile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=Profile)
+def schedule_image_renditions(sender, instance, update_fields=None, **kwargs):
+    """
+    Render a new or replaced image in the background once it is committed
+    """
+    if update_fields and "image" not in update_fields:
+        return
+    name = instance.image.name or None
+    if name == (getattr(instance, "_loaded_image", None) or None):
+        return
+    instance._loaded_image = name
+    from .tasks import generate_profile_renditions
+
+    transaction.on_commit(lambda: generate_profile_renditions.delay(instance.pk))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Drop the user cached by accounts.authentication, again after commit
+    so a concurrent request can't cache the old row until it expires
+    """
+    from .authentication import invalidate_user
+
+    # Deleted instances lose their pk before the commit
+    user_id = instance.pk
+    invalidate_user(user_id)
+    transaction.on_commit(lambda: invalidate_user(user_id))
+
+
+@receiver(post_delete, sender="authtoken.Token")
+def invalidate_cached_token(sender, instance, **kwargs):
+    """
+    Drop the token cached by accounts.authentication
+    """
+    from .authentication import invalidate_token
+
+    invalidate_token(instance.key)
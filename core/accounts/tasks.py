@@ -1,10 +1,92 @@
 from celery import shared_task
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from django.core.mail import get_connection
+from mail_templated import EmailMessage
+from smtplib import SMTPException, SMTPServerDisconnected
 from time import sleep
 
+from core import images
+from .models import Profile
+
+# SMTP connection kept open across the emails a worker process sends
+_connection = None
+
 @shared_task
 def sendEmail():
     """
     A test task for testing celery
     """
     sleep(3)
-    print('done sending email')
\ No newline at end of file
+    print('done sending email')
+
+
+@shared_task(ignore_result=True)
+def generate_profile_renditions(profile_id):
+    """
+    Render the resized and WebP versions of a profile image.
+    """
+    images.refresh_renditions(Profile, profile_id)
+
+
+def get_email_connection():
+    """
+    Return the open email connection of this process, opening it if needed.
+    """
+    global _connection
+    if _connection is None:
+        _connection = get_connection()
+    _connection.open()
+    return _connection
+
+
+def close_email_connection():
+    global _connection
+    if _connection is not None:
+        try:
+            _connection.close()
+        except (SMTPException, OSError):
+            pass
+        _connection = None
+
+
+@worker_process_shutdown.connect
+def close_email_connection_on_shutdown(**kwargs):
+    close_email_connection()
+
+
+@shared_task(
+    ignore_result=True,
+    # Only acknowledged once sent, so a restarted worker picks it up again
+    acks_late=True,
+    autoretry_for=(SMTPException, OSError),
+    retry_backoff=True,
+    retry_backoff_max=60 * 10,
+    max_retries=6,
+    rate_limit=settings.ACCOUNTS_EMAIL_RATE_LIMIT,
+)
+def send_templated_email(template_name, context, from_email, recipient_list):
+    """
+    Render a mail_templated template and send it over the reused
+    connection of this worker process, one message per task.
+
+    Celery applies ``rate_limit`` per worker instance. The task is routed
+    to settings.ACCOUNTS_EMAIL_QUEUE, which a single worker consumes, so
+    ACCOUNTS_EMAIL_RATE_LIMIT is the global cap only as long as that
+    worker is the queue's only consumer; every extra consumer adds its
+    own allowance.
+    """
+    # Rendered here: only EmailMessage.send() renders on its own
+    message = EmailMessage(
+        template_name, context, from_email, recipient_list, render=True
+    )
+    try:
+        try:
+            get_email_connection().send_messages([message])
+        except SMTPServerDisconnected:
+            # The server dropped the idle connection; reconnect once
+            close_email_connection()
+            get_email_connection().send_messages([message])
+    except (SMTPException, OSError):
+        close_email_connection()
+        raise
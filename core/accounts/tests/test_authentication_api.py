@@ -92,12 +92,15 @@ class TestAuthebticationAPI:
         response = auth_client_jwt.put(url, data=data)
         assert response.status_code == 200
 
-    def test_reset_password_send_email(self, api_client, user,):
-        with patch('accounts.api.v1.utils.EmailThread.start') as mock_start:
+    def test_reset_password_send_email(
+        self, api_client, user, django_capture_on_commit_callbacks
+    ):
+        with patch('accounts.api.v1.views.send_templated_email.delay') as mock_delay:
             url = reverse('accounts:api-v1:reset-password-email')
             data = {
                 "email": user.email
             }
-            response = api_client.post(url, data=data)
+            with django_capture_on_commit_callbacks(execute=True):
+                response = api_client.post(url, data=data)
         assert response.status_code == 200
-        mock_start.assert_called_once()
+        mock_delay.assert_called_once()
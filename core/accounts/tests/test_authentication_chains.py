@@ -0,0 +1,108 @@
+from rest_framework.authentication import BasicAuthentication
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.urls import reverse
+
+from ..authentication import ChainedAuthentication, stats
+from ..models import User
+import base64
+import pytest
+
+JWT = 'accounts.authentication.CachedJWTAuthentication'
+BASIC = 'rest_framework.authentication.BasicAuthentication'
+
+
+class WhoAmIView(APIView):
+    authentication_chain = 'basic-only'
+
+    def get(self, request):
+        return Response({'email': getattr(request.user, 'email', None)})
+
+
+@pytest.fixture(autouse=True)
+def auth_stats():
+    stats.reset()
+    yield stats
+    stats.reset()
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(
+        email='test@test.com', password='Zz12345#', is_verified=True
+    )
+
+@pytest.fixture
+def basic_client(user):
+    client = APIClient()
+    credentials = base64.b64encode(b'test@test.com:Zz12345#').decode()
+    client.credentials(HTTP_AUTHORIZATION=f'Basic {credentials}')
+    return client
+
+@pytest.fixture
+def jwt_client(user):
+    client = APIClient()
+    access = RefreshToken.for_user(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+    return client
+
+
+@pytest.mark.django_db
+class TestAuthenticationChains:
+
+    def test_default_chain_accepts_basic(self, basic_client):
+        response = basic_client.get(reverse('accounts:api-v1:profile'))
+        assert response.status_code == 200
+
+    def test_v2_chain_skips_basic(self, basic_client, jwt_client):
+        url = reverse('blog:api-v2:category-list')
+        response = basic_client.post(url, {'name': 'basic'})
+        assert response.status_code == 401
+        assert response['WWW-Authenticate'].startswith('Bearer')
+        assert BASIC not in stats.get()
+        assert jwt_client.post(url, {'name': 'jwt'}).status_code == 201
+
+    def test_view_attribute_selects_chain(self, settings, user):
+        settings.API_AUTHENTICATION_CHAINS = {
+            **settings.API_AUTHENTICATION_CHAINS,
+            'basic-only': [BASIC],
+        }
+        view = WhoAmIView.as_view()
+        factory = APIRequestFactory()
+        access = RefreshToken.for_user(user).access_token
+        request = factory.get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        assert view(request).data == {'email': None}
+
+        credentials = base64.b64encode(b'test@test.com:Zz12345#').decode()
+        request = factory.get('/', HTTP_AUTHORIZATION=f'Basic {credentials}')
+        response = view(request)
+        assert response.data == {'email': 'test@test.com'}
+        authenticator = response.renderer_context['request'].successful_authenticator
+        assert isinstance(authenticator, ChainedAuthentication)
+        assert isinstance(authenticator.authenticator, BasicAuthentication)
+
+    def test_outcomes_are_counted(self, jwt_client):
+        url = reverse('accounts:api-v1:profile')
+        jwt_client.get(url)
+        jwt_client.credentials(HTTP_AUTHORIZATION='Bearer broken')
+        jwt_client.get(url)
+        entry = stats.get()[JWT]
+        assert entry['calls'] == 2
+        assert entry['authenticated'] == 1
+        assert entry['failed'] == 1
+        assert entry['skipped'] == 0
+        assert entry['total_ms'] > 0
+
+    def test_stats_for_admin_only(self, jwt_client):
+        url = reverse('accounts:api-v1:auth-stats')
+        assert jwt_client.get(url).status_code == 403
+
+        admin = User.objects.create_superuser(
+            email='admin@admin.com', password='Zz12345#'
+        )
+        client = APIClient()
+        client.force_authenticate(admin)
+        assert JWT in client.get(url).data
+        assert client.delete(url).status_code == 204
+        assert client.get(url).data == {}
@@ -0,0 +1,93 @@
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.core.cache import cache
+from django.urls import reverse
+from django_redis import get_redis_connection
+
+from ..authentication import user_cache_key
+from ..models import User
+import pytest
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(email='test@test.com', password='Zz12345#')
+
+@pytest.fixture
+def token(user):
+    return Token.objects.create(user=user)
+
+@pytest.fixture
+def jwt_client(user):
+    client = APIClient()
+    access = RefreshToken.for_user(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+    return client
+
+@pytest.fixture
+def token_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client
+
+@pytest.fixture
+def url():
+    # Authenticated endpoint that loads the profile and its user
+    return reverse('accounts:api-v1:profile')
+
+
+@pytest.mark.django_db
+class TestCachedAuthentication:
+
+    @pytest.mark.parametrize('client_fixture', ['jwt_client', 'token_client'])
+    def test_user_is_cached(
+        self, request, client_fixture, url, django_assert_num_queries
+    ):
+        client = request.getfixturevalue(client_fixture)
+        # Authentication query plus the profile and its user
+        with django_assert_num_queries(3):
+            assert client.get(url).status_code == 200
+        with django_assert_num_queries(2):
+            assert client.get(url).status_code == 200
+
+    def test_cached_user_holds_no_token_key(self, token_client, token, user, url):
+        assert token_client.get(url).status_code == 200
+        key = cache.make_key(user_cache_key(user.pk))
+        blob = get_redis_connection('default').get(key)
+        assert blob is not None
+        assert token.key.encode() not in blob
+
+    def test_discarded_token_is_rejected(self, token_client, url):
+        assert token_client.get(url).status_code == 200
+        response = token_client.post(reverse('accounts:api-v1:token-logout'))
+        assert response.status_code == 204
+        assert token_client.get(url).status_code == 401
+
+    @pytest.mark.parametrize('client_fixture', ['jwt_client', 'token_client'])
+    def test_deactivated_user_is_rejected(self, request, client_fixture, user, url):
+        client = request.getfixturevalue(client_fixture)
+        assert client.get(url).status_code == 200
+        user.is_active = False
+        user.save()
+        assert client.get(url).status_code == 401
+
+    def test_deleted_user_is_rejected(self, token_client, user, url):
+        assert token_client.get(url).status_code == 200
+        user.delete()
+        assert token_client.get(url).status_code == 401
+
+    def test_password_change_refreshes_user(self, jwt_client, user, url):
+        assert jwt_client.get(url).status_code == 200
+        response = jwt_client.put(reverse('accounts:api-v1:change-password'), {
+            'old_password': 'Zz12345#',
+            'new_password': 'New12345#',
+            'new_password1': 'New12345#',
+        })
+        assert response.status_code == 200
+        # The cached user would still accept the old password
+        response = jwt_client.put(reverse('accounts:api-v1:change-password'), {
+            'old_password': 'Zz12345#',
+            'new_password': 'Other12345#',
+            'new_password1': 'Other12345#',
+        })
+        assert response.status_code == 400
@@ -0,0 +1,102 @@
+from rest_framework.test import APIClient
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.urls import reverse
+from smtplib import SMTPServerDisconnected
+from unittest.mock import patch
+
+from core.celery import app
+from .. import tasks
+import pytest
+
+@pytest.fixture(autouse=True)
+def email_connection():
+    tasks.close_email_connection()
+    yield
+    tasks.close_email_connection()
+
+@pytest.fixture
+def opened():
+    """
+    Count the connections opened by the locmem backend.
+    """
+    opened = []
+    with patch.object(EmailBackend, 'open', lambda self: opened.append(self)):
+        yield opened
+
+
+@pytest.mark.django_db
+class TestEmailTasks:
+
+    def test_renders_and_sends_template(self):
+        tasks.send_templated_email(
+            'email/activation_email.tpl', {'token': 'abc'}, 'admin@admin.com',
+            ['user@test.com'],
+        )
+        assert len(mail.outbox) == 1
+        message = mail.outbox[0]
+        assert message.subject == 'Activation Email'
+        assert message.to == ['user@test.com']
+        assert 'activation/abc' in message.body
+
+    def test_reuses_connection(self, opened):
+        for token in ('a', 'b', 'c'):
+            tasks.send_templated_email(
+                'email/reset_password_email.tpl', {'token': token},
+                'admin@admin.com', ['user@test.com'],
+            )
+        assert len(mail.outbox) == 3
+        assert len({id(connection) for connection in opened}) == 1
+
+    def test_reconnects_after_disconnect(self, opened):
+        send = EmailBackend.send_messages
+        calls = []
+
+        def flaky(self, messages):
+            calls.append(self)
+            if len(calls) == 1:
+                raise SMTPServerDisconnected()
+            return send(self, messages)
+
+        with patch.object(EmailBackend, 'send_messages', flaky):
+            tasks.send_templated_email(
+                'email/activation_email.tpl', {'token': 'abc'},
+                'admin@admin.com', ['user@test.com'],
+            )
+        assert len(mail.outbox) == 1
+        assert calls[0] is not calls[1]
+
+    def test_failures_are_retried(self):
+        task = tasks.send_templated_email
+        assert task.acks_late
+        assert task.max_retries
+        with patch.object(
+            EmailBackend, 'send_messages', side_effect=ConnectionRefusedError
+        ), patch.object(task, 'retry', side_effect=RuntimeError) as retry:
+            with pytest.raises(RuntimeError):
+                task.apply(
+                    args=('email/activation_email.tpl', {'token': 'abc'},
+                          'admin@admin.com', ['user@test.com']),
+                    throw=True,
+                )
+        retry.assert_called_once()
+        # The broken connection is not reused
+        assert tasks._connection is None
+
+    def test_registration_queues_activation_email(
+        self, django_capture_on_commit_callbacks
+    ):
+        url = reverse('accounts:api-v1:registration')
+        data = {
+            "email": "new@test.com",
+            "password": "Zz12345#",
+            "password1": "Zz12345#",
+        }
+        with django_capture_on_commit_callbacks(execute=True):
+            response = APIClient().post(url, data=data)
+        assert response.status_code == 201
+        assert [message.to for message in mail.outbox] == [['new@test.com']]
+
+    def test_routed_to_the_email_queue(self, settings):
+        route = app.amqp.router.route({}, tasks.send_templated_email.name)
+        assert route['queue'].name == settings.ACCOUNTS_EMAIL_QUEUE
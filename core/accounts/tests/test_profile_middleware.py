@@ -0,0 +1,63 @@
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpRequest
+
+from ..middleware import ProfileMiddleware
+from ..models import User
+import pytest
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(email='test@test.com', password='Zz12345#')
+
+@pytest.fixture
+def make_request():
+    def make_request(user):
+        request = HttpRequest()
+        request.user = user
+        ProfileMiddleware(lambda request: None)(request)
+        return request
+    return make_request
+
+
+@pytest.mark.django_db
+class TestProfileMiddleware:
+
+    def test_profile_is_loaded_once(self, user, make_request, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            request = make_request(user)
+        with django_assert_num_queries(1):
+            assert request.profile.user_id == user.pk
+        with django_assert_num_queries(0):
+            assert request.profile.user is user
+
+    def test_anonymous_profile_is_falsy(self, make_request, django_assert_num_queries):
+        request = make_request(AnonymousUser())
+        with django_assert_num_queries(0):
+            assert not request.profile
+
+    def test_profile_follows_late_authentication(self, user, make_request):
+        # DRF sets request.user after the middleware ran
+        request = make_request(AnonymousUser())
+        request.user = user
+        assert request.profile.user_id == user.pk
+
+    def test_async_chain_is_not_adapted(self, settings, caplog):
+        # Adapted handlers are only logged in debug mode
+        settings.DEBUG = True
+        with caplog.at_level('DEBUG', logger='django.request'):
+            ASGIHandler()
+        assert not [
+            record for record in caplog.records if 'adapted' in record.getMessage()
+        ]
+
+    def test_async_profile(self, user):
+        async def get_response(request):
+            return request
+
+        middleware = ProfileMiddleware(get_response)
+        request = HttpRequest()
+        request.user = user
+        assert async_to_sync(middleware)(request) is request
+        assert request.profile.user_id == user.pk
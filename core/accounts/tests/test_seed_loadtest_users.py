@@ -0,0 +1,38 @@
+from django.core.management import call_command
+
+from blog.models import Post
+from ..models import User
+import csv
+import pytest
+
+
+@pytest.mark.django_db
+class TestSeedLoadtestUsers:
+
+    def test_seeds_users_posts_and_credentials(self, tmp_path):
+        output = tmp_path / 'credentials.csv'
+        call_command(
+            'seed_loadtest_users', users=3, posts_per_user=2, output=str(output)
+        )
+        with open(output, newline='') as credentials:
+            rows = list(csv.DictReader(credentials))
+        assert [row['email'] for row in rows] == [
+            f'loadtest{i}@example.com' for i in range(3)
+        ]
+        for row in rows:
+            user = User.objects.get(email=row['email'])
+            assert user.is_verified
+            assert user.check_password(row['password'])
+        assert Post.objects.filter(is_live=True).count() == 6
+
+    def test_rerun_reuses_users(self, tmp_path):
+        output = str(tmp_path / 'credentials.csv')
+        call_command('seed_loadtest_users', users=2, posts_per_user=1, output=output)
+        call_command(
+            'seed_loadtest_users', users=3, posts_per_user=1,
+            password='Other@123', output=output,
+        )
+        assert User.objects.count() == 3
+        # Only the new user gets posts
+        assert Post.objects.count() == 3
+        assert User.objects.get(email='loadtest0@example.com').check_password('Other@123')
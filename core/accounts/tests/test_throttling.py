@@ -0,0 +1,137 @@
+from rest_framework.test import APIClient
+from django.urls import reverse
+from unittest.mock import patch
+
+from ..models import User
+from ..throttling import RedisSlidingWindowThrottle
+from django_redis import get_redis_connection
+import pytest
+import redis
+
+RATES = {
+    'registration_ip': '3/min',
+    'registration_email': '2/min',
+    'login_ip': '3/min',
+    'login_email': '2/min',
+    'activation-resend_ip': '3/min',
+    'activation-resend_email': '2/min',
+    'reset-password_ip': '3/min',
+    'reset-password_email': '2/min',
+}
+
+@pytest.fixture(autouse=True)
+def rates(monkeypatch):
+    monkeypatch.setattr(RedisSlidingWindowThrottle, 'THROTTLE_RATES', RATES)
+    return RATES
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(
+        email='test@test.com', password='Zz12345#', is_verified=True
+    )
+
+@pytest.fixture
+def age():
+    """
+    Move every recorded request the given seconds into the past; the
+    windows run on the Redis clock.
+    """
+    def age(seconds):
+        client = get_redis_connection('default')
+        for key in client.scan_iter('accounts:throttle:*'):
+            members = client.zrange(key, 0, -1, withscores=True)
+            client.zadd(key, {
+                member: score - seconds * 1000 for member, score in members
+            })
+    return age
+
+
+def post(client, url_name, email, ip='10.0.0.1'):
+    return client.post(
+        reverse(f'accounts:api-v1:{url_name}'),
+        {'email': email, 'password': 'wrong'},
+        REMOTE_ADDR=ip,
+    )
+
+
+@pytest.mark.django_db
+class TestAccountThrottling:
+
+    @pytest.mark.parametrize('url_name', [
+        'registration', 'token-login', 'jwt-create',
+        'activation-resend', 'reset-password-email',
+    ])
+    def test_ip_scope(self, api_client, user, url_name):
+        for i in range(3):
+            assert post(api_client, url_name, f'user{i}@test.com').status_code != 429
+        response = post(api_client, url_name, 'user9@test.com')
+        assert response.status_code == 429
+        assert int(response['Retry-After']) <= 60
+        # Other addresses have their own window
+        response = post(api_client, url_name, 'user9@test.com', ip='10.0.0.2')
+        assert response.status_code != 429
+
+    def test_email_scope_across_addresses(self, api_client, user):
+        for i in range(2):
+            response = post(
+                api_client, 'reset-password-email', 'test@test.com', f'10.0.1.{i}'
+            )
+            assert response.status_code == 200
+        # Addresses are compared case-insensitively
+        response = post(
+            api_client, 'reset-password-email', ' TEST@test.com', '10.0.1.9'
+        )
+        assert response.status_code == 429
+
+    def test_login_views_share_scope(self, api_client, user):
+        assert post(api_client, 'token-login', 'test@test.com').status_code == 400
+        assert post(api_client, 'jwt-create', 'test@test.com').status_code == 401
+        assert post(api_client, 'token-login', 'test@test.com').status_code == 429
+
+    def test_window_slides(self, api_client, user, age):
+        for _ in range(2):
+            post(api_client, 'activation-resend', 'test@test.com')
+        age(30)
+        response = post(api_client, 'activation-resend', 'test@test.com')
+        assert response.status_code == 429
+        assert response['Retry-After'] == '30'
+        # The first requests leave the window one minute after they were made
+        age(30.5)
+        assert post(api_client, 'activation-resend', 'test@test.com').status_code != 429
+
+    def test_rejected_requests_are_not_counted(self, api_client, user, age):
+        for _ in range(2):
+            post(api_client, 'jwt-create', 'test@test.com')
+        age(30)
+        for _ in range(3):
+            assert post(api_client, 'jwt-create', 'test@test.com').status_code == 429
+        # Only the two allowed requests were in the window
+        age(30.5)
+        assert post(api_client, 'jwt-create', 'test@test.com').status_code == 401
+
+    def test_redis_errors_do_not_block(self, api_client, user):
+        with patch('redis.commands.core.Script.__call__') as script:
+            script.side_effect = redis.ConnectionError('down')
+            for _ in range(5):
+                response = post(api_client, 'jwt-create', 'test@test.com')
+                assert response.status_code == 401
+
+    def test_spoofed_forwarded_for_is_ignored(self, api_client, settings, user):
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}
+        url = reverse('accounts:api-v1:registration')
+        statuses = [
+            api_client.post(
+                url,
+                {'email': f'user{i}@test.com', 'password': 'wrong'},
+                REMOTE_ADDR='172.18.0.5',
+                # nginx appends the real address to what the client sent
+                HTTP_X_FORWARDED_FOR=f'1.2.3.{i}, 10.0.0.1',
+            ).status_code
+            for i in range(4)
+        ]
+        assert statuses[-1] == 429
+        assert 429 not in statuses[:-1]
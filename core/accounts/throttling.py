@@ -0,0 +1,129 @@
+"""
+Throttles of the account endpoints that hash a password or send an email.
+
+Each throttle keeps a sliding window log per client in a Redis sorted
+set: one member per allowed request, scored by its time. A Lua script
+drops expired members, counts the rest and records the new request in a
+single atomic step, so concurrent workers never over-admit the way
+DRF's cache read-modify-write can.
+
+Views set ``throttle_scope``; the rates are looked up in
+DEFAULT_THROTTLE_RATES as ``<scope>_ip`` and ``<scope>_email``.
+
+Windows are timed with the clock of the Redis server, so app servers
+with drifting clocks still share consistent windows. Client addresses
+come from DRF's get_ident, which trusts only the last NUM_PROXIES
+X-Forwarded-For entries; behind the nginx of default.conf it must be 1.
+"""
+from django_redis import get_redis_connection
+from rest_framework.throttling import SimpleRateThrottle
+
+import hashlib
+import logging
+import math
+import uuid
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# KEYS: the window key. ARGV: the window in milliseconds, the allowed
+# number of requests and a unique member for this request.
+# Returns 1 and 0 when allowed, else 0 and milliseconds until a slot frees.
+SLIDING_WINDOW_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return {1, 0}
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {0, tonumber(oldest[2]) + window - now}
+"""
+
+
+class RedisSlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Base class of the scoped throttles. Subclasses set ``scope_suffix``
+    and implement get_ident_value. Requests are let through when Redis
+    is unreachable, the endpoints still work without throttling.
+    """
+    cache_format = "accounts:throttle:%(scope)s:%(ident)s"
+    scope_suffix = None
+
+    def __init__(self):
+        # The rate depends on the view, see allow_request
+        self.retry_after = None
+
+    def get_ident_value(self, request):
+        raise NotImplementedError(".get_ident_value() must be overridden")
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_value(request)
+        if not ident:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        if not scope:
+            return True
+        self.scope = f"{scope}_{self.scope_suffix}"
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        client = get_redis_connection("default")
+        script = client.register_script(SLIDING_WINDOW_SCRIPT)
+        try:
+            allowed, retry_ms = script(
+                keys=[self.key],
+                args=[self.duration * 1000, self.num_requests, uuid.uuid4().hex],
+            )
+        except (redis.ConnectionError, redis.TimeoutError, OSError) as exc:
+            logger.warning("Skipped throttle %s: %s", self.scope, exc)
+            return True
+        if allowed:
+            return True
+        self.retry_after = retry_ms / 1000
+        return False
+
+    def wait(self):
+        if self.retry_after is None:
+            return None
+        return math.ceil(self.retry_after)
+
+
+class IPRateThrottle(RedisSlidingWindowThrottle):
+    """
+    Limits the requests of one client address to ``<scope>_ip``.
+    Spoofed X-Forwarded-For entries are ignored as long as NUM_PROXIES
+    matches the proxies in front of the app.
+    """
+    scope_suffix = "ip"
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class EmailRateThrottle(RedisSlidingWindowThrottle):
+    """
+    Limits the requests naming one email address to ``<scope>_email``,
+    whatever address they come from.
+    """
+    scope_suffix = "email"
+
+    def get_ident_value(self, request):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        # Keep addresses out of the key space, like the auth token keys
+        normalized = email.strip().lower().encode("utf-8")
+        return hashlib.sha256(normalized).hexdigest()
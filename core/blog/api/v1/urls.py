@@ -5,5 +5,6 @@ app_name = "api-v1"
 
 urlpatterns = [
     path("post/", views.postList, name="blog-list"),
+    path("post/export/", views.postExport, name="blog-export"),
     path("post/<int:pk>/", views.postDetail, name="blog-detail"),
 ]
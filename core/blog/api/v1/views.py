@@ -2,6 +2,8 @@ from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 
 from .permissions import IsOwnerOrReadonly
@@ -13,6 +15,9 @@ API v1 inplementation using Function-Based Views.
 Kept intentionally simple for educational comparison with cbv version.
 """
 
+# Rows fetched per database round trip while streaming an export
+EXPORT_CHUNK_SIZE = 2000
+
 @api_view(["GET", "POST"])
 @permission_classes([IsAuthenticated])
 def postList(request):
@@ -31,6 +36,27 @@ def postList(request):
         return Response(request.data)
 
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def postExport(request):
+    """
+    Streams every blog post as newline-delimited JSON, one post per line.
+    Rows are read in chunks, so memory use stays flat whatever the table size.
+    Access restricted to authenticated users.
+    """
+    posts = (
+        Post.objects.only(*PostSerializers.Meta.fields)
+        .order_by("id")
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    serializer = PostSerializers()
+    encoder = JSONEncoder()
+    lines = (
+        encoder.encode(serializer.to_representation(post)) + "\n" for post in posts
+    )
+    return StreamingHttpResponse(lines, content_type="application/x-ndjson")
+
+
 @api_view(["GET", "PUT", "DELETE"])
 @permission_classes([IsAuthenticated, IsOwnerOrReadonly])
 def postDetail(request, pk):
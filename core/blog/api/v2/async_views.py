@@ -0,0 +1,93 @@
+"""
+Async read-only counterparts of the hot v2 post endpoints, for ASGI
+deployments (see the ``asgi`` profile of docker-compose-stage.yml).
+
+Rows are awaited with the async ORM and turned into responses by the
+fast builders, so the output matches the serializer output of the sync
+views. They only serve public reads: there is no list cache, conditional
+GET or cursor pagination, and writes stay on the sync viewsets.
+"""
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views import View
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import fast
+from .filters import PostFilter
+from .paginations import AsyncDefaultPagination
+from .views import PostModelViewSet
+from ...models import Post
+
+
+class AsyncReadView(View):
+    """
+    Base class of the async JSON read endpoints.
+    """
+    http_method_names = ["get", "head", "options"]
+    pagination_class = None
+
+    def render(self, data, status=200):
+        return JsonResponse(data, encoder=JSONEncoder, safe=False, status=status)
+
+    async def paginated_response(self, request, rows, builder):
+        """
+        Await one page of ``rows`` and render it with ``builder`` in the
+        response shape of the sync DRF pagination class.
+        """
+        pagination = self.pagination_class()
+        try:
+            page = await pagination.apaginate_queryset(rows, Request(request), self)
+        except NotFound as exc:
+            return self.render({"detail": exc.detail}, status=404)
+        # Builders may refresh the category registry from the database
+        data = await sync_to_async(builder)(page, request)
+        return self.render(pagination.get_paginated_response(data).data)
+
+
+class PostListView(AsyncReadView):
+    """
+    The v2 post list with its category filter, ordering
+    and page-number pagination.
+    """
+    pagination_class = AsyncDefaultPagination
+    ordering_fields = PostModelViewSet.ordering_fields
+    ordering_param = "ordering"
+
+    async def get(self, request):
+        filterset = PostFilter(request.GET, queryset=Post.objects.all())
+        # Validating the category may refresh the category registry
+        if not await sync_to_async(filterset.is_valid)():
+            errors = {
+                field: list(messages) for field, messages in filterset.errors.items()
+            }
+            return self.render(errors, status=400)
+        queryset = filterset.qs
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return await self.paginated_response(
+            request, fast.post_rows(queryset), fast.build_posts
+        )
+
+    def get_ordering(self, request):
+        """
+        Valid terms of the ordering parameter, like DRF's OrderingFilter.
+        """
+        params = request.GET.get(self.ordering_param, "")
+        terms = [term.strip() for term in params.split(",")]
+        return [term for term in terms if term.lstrip("-") in self.ordering_fields]
+
+
+class PostDetailView(AsyncReadView):
+    """
+    A single post, as served by the v2 post detail endpoint.
+    """
+
+    async def get(self, request, pk):
+        try:
+            row = await fast.post_detail_rows(Post.objects.all()).aget(pk=pk)
+        except Post.DoesNotExist:
+            return self.render({"detail": "Not found."}, status=404)
+        return self.render(await sync_to_async(fast.build_post)(row, request))
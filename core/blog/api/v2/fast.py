@@ -0,0 +1,119 @@
+"""
+Plain-dict builders for the opt-in fast list path (settings.BLOG_FAST_LIST).
+
+Rows are read with .values() and turned into the exact list output of the
+matching serializers, without instantiating a serializer or dispatching
+through its fields for every row.
+"""
+from rest_framework import serializers
+
+from core import images
+
+from ...categories import registry as category_registry
+from ...models import Post
+
+# Columns read for a post list row; created_date feeds cursor pagination
+POST_LIST_FIELDS = (
+    "id",
+    "title",
+    "image",
+    "image_renditions",
+    "status",
+    "category_id",
+    "author_id",
+    "published_date",
+    "is_live",
+    "comment_count",
+    "created_date",
+)
+POST_DETAIL_FIELDS = POST_LIST_FIELDS + ("content",)
+
+# Field instances are stateless for to_representation, so one is shared
+_datetime_field = serializers.DateTimeField()
+_image_storage = Post._meta.get_field("image").storage
+# CategorySerializers(None).data yields the initial values of its
+# writable fields, kept for parity with the serializer output
+EMPTY_CATEGORY = {"name": ""}
+
+
+def post_rows(queryset):
+    return queryset.values(*POST_LIST_FIELDS)
+
+
+def post_detail_rows(queryset):
+    return queryset.values(*POST_DETAIL_FIELDS)
+
+
+def category_rows(categories):
+    # The category list is served from the registry, see CategoryModelViewSet
+    return categories
+
+
+def build_posts(rows, request):
+    """
+    Same shape as PostSerializers in a list view: content left out,
+    category nested from the category registry and absolute_url pointing
+    at the detail endpoint.
+    """
+    # build_absolute_uri(pk) resolves the id against the list path
+    detail_prefix = request.build_absolute_uri(".")
+    to_datetime = _datetime_field.to_representation
+    data = []
+    for row in rows:
+        data.append(
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "image": _image_url(row["image"], request),
+                "image_renditions": images.rendition_urls(
+                    _image_storage, row["image_renditions"], request
+                ),
+                "status": row["status"],
+                "category": _category(row["category_id"]),
+                "author": row["author_id"],
+                "absolute_url": f"{detail_prefix}{row['id']}",
+                "published_date": to_datetime(row["published_date"]),
+                "is_live": row["is_live"],
+                "comment_count": row["comment_count"],
+            }
+        )
+    return data
+
+
+def build_post(row, request):
+    """
+    Same shape as PostSerializers in a detail view: content included,
+    absolute_url left out.
+    """
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "image": _image_url(row["image"], request),
+        "image_renditions": images.rendition_urls(
+            _image_storage, row["image_renditions"], request
+        ),
+        "content": row["content"],
+        "status": row["status"],
+        "category": _category(row["category_id"]),
+        "author": row["author_id"],
+        "published_date": _datetime_field.to_representation(row["published_date"]),
+        "is_live": row["is_live"],
+        "comment_count": row["comment_count"],
+    }
+
+
+def _image_url(image, request):
+    return request.build_absolute_uri(_image_storage.url(image)) if image else None
+
+
+def _category(category_id):
+    category = (
+        category_registry.get(category_id) if category_id is not None else None
+    )
+    if category is None:
+        return dict(EMPTY_CATEGORY)
+    return {"id": category.pk, "name": category.name}
+
+
+def build_categories(categories, request):
+    return [{"id": category.pk, "name": category.name} for category in categories]
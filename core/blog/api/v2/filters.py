@@ -0,0 +1,46 @@
+from django import forms
+from django_filters import rest_framework as filters
+
+from ...categories import registry as category_registry
+from ...models import Post
+
+
+class CategoryChoiceField(forms.IntegerField):
+    """
+    Category id validated against the category registry instead of
+    a database query per request.
+    """
+    default_error_messages = {
+        "invalid_choice": (
+            "Select a valid choice. "
+            "That choice is not one of the available choices."
+        ),
+    }
+
+    def clean(self, value):
+        value = super().clean(value)
+        if value is None:
+            return None
+        category = category_registry.get(value)
+        if category is None:
+            raise forms.ValidationError(
+                self.error_messages["invalid_choice"], code="invalid_choice"
+            )
+        return category
+
+
+class CategoryFilter(filters.Filter):
+    field_class = CategoryChoiceField
+
+    def filter(self, qs, value):
+        if value is None:
+            return qs
+        return qs.filter(category_id=value.pk)
+
+
+class PostFilter(filters.FilterSet):
+    category = CategoryFilter()
+
+    class Meta:
+        model = Post
+        fields = ["category"]
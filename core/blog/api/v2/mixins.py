@@ -0,0 +1,191 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework.response import Response
+from urllib.parse import urlencode
+
+import hashlib
+
+from core.pagination import KeysetPagination
+from ... import cache as list_cache
+
+
+class CachedListMixin:
+    """
+    Cache anonymous list responses per query string under a version key
+    from blog.cache, so model writes only invalidate the lists they touch.
+    The ETag set by ConditionalGetMixin is cached with the page, so a
+    conditional request on a cached page is answered without the database.
+    """
+    cache_scope = None
+    cache_timeout = 60 * 5
+    # Query parameter that narrows the list to its own version, if any
+    cache_version_param = None
+    cached_headers = ("ETag",)
+
+    def list(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+        key = self.get_list_cache_key(request)
+        if key is None:
+            return super().list(request, *args, **kwargs)
+
+        entry = cache.get(key)
+        if entry is not None:
+            list_cache.record_lookup(self.cache_scope, hit=True)
+            response = Response(entry["data"])
+            for header, value in entry["headers"].items():
+                response[header] = value
+            response["X-Cache"] = "HIT"
+            return get_conditional_response(
+                request, etag=response.get("ETag"), response=response
+            )
+
+        list_cache.record_lookup(self.cache_scope, hit=False)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            headers = {
+                header: response[header]
+                for header in self.cached_headers
+                if response.has_header(header)
+            }
+            cache.set(
+                key, {"data": response.data, "headers": headers}, self.cache_timeout
+            )
+        response["X-Cache"] = "MISS"
+        return response
+
+    def get_list_cache_key(self, request):
+        """
+        Build the key from the list version, host, path, the sorted query
+        string and the negotiated format, which the cached ETag depends on.
+        Returns None when the request should not be cached.
+        """
+        part = list_cache.ALL
+        if self.cache_version_param:
+            value = request.query_params.get(self.cache_version_param)
+            if value:
+                try:
+                    part = str(int(value))
+                except ValueError:
+                    return None
+        version = list_cache.get_version(self.cache_scope, part)
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        url = f"{request.get_host()}{request.path}?{query}"
+        renderer = getattr(request, "accepted_renderer", None)
+        source = f"{renderer and renderer.format}:{url}"
+        digest = hashlib.md5(source.encode("utf-8")).hexdigest()
+        return f"blog:response:{self.cache_scope}:{part}:{version}:{digest}"
+
+
+class ConditionalGetMixin:
+    """
+    Emit an ETag on list and detail responses and answer If-None-Match
+    with 304 before any serialization. Lists are fingerprinted by one
+    aggregate over the filtered queryset, details by the fetched object.
+    No Last-Modified is sent: deletes, counters and nested rows change
+    the fingerprint without a newer timestamp, so If-Modified-Since
+    alone would answer 304 with stale data.
+    """
+    last_modified_field = "updated_date"
+    # Extra list aggregates and object fields for values that change
+    # without touching last_modified_field, e.g. denormalized counters
+    fingerprint_aggregates = {}
+    fingerprint_fields = ()
+    # Cache version scopes (see blog.cache) of related rows that are
+    # rendered nested, e.g. the category registry for posts
+    fingerprint_versions = ()
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_list_validators():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        fingerprint = self.get_list_fingerprint(queryset)
+        etag = self.make_etag(request, sorted(fingerprint.items()))
+        response = self.get_not_modified_response(request, etag)
+        if response is not None:
+            return response
+        response = super().list(request, *args, **kwargs)
+        return self.set_validators(response, etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = self.make_etag(request, self.get_object_fingerprint(instance))
+        response = self.get_not_modified_response(request, etag)
+        if response is not None:
+            return response
+        serializer = self.get_serializer(instance)
+        return self.set_validators(Response(serializer.data), etag)
+
+    def use_list_validators(self):
+        """
+        Keyset pages seek on an index; an aggregate over the whole
+        filtered queryset would bring back the scan they avoid.
+        """
+        return not isinstance(self.paginator, KeysetPagination)
+
+    def get_list_fingerprint(self, queryset):
+        """
+        Aggregates that change whenever a row of the list is added,
+        removed or updated.
+        """
+        fingerprint = queryset.order_by().aggregate(
+            last_modified=Max(self.last_modified_field),
+            count=Count("pk"),
+            **self.fingerprint_aggregates,
+        )
+        fingerprint["versions"] = self.get_fingerprint_versions()
+        return fingerprint
+
+    def get_object_fingerprint(self, instance):
+        fields = (self.last_modified_field,) + tuple(self.fingerprint_fields)
+        return (
+            [instance.pk]
+            + [getattr(instance, field) for field in fields]
+            + self.get_fingerprint_versions()
+        )
+
+    def get_fingerprint_versions(self):
+        return [list_cache.get_version(scope) for scope in self.fingerprint_versions]
+
+    def make_etag(self, request, fingerprint):
+        # The query string selects the page and filters, the renderer
+        # format tells JSON and browsable API representations apart
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        renderer = getattr(request, "accepted_renderer", None)
+        source = repr((request.path, query, renderer and renderer.format, fingerprint))
+        return quote_etag(hashlib.md5(source.encode("utf-8")).hexdigest())
+
+    def get_not_modified_response(self, request, etag):
+        return get_conditional_response(request, etag=etag)
+
+    def set_validators(self, response, etag):
+        if response.status_code == 200:
+            response["ETag"] = etag
+        return response
+
+
+class FastListMixin:
+    """
+    Opt-in read path for list endpoints. When settings.BLOG_FAST_LIST is
+    on, rows are fetched with .values() and turned into the response by
+    ``fast_list_builder`` instead of the serializer. Builders must return
+    the same output as the serializer's list representation.
+    """
+    # Static callables taking (queryset) and (rows, request)
+    fast_list_rows = None
+    fast_list_builder = None
+
+    def use_fast_list(self, request):
+        return self.fast_list_builder is not None and settings.BLOG_FAST_LIST
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_list(request):
+            return super().list(request, *args, **kwargs)
+        rows = self.fast_list_rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.fast_list_builder(page, request))
+        return Response(self.fast_list_builder(rows, request))
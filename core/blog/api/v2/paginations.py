@@ -1,7 +1,29 @@
 from rest_framework.pagination import PageNumberPagination
 
+from core.pagination import AsyncPaginationMixin, KeysetPagination
+from ...paginators import PostCountPaginator, EstimatedPostCountPaginator
+
 
 class DefaultPagination(PageNumberPagination):
     page_size = 3
     page_size_query_param = "page_size"
     max_page_size = 3
+    # Page counts are cached per filter combination
+    django_paginator_class = PostCountPaginator
+
+
+class AsyncDefaultPagination(AsyncPaginationMixin, DefaultPagination):
+    pass
+
+
+class EstimatedCountPagination(DefaultPagination):
+    """
+    Page-number pagination for large tables, whose count comes from the
+    database statistics instead of COUNT(*).
+    """
+    django_paginator_class = EstimatedPostCountPaginator
+
+
+class PostKeysetPagination(KeysetPagination):
+    # Newest posts first, matching the HTML list
+    ordering = ("-created_date", "-id")
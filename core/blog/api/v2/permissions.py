@@ -10,4 +10,5 @@ class IsOwnerOrReadonly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        return obj.author.user == request.user
+        # Compare ids, loading the author's user would cost a query
+        return obj.author.user_id == request.user.id
@@ -1,6 +1,7 @@
 from rest_framework import serializers
+from core import images
 from ...models import Post, Category
-from accounts.models import Profile
+from ...categories import registry as category_registry
 
 
 class CategorySerializers(serializers.ModelSerializer):
@@ -16,6 +17,7 @@ class PostSerializers(serializers.ModelSerializer):
     and author assignment based on request context.
     """
     absolute_url = serializers.SerializerMethodField(method_name="get_absolute_url")
+    image_renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
@@ -23,14 +25,17 @@ class PostSerializers(serializers.ModelSerializer):
             "id",
             "title",
             "image",
+            "image_renditions",
             "content",
             "status",
             "category",
             "author",
             "absolute_url",
             "published_date",
+            "is_live",
+            "comment_count",
         ]
-        read_only_fields = ["author"]
+        read_only_fields = ["author", "is_live", "comment_count"]
 
     def get_absolute_url(self, obj):
         """
@@ -40,12 +45,21 @@ class PostSerializers(serializers.ModelSerializer):
         request = self.context.get("request")
         return request.build_absolute_uri(obj.pk)
 
+    def get_image_renditions(self, obj):
+        """
+        URLs of the resized JPEG and WebP versions of the image, by width.
+        Empty until the background rendering has finished.
+        """
+        return images.rendition_urls(
+            obj.image.storage, obj.image_renditions, self.context.get("request")
+        )
+
     def to_representation(self, instance):
         """
         Customize API output based on request context.
         - In list views: hide content field
         - In detail view: hide absolute_url
-        - Represent category as a nested object
+        - Represent category as a nested object, read from the category registry
         """
         request = self.context["request"]
         rep = super().to_representation(instance)
@@ -54,8 +68,11 @@ class PostSerializers(serializers.ModelSerializer):
             rep.pop("absolute_url", None)
         else:
             rep.pop("content", None)
+        category = None
+        if instance.category_id is not None:
+            category = category_registry.get(instance.category_id)
         rep["category"] = CategorySerializers(
-            instance.category, context={"request": request}
+            category, context={"request": request}
         ).data
         return rep
 
@@ -64,5 +81,30 @@ class PostSerializers(serializers.ModelSerializer):
         Automatically assign the authenticated user's profile as the author of the post.
         """
         request = self.context.get("request")
-        validated_data["author"] = Profile.objects.get(user__id=request.user.id)
+        validated_data["author"] = request.profile
         return super().create(validated_data)
+
+
+class PrefetchedCategoryField(serializers.PrimaryKeyRelatedField):
+    """
+    Category field that resolves ids from the ``categories`` mapping in
+    the serializer context instead of running one query per item.
+    """
+
+    def to_internal_value(self, data):
+        try:
+            return self.context["categories"][int(data)]
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+
+
+class PostBulkSerializers(PostSerializers):
+    """
+    Validates one item of a bulk post request. Saving is left to the
+    view, which writes all valid items with a single bulk query.
+    """
+    category = PrefetchedCategoryField(
+        queryset=Category.objects.all(), allow_null=True, required=False
+    )
@@ -1,5 +1,6 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from . import views
+from . import views, async_views
 
 app_name = "api-v2"
 
@@ -7,4 +8,13 @@ router = DefaultRouter()
 router.register("post", views.PostModelViewSet, basename="post")
 router.register("category", views.CategoryModelViewSet, basename="category")
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path("cache-stats/", views.CacheStatsAPIView.as_view(), name="cache-stats"),
+    # Async reads for ASGI deployments
+    path("async/post/", async_views.PostListView.as_view(), name="async-post-list"),
+    path(
+        "async/post/<int:pk>/",
+        async_views.PostDetailView.as_view(),
+        name="async-post-detail",
+    ),
+]
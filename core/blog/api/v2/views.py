@@ -1,10 +1,26 @@
 from rest_framework.viewsets import ModelViewSet
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAdminUser
+from rest_framework.views import APIView
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.filters import OrderingFilter
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 
-from .paginations import DefaultPagination
+from core.pagination import KeysetPaginationMixin
+
+from .paginations import DefaultPagination, PostKeysetPagination
+from .filters import PostFilter
+from .mixins import CachedListMixin, ConditionalGetMixin, FastListMixin
+from . import fast
 from .permissions import IsOwnerOrReadonly
-from .serializers import PostSerializers, CategorySerializers
+from .serializers import PostSerializers, PostBulkSerializers, CategorySerializers
+from ...search import search as search_posts, index_posts
+from ... import cache as list_cache
+from ...categories import REGISTRY as CATEGORY_REGISTRY, registry as category_registry
 from ...models import Post, Category
 
 """
@@ -12,17 +28,198 @@ API v2 implementaion for managing blog posts.
 Provides full CRUD functionality using DRF ModelViewSets.
 """
 
-class PostModelViewSet(ModelViewSet):
+class PostModelViewSet(
+    CachedListMixin,
+    ConditionalGetMixin,
+    FastListMixin,
+    KeysetPaginationMixin,
+    ModelViewSet,
+):
     # Read access in public; write access is limited to the post owner
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerOrReadonly]
     serializer_class = PostSerializers
-    queryset = Post.objects.all()
+    # The author is joined in and the nested category comes from the
+    # category registry, so a page costs a fixed number of queries
+    queryset = Post.objects.select_related("author")
     pagination_class = DefaultPagination
-    filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['category']
+    # Opt-in keyset pagination with ?pagination=cursor
+    keyset_pagination_class = PostKeysetPagination
+    # Search results are ordered by rank
+    keyset_excluded_actions = ("search",)
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = PostFilter
+    ordering_fields = ['created_date', 'comment_count']
+    # comment_count changes without touching updated_date
+    fingerprint_aggregates = {"comments": Sum("comment_count")}
+    fingerprint_fields = ("comment_count",)
+    # Renaming a category changes the nested category of its posts
+    fingerprint_versions = (CATEGORY_REGISTRY,)
+    # Anonymous list pages are cached per category version
+    cache_scope = list_cache.POST_LIST
+    cache_version_param = "category"
+    # Serializer-free list path behind settings.BLOG_FAST_LIST
+    fast_list_rows = staticmethod(fast.post_rows)
+    fast_list_builder = staticmethod(fast.build_posts)
+    # Upper bound on the number of items of one bulk request
+    bulk_max_items = 500
+    bulk_update_fields = [
+        "title", "image", "content", "status", "category", "published_date",
+        "is_live", "updated_date",
+    ]
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        Full-text search on post title and content, best matches first.
+        Expects the search terms in the 'q' query parameter.
+        """
+        term = request.query_params.get("q", "").strip()
+        if not term:
+            return Response(
+                {"detail": "Query parameter 'q' is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        queryset = search_posts(self.filter_queryset(self.get_queryset()), term)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """
+        Create and update many posts in one request.
+        Items carrying an 'id' update that post of the requesting author,
+        the others are created. Every item is validated on its own and
+        valid ones are written with one bulk query per operation.
+        Responds 200 when all items succeed, 207 on partial failure
+        and 400 when none does.
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"detail": "Expected a non-empty list of posts."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.bulk_max_items:
+            return Response(
+                {"detail": f"At most {self.bulk_max_items} posts per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        profile = request.profile
+        category_ids, post_ids = set(), set()
+        for item in items:
+            if isinstance(item, dict):
+                category_ids.add(self._to_int(item.get("category")))
+                post_ids.add(self._to_int(item.get("id")))
+        category_ids.discard(None)
+        post_ids.discard(None)
+        context = self.get_serializer_context()
+        context["categories"] = Category.objects.in_bulk(category_ids)
+        existing = Post.objects.filter(author=profile).in_bulk(post_ids)
+
+        results, to_create, to_update = [], [], []
+        touched_categories = set()
+        now = timezone.now()
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results.append(
+                    self._bulk_error(index, {"non_field_errors": ["Expected an object."]})
+                )
+                continue
+            instance = None
+            if item.get("id") is not None:
+                instance = existing.get(self._to_int(item["id"]))
+                if instance is None:
+                    results.append(self._bulk_error(index, {"id": ["Not found."]}))
+                    continue
+            serializer = PostBulkSerializers(
+                instance, data=item, partial=instance is not None, context=context
+            )
+            if not serializer.is_valid():
+                results.append(self._bulk_error(index, serializer.errors))
+                continue
+            if instance is None:
+                post = Post(author=profile, **serializer.validated_data)
+                post.refresh_live_state(now)
+                to_create.append((index, post))
+            else:
+                touched_categories.add(instance.category_id)
+                for attr, value in serializer.validated_data.items():
+                    setattr(instance, attr, value)
+                # bulk_update skips auto_now and the pre_save receivers
+                instance.updated_date = now
+                instance.refresh_live_state(now)
+                to_update.append((index, instance))
+
+        with transaction.atomic():
+            created = Post.objects.bulk_create([post for _, post in to_create])
+            updated = [post for _, post in to_update]
+            Post.objects.bulk_update(updated, self.bulk_update_fields)
+            # Bulk writes skip the post_save receivers
+            index_posts(created + updated)
+        touched_categories.update(post.category_id for post in created + updated)
+        list_cache.bump_post_lists(*touched_categories)
+
+        for outcome, pairs in (("created", to_create), ("updated", to_update)):
+            for index, post in pairs:
+                results.append({"index": index, "status": outcome, "id": post.pk})
+        results.sort(key=lambda result: result["index"])
+        failed = len(items) - len(to_create) - len(to_update)
+        if not failed:
+            response_status = status.HTTP_200_OK
+        elif failed < len(items):
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {
+                "created": len(to_create),
+                "updated": len(to_update),
+                "failed": failed,
+                "results": results,
+            },
+            status=response_status,
+        )
 
+    @staticmethod
+    def _to_int(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
 
-class CategoryModelViewSet(ModelViewSet):
+    @staticmethod
+    def _bulk_error(index, errors):
+        return {"index": index, "status": "error", "errors": errors}
+
+
+class CategoryModelViewSet(CachedListMixin, FastListMixin, ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
     serializer_class = CategorySerializers
     queryset = Category.objects.all()
+    cache_scope = list_cache.CATEGORY_LIST
+    fast_list_rows = staticmethod(fast.category_rows)
+    fast_list_builder = staticmethod(fast.build_categories)
+
+    def filter_queryset(self, queryset):
+        # Lists are served from the in-process category registry;
+        # single objects and writes still go to the database
+        if self.action == "list":
+            return category_registry.all()
+        return super().filter_queryset(queryset)
+
+
+class CacheStatsAPIView(APIView):
+    """
+    Hit and miss counters of the cached list endpoints.
+    Restricted to admin users.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(list_cache.get_stats())
+
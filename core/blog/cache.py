@@ -0,0 +1,79 @@
+"""
+Version keys and counters for the cached v2 list responses.
+
+Cached pages embed a version number in their key. Writes bump the
+version of the lists they can change (the unfiltered post list plus the
+touched category), so stale pages simply stop being looked up and expire
+on their own instead of the whole cache being flushed.
+"""
+from django.core.cache import cache
+
+POST_LIST = "post-list"
+CATEGORY_LIST = "category-list"
+# Per-post version of the cached comment list counts, see blog.paginators
+COMMENT_LIST = "comment-list"
+# Per-post version of the cached comment thread on the post detail page
+COMMENT_THREAD = "comment-thread"
+# Version part used by lists that are not narrowed to a category
+ALL = "all"
+
+
+def version_key(scope, part=ALL):
+    return f"blog:version:{scope}:{part}"
+
+
+def get_version(scope, part=ALL):
+    return cache.get_or_set(version_key(scope, part), 1, timeout=None)
+
+
+def bump_version(scope, part=ALL):
+    key = version_key(scope, part)
+    cache.add(key, 1, timeout=None)
+    cache.incr(key)
+
+
+def bump_post_lists(*category_ids):
+    """
+    Invalidate the unfiltered post list and the lists of the given categories.
+    """
+    parts = {ALL} | {str(pk) for pk in category_ids if pk is not None}
+    for part in parts:
+        bump_version(POST_LIST, part)
+
+
+def bump_category_lists():
+    bump_version(CATEGORY_LIST)
+
+
+def bump_comment_lists(post_id):
+    bump_version(COMMENT_LIST, post_id)
+
+
+def bump_comment_thread(post_id):
+    bump_version(COMMENT_THREAD, post_id)
+
+
+def _counter_key(scope, outcome):
+    return f"blog:cache-stats:{scope}:{outcome}"
+
+
+def record_lookup(scope, hit):
+    key = _counter_key(scope, "hits" if hit else "misses")
+    cache.add(key, 0, timeout=None)
+    cache.incr(key)
+
+
+def get_stats(scopes=(POST_LIST, CATEGORY_LIST)):
+    """
+    Return hit and miss counters of every cached list.
+    """
+    keys = {
+        (scope, outcome): _counter_key(scope, outcome)
+        for scope in scopes
+        for outcome in ("hits", "misses")
+    }
+    values = cache.get_many(keys.values())
+    stats = {scope: {"hits": 0, "misses": 0} for scope in scopes}
+    for (scope, outcome), key in keys.items():
+        stats[scope][outcome] = values.get(key, 0)
+    return stats
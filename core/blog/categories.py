@@ -0,0 +1,100 @@
+"""
+Per-process registry of blog categories.
+
+Categories almost never change, so every worker keeps them in memory and
+answers lookups by id or name without a query. Category writes bump a
+version number in the shared cache (see blog.cache); workers compare it
+with the version they loaded at most every ``check_interval`` seconds
+and reload when it moved. A lookup miss re-checks the version at once,
+so a category created by another worker is found on first use.
+
+The returned instances are shared between requests and must be treated
+as read-only.
+"""
+from threading import Lock
+import time
+
+from . import cache as list_cache
+
+REGISTRY = "category-registry"
+
+
+class CategoryRegistry:
+
+    def __init__(self, check_interval=5):
+        self.check_interval = check_interval
+        self._lock = Lock()
+        self.clear()
+
+    def clear(self):
+        """
+        Forget the loaded categories; the next lookup reloads them.
+        """
+        self._version = None
+        self._checked_at = 0.0
+        self._by_id = {}
+        self._by_name = {}
+        self._ordered = ()
+
+    def all(self):
+        self._refresh()
+        return self._ordered
+
+    def get(self, pk):
+        """
+        Return the category with primary key ``pk``, or None.
+        """
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            return None
+        self._refresh()
+        if pk not in self._by_id:
+            self._refresh(force=True)
+        return self._by_id.get(pk)
+
+    def get_by_name(self, name):
+        """
+        Return the category called ``name``, or None. Names are not
+        unique; the oldest category of a name wins.
+        """
+        self._refresh()
+        if name not in self._by_name:
+            self._refresh(force=True)
+        return self._by_name.get(name)
+
+    def invalidate(self):
+        """
+        Make every worker reload on its next version check.
+        """
+        list_cache.bump_version(REGISTRY)
+        self.clear()
+
+    def _refresh(self, force=False):
+        now = time.monotonic()
+        if (
+            not force
+            and self._version is not None
+            and now - self._checked_at < self.check_interval
+        ):
+            return
+        version = list_cache.get_version(REGISTRY)
+        with self._lock:
+            if version != self._version:
+                self._load(version)
+            self._checked_at = now
+
+    def _load(self, version):
+        from .models import Category
+
+        categories = tuple(Category.objects.order_by("pk"))
+        by_name = {}
+        for category in categories:
+            by_name.setdefault(category.name, category)
+        self._by_id = {category.pk: category for category in categories}
+        self._by_name = by_name
+        self._ordered = categories
+        self._version = version
+
+
+registry = CategoryRegistry()
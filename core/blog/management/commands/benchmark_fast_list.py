@@ -0,0 +1,99 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+import statistics
+import time
+
+from accounts.models import User, Profile
+from ...api.v2 import fast
+from ...api.v2.serializers import PostSerializers
+from ...models import Post, Category
+
+
+class Command(BaseCommand):
+    """
+    Compare the serializer and the values() fast path of the v2 post list:
+    building a batch of rows in isolation, then whole list requests.
+    Dummy posts are created inside a transaction that is rolled back.
+    """
+    help = 'benchmark the values() list path against the serializer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        with transaction.atomic():
+            self.seed(rows)
+            url = reverse('blog:api-v2:post-list')
+            request = Request(APIRequestFactory().get(url))
+            request.parser_context = {'kwargs': {}}
+            queryset = Post.objects.select_related('category', 'author')[:rows]
+
+            serializer = self.measure(
+                lambda: PostSerializers(
+                    list(queryset), many=True, context={'request': request}
+                ).data,
+                repeat,
+            )
+            builder = self.measure(
+                lambda: fast.build_posts(list(fast.post_rows(queryset)), request),
+                repeat,
+            )
+            self.report(f'{rows} rows', serializer, builder, rows)
+
+            client = APIClient()
+            user = User.objects.get(email='benchmark@benchmark.com')
+            # Authenticated requests bypass the list response cache
+            client.force_authenticate(user=user)
+            timings = []
+            for enabled in (False, True):
+                with override_settings(BLOG_FAST_LIST=enabled):
+                    timings.append(self.measure(lambda: client.get(url), repeat))
+            self.report('list request', *timings, 1)
+            transaction.set_rollback(True)
+
+    def seed(self, total):
+        user = User.objects.create_user(
+            email='benchmark@benchmark.com', password='Zz@12345'
+        )
+        profile = Profile.objects.get(user=user)
+        category = Category.objects.create(name='benchmark')
+        now = timezone.now()
+        Post.objects.bulk_create(
+            (
+                Post(
+                    author=profile,
+                    title=f'benchmark {i}',
+                    content='benchmark',
+                    status=True,
+                    category=category,
+                    published_date=now,
+                    is_live=True,
+                )
+                for i in range(total)
+            ),
+            batch_size=5000,
+        )
+
+    def measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    def report(self, label, serializer, builder, items):
+        self.stdout.write(
+            f'{label:>12}: serializer {serializer:8.2f} ms'
+            f' | values() {builder:8.2f} ms'
+            f' | {serializer / builder:5.1f}x'
+            f' | {items / builder * 1000:10.0f} per second'
+        )
@@ -0,0 +1,93 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+import statistics
+import time
+
+from accounts.models import User, Profile
+from ...api.v2.paginations import DefaultPagination, PostKeysetPagination
+from ...models import Post
+
+
+class Command(BaseCommand):
+    """
+    Compare page-number and cursor pagination latency on the v2 post list
+    at the first and the last page. Dummy posts are created inside a
+    transaction that is rolled back at the end.
+    """
+    help = 'benchmark page-number against cursor pagination'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        pages = options['pages']
+        page_size = DefaultPagination.page_size
+        with transaction.atomic():
+            self.seed(pages * page_size)
+            client = APIClient()
+            url = reverse('blog:api-v2:post-list')
+            for page in (1, pages):
+                number = self.measure(
+                    client, url, {'page': page}, options['repeat']
+                )
+                cursor = self.measure(
+                    client, self.cursor_url(url, page, page_size), {},
+                    options['repeat']
+                )
+                self.stdout.write(
+                    f'page {page:>6}: page-number {number:8.2f} ms'
+                    f' | cursor {cursor:8.2f} ms'
+                )
+            transaction.set_rollback(True)
+
+    def seed(self, total):
+        missing = total - Post.objects.count()
+        if missing <= 0:
+            return
+        user = User.objects.create_user(
+            email='benchmark@benchmark.com', password='Zz@12345'
+        )
+        profile = Profile.objects.get(user=user)
+        now = timezone.now()
+        Post.objects.bulk_create(
+            (
+                Post(
+                    author=profile,
+                    title=f'benchmark {i}',
+                    content='benchmark',
+                    status=True,
+                    published_date=now,
+                    is_live=True,
+                )
+                for i in range(missing)
+            ),
+            batch_size=5000,
+        )
+
+    def cursor_url(self, url, page, page_size):
+        """
+        Build the next link a client would hold after walking to ``page``.
+        """
+        paginator = PostKeysetPagination()
+        paginator.base_url = f'{url}?pagination=cursor'
+        if page == 1:
+            return paginator.base_url
+        last = (
+            Post.objects.order_by(*paginator.ordering)
+            .only('created_date')[(page - 1) * page_size - 1]
+        )
+        return paginator.encode_cursor(paginator.get_position(last))
+
+    def measure(self, client, url, params, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = client.get(url, params)
+            timings.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.status_code
+        return statistics.median(timings)
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from ...api.v2.paginations import PostKeysetPagination
+from ...api.v2.views import PostModelViewSet
+from ...models import Post, Category
+from ...views import BlogListView
+
+
+class Command(BaseCommand):
+    """
+    Print the database query plan of every post listing query,
+    to check that the list indexes are picked up by the planner.
+    """
+    help = 'print EXPLAIN plans for the post list queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='run EXPLAIN ANALYZE (PostgreSQL only)',
+        )
+
+    def handle(self, *args, **options):
+        explain_options = {}
+        if options['analyze']:
+            if connection.vendor != 'postgresql':
+                raise CommandError('--analyze is only supported on PostgreSQL')
+            explain_options['analyze'] = True
+
+        category_id = Category.objects.values_list('id', flat=True).first() or 0
+        page_size = BlogListView.paginate_by
+        published = Post.objects.filter(is_live=True).order_by(BlogListView.ordering)
+        api_list = PostModelViewSet.queryset.filter(category=category_id)
+
+        queries = [
+            ('html list', published[:page_size]),
+            (
+                'html list by category',
+                published.filter(category=category_id)[:page_size],
+            ),
+            ('api list by category', api_list[:page_size]),
+            (
+                'due scheduled posts',
+                Post.objects.filter(
+                    status=True, is_live=False, published_date__lte=timezone.now()
+                ).order_by('published_date', 'id')[:500],
+            ),
+            (
+                'api cursor list by category',
+                api_list.order_by(*PostKeysetPagination.ordering)[:page_size],
+            ),
+        ]
+        for label, queryset in queries:
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(queryset.explain(**explain_options))
+            self.stdout.write('')
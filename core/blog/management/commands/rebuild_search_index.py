@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ... import search
+from ...cache import bump_post_lists
+from ...models import Post
+
+
+class Command(BaseCommand):
+    """
+    Repopulate the post full-text index from the post table,
+    e.g. after bulk imports that skip the post_save signal.
+    """
+    help = 'rebuild the post full-text search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = search.rebuild_index(Post, batch_size=options['batch_size'])
+        # Search results and their cached counts may have changed
+        bump_post_lists()
+        self.stdout.write(self.style.SUCCESS(f'{total} posts indexed'))
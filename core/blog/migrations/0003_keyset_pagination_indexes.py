@@ -0,0 +1,19 @@
+# Generated by Django 4.2.9 on 2026-10-18 20:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0002_alter_post_author"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["-created_date", "-id"], name="post_created_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.db import migrations
+
+PG_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'B')"
+)
+
+
+def create_search_index(apps, schema_editor):
+    """
+    FTS5 virtual table on SQLite, tsvector column with a GIN index on
+    PostgreSQL. Other backends fall back to substring search.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE blog_post_fts USING fts5("
+            "title, content, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            "INSERT INTO blog_post_fts(rowid, title, content) "
+            "SELECT id, title, content FROM blog_post"
+        )
+    elif vendor == "postgresql":
+        schema_editor.execute("ALTER TABLE blog_post ADD COLUMN search_vector tsvector")
+        schema_editor.execute(f"UPDATE blog_post SET search_vector = {PG_DOCUMENT}")
+        schema_editor.execute(
+            "CREATE INDEX blog_post_search_vector_gin "
+            "ON blog_post USING GIN (search_vector)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS blog_post_fts")
+    elif vendor == "postgresql":
+        schema_editor.execute("ALTER TABLE blog_post DROP COLUMN IF EXISTS search_vector")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0004_post_list_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
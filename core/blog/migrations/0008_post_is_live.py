@@ -0,0 +1,68 @@
+# Generated by Django 4.2.9 on 2026-10-18 20:49
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_is_live(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    Post.objects.filter(status=True, published_date__lte=timezone.now()).update(
+        is_live=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0007_post_image_renditions"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="post",
+            name="post_status_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="post",
+            name="post_cat_status_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="post",
+            name="post_published_created_idx",
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="is_live",
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(backfill_is_live, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["is_live", "-created_date"], name="post_live_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["category", "is_live", "-created_date"],
+                name="post_cat_live_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_live", True)),
+                fields=["-created_date"],
+                name="post_published_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_live", False), ("status", True)),
+                fields=["published_date", "id"],
+                name="post_due_idx",
+            ),
+        ),
+    ]
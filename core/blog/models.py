@@ -1,5 +1,12 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from . import search
+from .cache import bump_post_lists, bump_category_lists
+from .categories import registry as category_registry
 
 # getting user model object
 User = get_user_model()
@@ -21,10 +28,70 @@ class Post(models.Model):
     updated_date = models.DateTimeField(auto_now=True)
     # Explicit publish time, independent of creation time
     published_date = models.DateTimeField()
+    # Published and past published_date. Set on save for posts that are
+    # already due, and by the publish_due_posts beat task for scheduled ones
+    is_live = models.BooleanField(default=False, editable=False)
+    # Denormalized number of comments, maintained by the comment app signals
+    comment_count = models.PositiveIntegerField(default=0)
+    # Resized and WebP versions of image, written by blog.tasks
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Seek index for keyset pagination of the v2 post list
+            models.Index(fields=["-created_date", "-id"], name="post_created_id_idx"),
+            # BlogListView: is_live=True [AND category=...] ORDER BY -created_date
+            models.Index(
+                fields=["is_live", "-created_date"], name="post_live_created_idx"
+            ),
+            models.Index(
+                fields=["category", "is_live", "-created_date"],
+                name="post_cat_live_created_idx",
+            ),
+            # v2 API: category filter with the keyset ordering
+            models.Index(
+                fields=["category", "-created_date", "-id"],
+                name="post_cat_created_id_idx",
+            ),
+            # Live posts only; skipped on backends without partial indexes
+            models.Index(
+                fields=["-created_date"],
+                condition=models.Q(is_live=True),
+                name="post_published_created_idx",
+            ),
+            # Scheduled posts waiting for publish_due_posts, by due time
+            models.Index(
+                fields=["published_date", "id"],
+                condition=models.Q(status=True, is_live=False),
+                name="post_due_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def refresh_live_state(self, now=None):
+        """
+        A post goes live once it is published and its published_date passed.
+        """
+        now = now or timezone.now()
+        published_date = self.published_date
+        if published_date is not None and timezone.is_naive(published_date):
+            published_date = timezone.make_aware(published_date)
+        self.is_live = (
+            bool(self.status) and published_date is not None and published_date <= now
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored category so moving a post can invalidate
+        # the cached lists of both its old and new category
+        instance._loaded_category_id = instance.__dict__.get("category_id")
+        # and the stored image, so only new uploads get rendered
+        instance._loaded_image = instance.__dict__.get("image")
+        return instance
+
 
 class Category(models.Model):
     """
@@ -34,3 +101,77 @@ class Category(models.Model):
 
     def __str__(self):
         return self.name
+
+
+@receiver(pre_save, sender=Post)
+def set_live_state(sender, instance, **kwargs):
+    """
+    Posts saved with a past published_date go live right away
+    """
+    instance.refresh_live_state()
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, update_fields=None, **kwargs):
+    """
+    Keep the full-text index in sync with the post title and content
+    """
+    if update_fields and not {"title", "content"} & set(update_fields):
+        return
+    search.index_post(instance)
+
+
+@receiver(post_save, sender=Post)
+def schedule_image_renditions(sender, instance, update_fields=None, **kwargs):
+    """
+    Render a new or replaced image in the background once it is committed
+    """
+    if update_fields and "image" not in update_fields:
+        return
+    name = instance.image.name or None
+    if name == (getattr(instance, "_loaded_image", None) or None):
+        return
+    instance._loaded_image = name
+    from .tasks import generate_post_renditions
+
+    transaction.on_commit(lambda: generate_post_renditions.delay(instance.pk))
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    """
+    Remove a deleted post from the full-text index
+    """
+    search.remove_post(instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_lists(sender, instance, **kwargs):
+    """
+    Bump the cached list versions of the post's old and new category
+    """
+    bump_post_lists(
+        instance.category_id, getattr(instance, "_loaded_category_id", None)
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_lists(sender, instance, **kwargs):
+    """
+    Category changes show up in the category list and, nested, in its posts.
+    The per-process category registry of every worker is reloaded as well,
+    again after commit so a worker can't keep the old row it loaded
+    before the transaction finished.
+    """
+    # Deleted instances lose their pk before the commit
+    category_id = instance.pk
+
+    def invalidate():
+        category_registry.invalidate()
+        bump_category_lists()
+        bump_post_lists(category_id)
+
+    invalidate()
+    transaction.on_commit(invalidate)
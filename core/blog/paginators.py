@@ -0,0 +1,175 @@
+"""
+Django paginators that avoid an exact COUNT(*) on every page render.
+
+CachedCountPaginator caches the count per query (SQL and parameters) for
+a short time. EstimatedCountPaginator additionally trusts the database
+statistics once a list is large enough that an exact count is expensive
+and a slightly wrong "Page X of Y" does not matter.
+"""
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+import hashlib
+import json
+
+from . import cache as list_cache
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Cache the row count of each filter combination for ``count_timeout``
+    seconds. When ``version_scope`` names a blog.cache scope, the version
+    of its ``version_part`` is part of the key, so writes that bump it
+    invalidate counts at once.
+    """
+    count_timeout = 30
+    version_scope = None
+
+    def __init__(self, *args, version_part=list_cache.ALL, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version_part = version_part
+
+    @cached_property
+    def count(self):
+        key = self.get_count_cache_key()
+        if key is None:
+            return super().count
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, self.count_timeout)
+        return count
+
+    async def acount(self):
+        """
+        Async counterpart of ``count`` for async views. The result is kept
+        as ``count``, so the sync page helpers don't query again. Always
+        an exact (cached) count, without the estimates of subclasses.
+        """
+        if "count" in self.__dict__:
+            return self.count
+        key = await sync_to_async(self.get_count_cache_key)()
+        count = await cache.aget(key) if key is not None else None
+        if count is None:
+            if isinstance(self.object_list, QuerySet):
+                count = await self.object_list.acount()
+            else:
+                count = len(self.object_list)
+            if key is not None:
+                await cache.aset(key, count, self.count_timeout)
+        self.count = count
+        return count
+
+    async def apage(self, number):
+        """
+        Async counterpart of ``page`` whose object list is already fetched.
+        """
+        await self.acount()
+        page = self.page(number)
+        if isinstance(page.object_list, QuerySet):
+            page.object_list = [obj async for obj in page.object_list]
+        return page
+
+    def get_count_cache_key(self):
+        """
+        Return None for object lists that are not querysets.
+        """
+        if not isinstance(self.object_list, QuerySet):
+            return None
+        try:
+            sql, params = self.object_list.query.sql_with_params()
+        except EmptyResultSet:
+            return None
+        version = (
+            list_cache.get_version(self.version_scope, self.version_part)
+            if self.version_scope
+            else 0
+        )
+        digest = hashlib.md5(repr((sql, params)).encode("utf-8")).hexdigest()
+        return f"blog:count:{self.object_list.db}:{version}:{digest}"
+
+
+class EstimatedCountPaginator(CachedCountPaginator):
+    """
+    Use the planner's row estimate instead of an exact count once it
+    reaches ``estimate_threshold``; below it the exact count is cheap and
+    is cached as usual.
+
+    PostgreSQL estimates unfiltered tables from ``pg_class.reltuples`` and
+    filtered lists from the EXPLAIN row estimate. SQLite only knows table
+    sizes from ``sqlite_stat1`` (filled by ANALYZE), so filtered lists
+    there always fall back to the cached exact count.
+    """
+    estimate_threshold = 100000
+
+    @cached_property
+    def count(self):
+        estimate = self.estimate_count()
+        if estimate is not None and estimate >= self.estimate_threshold:
+            return estimate
+        return super().count
+
+    def estimate_count(self):
+        """
+        Return the estimated number of rows, or None when unknown.
+        """
+        if not isinstance(self.object_list, QuerySet):
+            return None
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        table = queryset.model._meta.db_table
+        unfiltered = not queryset.query.where
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                if unfiltered:
+                    cursor.execute(
+                        "SELECT reltuples::bigint FROM pg_class "
+                        "WHERE oid = %s::regclass",
+                        [table],
+                    )
+                    row = cursor.fetchone()
+                    # reltuples is -1 until the table is first analyzed
+                    return row[0] if row and row[0] >= 0 else None
+                try:
+                    sql, params = queryset.query.sql_with_params()
+                except EmptyResultSet:
+                    return 0
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return int(plan[0]["Plan"]["Plan Rows"])
+            if connection.vendor == "sqlite" and unfiltered:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master "
+                    "WHERE type = 'table' AND name = 'sqlite_stat1'"
+                )
+                if cursor.fetchone() is None:
+                    return None
+                cursor.execute(
+                    "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table]
+                )
+                row = cursor.fetchone()
+                # The first number of every stat row is the table size
+                return int(row[0].split()[0]) if row else None
+        return None
+
+
+class PostCountPaginator(CachedCountPaginator):
+    version_scope = list_cache.POST_LIST
+
+
+class EstimatedPostCountPaginator(EstimatedCountPaginator):
+    version_scope = list_cache.POST_LIST
+
+
+class CommentCountPaginator(CachedCountPaginator):
+    """
+    Comment counts of one post; pass its id as ``version_part``.
+    """
+    version_scope = list_cache.COMMENT_LIST
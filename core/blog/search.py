@@ -0,0 +1,148 @@
+"""
+Full-text search over post title and content.
+
+SQLite keeps an FTS5 virtual table keyed by post id, PostgreSQL keeps a
+weighted tsvector column on the post table behind a GIN index. Both are
+created by migration 0005, kept in sync by the post_save/post_delete
+receivers in models.py and repopulated by the rebuild_search_index command.
+"""
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "blog_post_fts"
+SEARCH_VECTOR_COLUMN = "search_vector"
+# bm25() weights for the title and content columns of the FTS5 table
+SQLITE_WEIGHTS = (10.0, 1.0)
+PG_CONFIG = "english"
+PG_DOCUMENT = (
+    "setweight(to_tsvector('{config}', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('{config}', coalesce(content, '')), 'B')"
+).format(config=PG_CONFIG)
+
+
+def to_fts5_query(term):
+    """
+    Quote every word so user input can't inject FTS5 query syntax.
+    Words are combined with an implicit AND.
+    """
+    return " ".join('"{}"'.format(word.replace('"', '""')) for word in term.split())
+
+
+def index_post(post):
+    """
+    Insert or refresh the search document of a single post.
+    """
+    index_posts([post])
+
+
+def index_posts(posts):
+    """
+    Insert or refresh the search documents of several posts at once,
+    for bulk writes that bypass the post_save signal.
+    """
+    posts = list(posts)
+    if not posts:
+        return
+    table = posts[0]._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.executemany(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s",
+                [(post.pk,) for post in posts],
+            )
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (%s, %s, %s)",
+                [(post.pk, post.title, post.content) for post in posts],
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                f"UPDATE {table} SET {SEARCH_VECTOR_COLUMN} = {PG_DOCUMENT} "
+                "WHERE id = ANY(%s)",
+                [[post.pk for post in posts]],
+            )
+
+
+def remove_post(post):
+    """
+    Drop a deleted post from the index. The PostgreSQL column goes
+    away together with its row.
+    """
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [post.pk])
+
+
+def rebuild_index(model, batch_size=10000):
+    """
+    Repopulate the whole index in primary key batches.
+    Returns the number of indexed posts.
+    """
+    table = model._meta.db_table
+    ids = model.objects.order_by("pk").values_list("pk", flat=True)
+    total = 0
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        last_id = 0
+        while True:
+            batch = list(ids.filter(pk__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            params = [batch[0], batch[-1]]
+            if connection.vendor == "sqlite":
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE}(rowid, title, content) "
+                    f"SELECT id, title, content FROM {table} "
+                    "WHERE id BETWEEN %s AND %s",
+                    params,
+                )
+            elif connection.vendor == "postgresql":
+                cursor.execute(
+                    f"UPDATE {table} SET {SEARCH_VECTOR_COLUMN} = {PG_DOCUMENT} "
+                    "WHERE id BETWEEN %s AND %s",
+                    params,
+                )
+            total += len(batch)
+            last_id = batch[-1]
+    return total
+
+
+def search(queryset, term):
+    """
+    Filter ``queryset`` to posts matching ``term``, best matches first.
+    The match is a filter and the rank an annotation, so the result
+    composes with further filters, counts and pagination like any other
+    queryset. Backends without a text index fall back to a substring scan.
+    """
+    table = queryset.model._meta.db_table
+    if connection.vendor == "sqlite":
+        weights = ", ".join(str(weight) for weight in SQLITE_WEIGHTS)
+        query = to_fts5_query(term)
+        # The MATCH drives the filter; bm25() is only computed for matches
+        # and is negative, lower is a better match
+        matches = RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [query]
+        )
+        rank = RawSQL(
+            f"SELECT bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id",
+            [query],
+            output_field=FloatField(),
+        )
+        return (
+            queryset.filter(pk__in=matches)
+            .annotate(search_rank=rank)
+            .order_by("search_rank")
+        )
+    if connection.vendor == "postgresql":
+        vector = f"{table}.{SEARCH_VECTOR_COLUMN}"
+        tsquery = f"websearch_to_tsquery('{PG_CONFIG}', %s)"
+        matches = RawSQL(f"{vector} @@ {tsquery}", [term], output_field=BooleanField())
+        rank = RawSQL(f"ts_rank({vector}, {tsquery})", [term], output_field=FloatField())
+        return (
+            queryset.filter(matches)
+            .annotate(search_rank=rank)
+            .order_by("-search_rank")
+        )
+    return queryset.filter(Q(title__icontains=term) | Q(content__icontains=term))
@@ -0,0 +1,48 @@
+from celery import shared_task
+from django.db import transaction
+from django.utils import timezone
+
+from core import images
+from .cache import bump_post_lists
+from .models import Post
+
+
+@shared_task(ignore_result=True)
+def generate_post_renditions(post_id):
+    """
+    Render the resized and WebP versions of a post image.
+    """
+    post = images.refresh_renditions(Post, post_id)
+    if post is not None:
+        bump_post_lists(post.category_id)
+
+
+@shared_task(ignore_result=True)
+def publish_due_posts(batch_size=500):
+    """
+    Put scheduled posts live once their published_date has passed.
+    Runs from celery beat and walks the due index in batches, bumping
+    the cached list versions of every batch that goes live.
+    Returns the number of published posts.
+    """
+    now = timezone.now()
+    due = Post.objects.filter(
+        status=True, is_live=False, published_date__lte=now
+    ).order_by("published_date", "id")
+    total = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                due.select_for_update(skip_locked=True).values_list(
+                    "pk", "category_id"
+                )[:batch_size]
+            )
+            if not batch:
+                break
+            # Re-checked in case a post was rescheduled since the select
+            due.filter(pk__in=[pk for pk, _ in batch]).update(
+                is_live=True, updated_date=now
+            )
+        bump_post_lists(*{category_id for _, category_id in batch})
+        total += len(batch)
+    return total
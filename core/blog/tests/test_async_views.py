@@ -0,0 +1,141 @@
+from rest_framework.test import APIClient
+from django.urls import reverse
+from django.utils import timezone
+
+from ..api.v2 import async_views
+from ..models import Post, Category
+from ..views import AsyncBlogListView
+from accounts.models import User, Profile
+import json
+import pytest
+
+@pytest.fixture
+def api_client():
+    client = APIClient()
+    user = User.objects.create_user(email='test@test.com', password='zZ@12345')
+    client.force_authenticate(user=user)
+    return client
+
+@pytest.fixture
+def category():
+    return Category.objects.create(name='test')
+
+@pytest.fixture
+def posts(category):
+    user = User.objects.create_user(email='author@test.com', password='zZ@12345')
+    profile = Profile.objects.get(user=user)
+    variants = [
+        {'category': category, 'image': 'post.jpg'},
+        {'category': None, 'image': None},
+        {'category': category, 'image': ''},
+        {'category': None, 'image': ''},
+    ]
+    return [
+        Post.objects.create(
+            author=profile,
+            title=f'post {i}',
+            content='description',
+            status=True,
+            published_date=timezone.now(),
+            comment_count=i,
+            **variant,
+        )
+        for i, variant in enumerate(variants)
+    ]
+
+
+def fetch(client, name, params=None, **kwargs):
+    response = client.get(reverse(name, kwargs=kwargs), params or {})
+    # Links of the async endpoints point at the async paths
+    return response.status_code, json.loads(
+        response.content.decode().replace('/async/', '/')
+    )
+
+
+@pytest.mark.django_db
+class TestAsyncPostAPI:
+
+    def test_views_are_async(self):
+        assert async_views.PostListView.view_is_async
+        assert async_views.PostDetailView.view_is_async
+        assert AsyncBlogListView.view_is_async
+
+    @pytest.mark.parametrize('params', [
+        {},
+        {'page': 2},
+        {'page': 'last'},
+        {'ordering': '-comment_count'},
+        {'ordering': 'title,comment_count'},
+        {'category': 'CATEGORY', 'page_size': 1},
+    ])
+    def test_list_matches_sync_view(self, api_client, posts, category, params):
+        if params.get('category') == 'CATEGORY':
+            params['category'] = category.id
+        sync = fetch(api_client, 'blog:api-v2:post-list', params)
+        asynchronous = fetch(api_client, 'blog:api-v2:async-post-list', params)
+        assert sync[0] == 200
+        assert asynchronous == sync
+
+    @pytest.mark.parametrize('params', [{'page': 9}, {'category': 999}])
+    def test_list_errors_match_sync_view(self, api_client, posts, params):
+        sync = fetch(api_client, 'blog:api-v2:post-list', params)
+        asynchronous = fetch(api_client, 'blog:api-v2:async-post-list', params)
+        assert sync[0] in (400, 404)
+        assert asynchronous == sync
+
+    def test_detail_matches_sync_view(self, api_client, posts):
+        for post in posts[:2]:
+            sync = fetch(api_client, 'blog:api-v2:post-detail', pk=post.id)
+            asynchronous = fetch(
+                api_client, 'blog:api-v2:async-post-detail', pk=post.id
+            )
+            assert sync[0] == 200
+            assert asynchronous == sync
+
+    def test_detail_not_found(self, api_client):
+        status, data = fetch(api_client, 'blog:api-v2:async-post-detail', pk=999)
+        assert status == 404
+        assert data == {'detail': 'Not found.'}
+
+    def test_list_queries(
+        self, api_client, posts, django_assert_num_queries, category_registry
+    ):
+        category_registry.all()
+        url = reverse('blog:api-v2:async-post-list')
+        # Count and page rows
+        with django_assert_num_queries(2):
+            api_client.get(url)
+        # The count is cached
+        with django_assert_num_queries(1):
+            api_client.get(url, {'page': 2})
+
+    def test_writes_are_not_allowed(self, api_client):
+        response = api_client.post(reverse('blog:api-v2:async-post-list'), {})
+        assert response.status_code == 405
+
+
+@pytest.mark.django_db
+class TestAsyncBlogListView:
+
+    def test_renders_same_page_as_sync_view(self, client, posts, category):
+        for params in ({}, {'page': 2}, {'category': category.name}):
+            sync = client.get(reverse('blog:blog-list'), params)
+            asynchronous = client.get(reverse('blog:blog-list-async'), params)
+            assert asynchronous.status_code == 200
+            assert asynchronous.content == sync.content
+            assert [post.id for post in asynchronous.context['object_list']] == [
+                post.id for post in sync.context['object_list']
+            ]
+
+    def test_authors_are_joined(
+        self, client, posts, django_assert_num_queries, category_registry
+    ):
+        category_registry.all()
+        # Count and page rows with their authors
+        with django_assert_num_queries(2):
+            client.get(reverse('blog:blog-list-async'))
+
+    @pytest.mark.parametrize('params', [{'category': 'missing'}, {'page': 9}])
+    def test_not_found(self, client, posts, params):
+        response = client.get(reverse('blog:blog-list-async'), params)
+        assert response.status_code == 404
@@ -0,0 +1,122 @@
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from ..models import Post, Category
+from accounts.models import User, Profile
+import pytest
+
+@pytest.fixture
+def author():
+    return User.objects.create_user(email='author@test.com', password='zZ@12345')
+
+@pytest.fixture
+def other():
+    return User.objects.create_user(email='other@test.com', password='zZ@12345')
+
+@pytest.fixture
+def category():
+    return Category.objects.create(name='category')
+
+@pytest.fixture
+def post(author, category):
+    return Post.objects.create(
+        author=Profile.objects.get(user=author),
+        title='post',
+        content='description',
+        category=category,
+        status=True,
+        published_date=timezone.now(),
+    )
+
+@pytest.fixture
+def form_data(category):
+    return {
+        'title': 'new title',
+        'content': 'new content',
+        'category': category.id,
+        'status': True,
+        'published_date': '2024-01-01 00:00',
+    }
+
+@pytest.fixture
+def login():
+    def login(user):
+        client = Client()
+        client.force_login(user)
+        return client
+    return login
+
+@pytest.fixture
+def api_login():
+    def api_login(user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+    return api_login
+
+
+@pytest.mark.django_db
+class TestAuthorProfileQueries:
+    """
+    The author's profile is loaded at most once per request and ownership
+    is checked on ids, without loading the profile or its user.
+    """
+
+    def test_create_view(self, author, login, form_data, django_assert_num_queries):
+        client = login(author)
+        # Session, user, category validation, one profile lookup,
+        # the insert and its two full-text index statements
+        with django_assert_num_queries(8):
+            response = client.post(reverse('blog:blog-create'), form_data)
+        assert response.status_code == 302
+        assert Post.objects.get().author.user == author
+
+    def test_edit_view(self, author, post, login, form_data, django_assert_num_queries):
+        client = login(author)
+        url = reverse('blog:blog-edit', kwargs={'pk': post.pk})
+        # Session, user, the owned post joined to its author and categories
+        with django_assert_num_queries(4):
+            assert client.get(url).status_code == 200
+        response = client.post(url, form_data)
+        assert response.status_code == 302
+        post.refresh_from_db()
+        assert post.title == 'new title'
+
+    def test_edit_view_of_other_author(self, other, post, login, form_data):
+        response = login(other).post(
+            reverse('blog:blog-edit', kwargs={'pk': post.pk}), form_data
+        )
+        assert response.status_code == 404
+
+    def test_delete_view(self, author, other, post, login, django_assert_num_queries):
+        client = login(author)
+        url = reverse('blog:blog-delete', kwargs={'pk': post.pk})
+        # Session, user and the owned post
+        with django_assert_num_queries(3):
+            assert client.get(url).status_code == 200
+        assert login(other).post(url).status_code == 404
+        assert client.post(url).status_code == 302
+        assert not Post.objects.exists()
+
+    def test_api_create(self, author, api_login, category, django_assert_num_queries):
+        client = api_login(author)
+        data = {'title': 'api post', 'content': 'content', 'category': category.id,
+                'status': True, 'published_date': '2024-01-01T00:00'}
+        # Category, one profile lookup, the insert, its two full-text
+        # index statements and the category registry refresh
+        with django_assert_num_queries(6):
+            response = client.post(reverse('blog:api-v2:post-list'), data)
+        assert response.status_code == 201
+        assert Post.objects.get().author.user == author
+
+    def test_api_ownership_check(
+        self, author, other, post, api_login, django_assert_num_queries
+    ):
+        url = reverse('blog:api-v2:post-detail', kwargs={'pk': post.pk})
+        # The post joined to its author, no profile or user lookup
+        with django_assert_num_queries(1):
+            response = api_login(other).patch(url, {'title': 'x'})
+        assert response.status_code == 403
+        assert api_login(author).patch(url, {'title': 'x'}).status_code == 200
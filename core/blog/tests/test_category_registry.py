@@ -0,0 +1,86 @@
+from rest_framework.test import APIClient
+from django.test import Client
+from django.db import transaction
+from django.urls import reverse
+
+from .. import cache as list_cache
+from ..categories import REGISTRY, CategoryRegistry
+from ..models import Category
+import pytest
+
+@pytest.fixture
+def api_client():
+    client = APIClient()
+    return client
+
+@pytest.fixture
+def categories():
+    return [Category.objects.create(name=name) for name in ('python', 'django')]
+
+
+@pytest.mark.django_db
+class TestCategoryRegistry:
+
+    def test_lookups_hit_memory_once_loaded(
+        self, categories, category_registry, django_assert_num_queries
+    ):
+        category_registry.all()
+        with django_assert_num_queries(0):
+            assert category_registry.get(categories[0].id) == categories[0]
+            assert category_registry.get_by_name('django') == categories[1]
+            assert list(category_registry.all()) == categories
+
+    def test_unknown_lookups_return_none(self, categories, category_registry):
+        assert category_registry.get(999) is None
+        assert category_registry.get('abc') is None
+        assert category_registry.get_by_name('missing') is None
+
+    def test_writes_reach_other_workers(self, categories):
+        worker = CategoryRegistry(check_interval=60)
+        assert len(worker.all()) == 2
+        created = Category.objects.create(name='new')
+        # Lookup misses re-check the shared version right away
+        assert worker.get(created.id) == created
+        categories[0].name = 'renamed'
+        categories[0].save()
+        worker.check_interval = 0
+        assert worker.get_by_name('renamed') == categories[0]
+        assert worker.get_by_name('python') is None
+
+    def test_writes_bump_again_after_commit(
+        self, categories, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks() as callbacks:
+            with transaction.atomic():
+                categories[0].name = 'renamed'
+                categories[0].save()
+            # Workers may reload from a connection still seeing the old row
+            version = list_cache.get_version(REGISTRY)
+        assert len(callbacks) == 1
+        callbacks[0]()
+        assert list_cache.get_version(REGISTRY) > version
+
+    def test_html_list_filters_by_category_name(self, categories):
+        url = reverse('blog:blog-list')
+        response = Client().get(url, {'category': 'python'})
+        assert response.status_code == 200
+        assert response.context['current_category'] == categories[0]
+        assert list(response.context['categories']) == categories
+        assert Client().get(url, {'category': 'missing'}).status_code == 404
+
+    def test_api_filter_validates_category(self, api_client, categories):
+        url = reverse('blog:api-v2:post-list')
+        assert api_client.get(url, {'category': categories[0].id}).status_code == 200
+        assert api_client.get(url, {'category': 999}).status_code == 400
+        assert api_client.get(url, {'category': 'abc'}).status_code == 400
+
+    def test_category_list_served_from_registry(
+        self, api_client, categories, category_registry, django_assert_num_queries
+    ):
+        category_registry.all()
+        url = reverse('blog:api-v2:category-list')
+        with django_assert_num_queries(0):
+            response = api_client.get(url)
+        assert response.data == [
+            {'id': category.id, 'name': category.name} for category in categories
+        ]
@@ -0,0 +1,142 @@
+from rest_framework.test import APIClient
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from ..models import Post, Category
+from accounts.models import User, Profile
+from comment.models import Comment
+import pytest
+
+@pytest.fixture
+def api_client():
+    client = APIClient()
+    return client
+
+@pytest.fixture
+def user():
+    user = User.objects.create_user(
+        email='test@test.com',
+        password='zZ@12345'
+    )
+    return user
+
+@pytest.fixture
+def category():
+    return Category.objects.create(name='test')
+
+@pytest.fixture
+def make_post(user, category):
+    def make_post():
+        return Post.objects.create(
+            author=Profile.objects.get(user=user),
+            title='test',
+            content='desc',
+            category=category,
+            status=True,
+            published_date=timezone.now()
+        )
+    return make_post
+
+@pytest.fixture
+def post(make_post):
+    return make_post()
+
+@pytest.fixture
+def list_url():
+    return reverse('blog:api-v2:post-list')
+
+@pytest.fixture
+def detail_url(post):
+    return reverse('blog:api-v2:post-detail', kwargs={'pk': post.id})
+
+
+@pytest.mark.django_db
+class TestConditionalGetAPI:
+
+    def test_list_and_detail_emit_validators(
+            self, api_client, list_url, detail_url
+        ):
+        for url in (list_url, detail_url):
+            response = api_client.get(url)
+            assert response.has_header('ETag')
+            assert not response.has_header('Last-Modified')
+
+    def test_list_if_none_match_returns_304_without_serializing(
+            self, api_client, user, list_url, post, django_assert_num_queries
+        ):
+        api_client.force_authenticate(user=user)
+        etag = api_client.get(list_url)['ETag']
+        # Only the validator aggregate runs; no COUNT(*) or page SELECT
+        with django_assert_num_queries(1):
+            response = api_client.get(list_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+    def test_cached_list_if_none_match_skips_database(
+            self, api_client, list_url, post, django_assert_num_queries
+        ):
+        etag = api_client.get(list_url)['ETag']
+        with django_assert_num_queries(0):
+            response = api_client.get(list_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+    def test_list_etag_changes_after_update(self, api_client, list_url, post):
+        etag = api_client.get(list_url)['ETag']
+        post.title = 'edited'
+        post.save()
+        response = api_client.get(list_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+    def test_list_etag_depends_on_query_string(self, api_client, list_url, post):
+        etag = api_client.get(list_url)['ETag']
+        response = api_client.get(list_url, {'page_size': 1}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+    def test_detail_if_none_match_returns_304(self, api_client, detail_url):
+        etag = api_client.get(detail_url)['ETag']
+        response = api_client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+    def test_list_if_modified_since_alone_after_delete(
+            self, api_client, list_url, post, make_post
+        ):
+        make_post()
+        since = http_date(timezone.now().timestamp() + 60)
+        post.delete()
+        response = api_client.get(list_url, HTTP_IF_MODIFIED_SINCE=since)
+        assert response.status_code == 200
+        assert response.data['count'] == 1
+
+    def test_detail_if_modified_since_alone_after_comment(
+            self, api_client, user, detail_url, post
+        ):
+        since = http_date(timezone.now().timestamp() + 60)
+        Comment.objects.create(post=post, author=user, body='new')
+        response = api_client.get(detail_url, HTTP_IF_MODIFIED_SINCE=since)
+        assert response.status_code == 200
+        assert response.data['comment_count'] == 1
+
+    def test_cursor_list_skips_fingerprint(
+            self, api_client, user, list_url, post, django_assert_num_queries
+        ):
+        api_client.force_authenticate(user=user)
+        params = {'pagination': 'cursor'}
+        api_client.get(list_url, params)
+        # Only the keyset page, no aggregate over the filtered posts
+        with django_assert_num_queries(1):
+            response = api_client.get(list_url, params)
+        assert response.status_code == 200
+        assert not response.has_header('ETag')
+
+    def test_category_rename_changes_etags(
+            self, api_client, list_url, detail_url, category
+        ):
+        etags = {url: api_client.get(url)['ETag'] for url in (list_url, detail_url)}
+        category.name = 'renamed'
+        category.save()
+        for url, etag in etags.items():
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200
+            data = response.data.get('results', [response.data])[0]
+            assert data['category']['name'] == 'renamed'
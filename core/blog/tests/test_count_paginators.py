@@ -0,0 +1,99 @@
+from rest_framework.test import APIClient
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Post
+from ..paginators import PostCountPaginator, EstimatedPostCountPaginator
+from accounts.models import User, Profile
+import pytest
+
+@pytest.fixture
+def api_client():
+    client = APIClient()
+    return client
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(email='test@test.com', password='zZ@12345')
+
+@pytest.fixture
+def make_posts(user):
+    profile = Profile.objects.get(user=user)
+    def make_posts(count):
+        return Post.objects.bulk_create(
+            Post(
+                author=profile,
+                title=f'post {i}',
+                content='description',
+                status=True,
+                published_date=timezone.now(),
+                # bulk_create skips the pre_save receiver that sets it
+                is_live=True,
+            )
+            for i in range(count)
+        )
+    return make_posts
+
+
+@pytest.mark.django_db
+class TestCountPaginators:
+
+    def test_count_is_cached_per_query(self, make_posts, django_assert_num_queries):
+        make_posts(4)
+        queryset = Post.objects.order_by('-id')
+        assert PostCountPaginator(queryset, 2).count == 4
+        with django_assert_num_queries(0):
+            assert PostCountPaginator(queryset, 2).count == 4
+        # Another filter combination has its own count
+        assert PostCountPaginator(queryset.filter(pk__lte=0), 2).count == 0
+
+    def test_post_write_invalidates_cached_count(self, make_posts, user):
+        make_posts(2)
+        queryset = Post.objects.order_by('-id')
+        assert PostCountPaginator(queryset, 2).count == 2
+        Post.objects.create(
+            author=Profile.objects.get(user=user), title='new', content='c',
+            status=True, published_date=timezone.now()
+        )
+        assert PostCountPaginator(queryset, 2).count == 3
+
+    def test_api_list_reuses_cached_count(
+        self, api_client, user, make_posts, django_assert_num_queries
+    ):
+        make_posts(5)
+        api_client.force_authenticate(user=user)
+        url = reverse('blog:api-v2:post-list')
+        assert api_client.get(url).data['count'] == 5
+        # Validator aggregate and the page; COUNT(*) comes from the cache
+        with django_assert_num_queries(2):
+            response = api_client.get(url, {'page': 2})
+        assert response.data['count'] == 5
+
+    def test_html_list_reuses_cached_count(self, client, make_posts):
+        make_posts(5)
+        url = reverse('blog:blog-list')
+        assert client.get(url).context['paginator'].num_pages == 3
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, {'page': 2})
+        assert response.context['paginator'].count == 5
+        assert not any('COUNT(' in query['sql'] for query in queries)
+
+    @pytest.mark.skipif(connection.vendor != 'sqlite', reason='sqlite_stat1')
+    def test_estimated_count_uses_table_statistics(self, make_posts):
+        make_posts(6)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        make_posts(1)
+        paginator = EstimatedPostCountPaginator(Post.objects.order_by('-id'), 2)
+        paginator.estimate_threshold = 1
+        # Statistics were gathered before the last insert
+        assert paginator.count == 6
+
+    def test_estimated_count_falls_back_to_exact_count(self, make_posts):
+        make_posts(3)
+        paginator = EstimatedPostCountPaginator(
+            Post.objects.filter(status=True).order_by('-id'), 2
+        )
+        assert paginator.count == 3
@@ -0,0 +1,86 @@
+from rest_framework.test import APIClient
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Post, Category
+from accounts.models import User, Profile
+import pytest
+
+@pytest.fixture
+def api_client():
+    client = APIClient()
+    user = User.objects.create_user(email='test@test.com', password='zZ@12345')
+    client.force_authenticate(user=user)
+    return client
+
+@pytest.fixture
+def posts():
+    user = User.objects.create_user(email='author@test.com', password='zZ@12345')
+    profile = Profile.objects.get(user=user)
+    category = Category.objects.create(name='test')
+    variants = [
+        {'category': category, 'image': 'post.jpg'},
+        {'category': None, 'image': None},
+        {'category': category, 'image': ''},
+    ]
+    return [
+        Post.objects.create(
+            author=profile,
+            title=f'post {i}',
+            content='description',
+            status=bool(i % 2),
+            published_date=timezone.now(),
+            comment_count=i,
+            **variant,
+        )
+        for i, variant in enumerate(variants)
+    ]
+
+
+def fetch(client, settings, url, params, fast):
+    settings.BLOG_FAST_LIST = fast
+    response = client.get(url, params)
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.django_db
+class TestFastListAPI:
+
+    @pytest.mark.parametrize('params', [
+        {},
+        {'page': 1},
+        {'pagination': 'cursor'},
+        {'ordering': 'comment_count'},
+    ])
+    def test_post_list_matches_serializer(self, api_client, posts, settings, params):
+        url = reverse('blog:api-v2:post-list')
+        normal = fetch(api_client, settings, url, params, fast=False)
+        quick = fetch(api_client, settings, url, params, fast=True)
+        assert normal['results']
+        assert quick == normal
+
+    def test_cursor_next_page_matches_serializer(self, api_client, posts, settings):
+        url = reverse('blog:api-v2:post-list')
+        params = {'pagination': 'cursor', 'page_size': 2}
+        first = fetch(api_client, settings, url, params, fast=True)
+        assert first['next']
+        normal = fetch(api_client, settings, first['next'], {}, fast=False)
+        quick = fetch(api_client, settings, first['next'], {}, fast=True)
+        assert quick == normal
+
+    def test_category_list_matches_serializer(self, api_client, posts, settings):
+        url = reverse('blog:api-v2:category-list')
+        normal = fetch(api_client, settings, url, {}, fast=False)
+        quick = fetch(api_client, settings, url, {}, fast=True)
+        assert quick == normal
+
+    def test_fast_list_skips_joins_per_row(
+        self, api_client, posts, settings, django_assert_num_queries,
+        category_registry
+    ):
+        settings.BLOG_FAST_LIST = True
+        category_registry.all()
+        url = reverse('blog:api-v2:post-list')
+        with django_assert_num_queries(3):
+            api_client.get(url)
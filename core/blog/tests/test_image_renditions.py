@@ -0,0 +1,117 @@
+from rest_framework.test import APIClient
+from django.core.files.base import ContentFile
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from unittest import mock
+
+from ..models import Post
+from ..tasks import generate_post_renditions
+from accounts.models import User, Profile
+from accounts.tasks import generate_profile_renditions
+import io
+import pytest
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+@pytest.fixture
+def api_client():
+    client = APIClient()
+    return client
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(email='test@test.com', password='zZ@12345')
+
+@pytest.fixture
+def profile(user):
+    return Profile.objects.get(user=user)
+
+
+def image_file(width, height):
+    buffer = io.BytesIO()
+    Image.new('RGBA', (width, height), (200, 30, 30, 255)).save(buffer, 'PNG')
+    return ContentFile(buffer.getvalue(), name='upload.png')
+
+
+def make_post(profile, image):
+    post = Post(
+        author=profile, title='post', content='c', status=True,
+        published_date=timezone.now()
+    )
+    post.image.save('upload.png', image, save=False)
+    with mock.patch.object(generate_post_renditions, 'delay'):
+        post.save()
+    return post
+
+
+@pytest.mark.django_db
+class TestImageRenditions:
+
+    def test_save_schedules_rendering_after_commit(
+        self, profile, django_capture_on_commit_callbacks
+    ):
+        post = Post(
+            author=profile, title='post', content='c', status=True,
+            published_date=timezone.now()
+        )
+        post.image.save('upload.png', image_file(50, 50), save=False)
+        with mock.patch.object(generate_post_renditions, 'delay') as delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                post.save()
+            delay.assert_called_once_with(post.pk)
+            delay.reset_mock()
+            # Saves that keep the image do not render again
+            with django_capture_on_commit_callbacks(execute=True):
+                Post.objects.get(pk=post.pk).save()
+            delay.assert_not_called()
+
+    def test_task_writes_every_width_and_format(self, profile, media_root):
+        post = make_post(profile, image_file(2000, 1000))
+        generate_post_renditions(post.pk)
+        post.refresh_from_db()
+        assert set(post.image_renditions) == {'320', '640', '1280'}
+        for width, formats in post.image_renditions.items():
+            assert set(formats) == {'jpeg', 'webp'}
+            with Image.open(media_root / formats['webp']) as rendition:
+                assert rendition.format == 'WEBP'
+                assert rendition.size == (int(width), int(width) // 2)
+
+    def test_small_images_are_not_upscaled(self, profile):
+        post = make_post(profile, image_file(200, 100))
+        generate_post_renditions(post.pk)
+        post.refresh_from_db()
+        assert list(post.image_renditions) == ['200']
+
+    def test_new_image_replaces_old_renditions(self, profile, media_root):
+        post = make_post(profile, image_file(400, 400))
+        generate_post_renditions(post.pk)
+        post.refresh_from_db()
+        old = post.image_renditions['320']['jpeg']
+        post.image.save('other.png', image_file(400, 400), save=False)
+        with mock.patch.object(generate_post_renditions, 'delay'):
+            post.save()
+        generate_post_renditions(post.pk)
+        post.refresh_from_db()
+        assert not (media_root / old).exists()
+        assert (media_root / post.image_renditions['320']['jpeg']).exists()
+
+    def test_api_exposes_rendition_urls(self, api_client, profile):
+        post = make_post(profile, image_file(800, 400))
+        generate_post_renditions(post.pk)
+        url = reverse('blog:api-v2:post-detail', kwargs={'pk': post.pk})
+        renditions = api_client.get(url).data['image_renditions']
+        assert set(renditions) == {'320', '640', '800'}
+        assert renditions['320']['webp'].startswith('http://testserver/media/')
+        assert renditions['320']['webp'].endswith('.webp')
+
+    def test_profile_renditions(self, profile):
+        profile.image.save('avatar.png', image_file(700, 700), save=False)
+        with mock.patch.object(generate_profile_renditions, 'delay'):
+            profile.save()
+        generate_profile_renditions(profile.pk)
+        profile.refresh_from_db()
+        assert set(profile.image_renditions) == {'320', '640', '700'}
@@ -0,0 +1,135 @@
+from rest_framework.test import APIClient
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Post, Category
+from accounts.models import User, Profile
+import pytest
+
+@pytest.fixture
+def api_client():
+    client = APIClient()
+    return client
+
+@pytest.fixture
+def user():
+    user = User.objects.create_user(
+        email='test@test.com',
+        password='zZ@12345'
+    )
+    return user
+
+@pytest.fixture
+def admin_user():
+    return User.objects.create_superuser(
+        email='admin@test.com',
+        password='zZ@12345'
+    )
+
+@pytest.fixture
+def categories():
+    return Category.objects.create(name='IT'), Category.objects.create(name='Fun')
+
+@pytest.fixture
+def make_post(user):
+    profile = Profile.objects.get(user=user)
+    def make_post(category=None):
+        return Post.objects.create(
+            author=profile,
+            title='test',
+            content='desc',
+            category=category,
+            status=True,
+            published_date=timezone.now()
+        )
+    return make_post
+
+@pytest.fixture
+def url():
+    return reverse('blog:api-v2:post-list')
+
+
+@pytest.mark.django_db
+class TestListCacheAPI:
+
+    def test_second_anonymous_request_is_served_from_cache(
+            self, api_client, url, make_post, django_assert_num_queries
+        ):
+        make_post()
+        first = api_client.get(url)
+        assert first['X-Cache'] == 'MISS'
+        with django_assert_num_queries(0):
+            second = api_client.get(url)
+        assert second['X-Cache'] == 'HIT'
+        assert second.data == first.data
+
+    def test_query_string_is_part_of_the_key(self, api_client, url, make_post):
+        for _ in range(4):
+            make_post()
+        api_client.get(url, {'page': 1})
+        response = api_client.get(url, {'page': 2})
+        assert response['X-Cache'] == 'MISS'
+        assert len(response.data['results']) == 1
+
+    def test_format_is_part_of_the_key(self, api_client, url, make_post):
+        make_post()
+        etag = api_client.get(url)['ETag']
+        response = api_client.get(url, HTTP_ACCEPT='text/html', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['X-Cache'] == 'MISS'
+        assert response['ETag'] != etag
+        assert response['Content-Type'].startswith('text/html')
+
+    def test_authenticated_requests_bypass_cache(self, api_client, url, user):
+        api_client.force_authenticate(user=user)
+        api_client.get(url)
+        response = api_client.get(url)
+        assert 'X-Cache' not in response
+
+    def test_write_invalidates_only_affected_category(
+            self, api_client, url, make_post, categories
+        ):
+        it, fun = categories
+        for params in ({}, {'category': it.id}, {'category': fun.id}):
+            api_client.get(url, params)
+        make_post(category=it)
+        assert api_client.get(url)['X-Cache'] == 'MISS'
+        assert api_client.get(url, {'category': it.id})['X-Cache'] == 'MISS'
+        assert api_client.get(url, {'category': fun.id})['X-Cache'] == 'HIT'
+
+    def test_moving_post_invalidates_old_category(
+            self, api_client, url, make_post, categories
+        ):
+        it, fun = categories
+        post = make_post(category=it)
+        api_client.get(url, {'category': it.id})
+        post = Post.objects.get(pk=post.pk)
+        post.category = fun
+        post.save()
+        response = api_client.get(url, {'category': it.id})
+        assert response['X-Cache'] == 'MISS'
+        assert response.data['count'] == 0
+
+    def test_category_rename_invalidates_lists(
+            self, api_client, url, make_post, categories
+        ):
+        it, _ = categories
+        make_post(category=it)
+        api_client.get(url)
+        api_client.get(reverse('blog:api-v2:category-list'))
+        it.name = 'Tech'
+        it.save()
+        response = api_client.get(url)
+        assert response.data['results'][0]['category']['name'] == 'Tech'
+        response = api_client.get(reverse('blog:api-v2:category-list'))
+        assert response['X-Cache'] == 'MISS'
+
+    def test_cache_stats_for_admin_only(self, api_client, url, user, admin_user):
+        api_client.get(url)
+        api_client.get(url)
+        stats_url = reverse('blog:api-v2:cache-stats')
+        api_client.force_authenticate(user=user)
+        assert api_client.get(stats_url).status_code == 403
+        api_client.force_authenticate(user=admin_user)
+        response = api_client.get(stats_url)
+        assert response.data['post-list'] == {'hits': 1, 'misses': 1}
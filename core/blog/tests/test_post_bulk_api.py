@@ -0,0 +1,125 @@
+from rest_framework.test import APIClient
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Post, Category
+from accounts.models import User, Profile
+import pytest
+
+@pytest.fixture
+def api_client():
+    client = APIClient()
+    return client
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(email='test@test.com', password='zZ@12345')
+
+@pytest.fixture
+def profile(user):
+    return Profile.objects.get(user=user)
+
+@pytest.fixture
+def category():
+    return Category.objects.create(name='test')
+
+@pytest.fixture
+def url():
+    return reverse('blog:api-v2:post-bulk')
+
+
+def new_post(title, category=None):
+    return {
+        'title': title,
+        'content': 'description',
+        'status': True,
+        'category': category,
+        'published_date': timezone.now().isoformat(),
+    }
+
+
+@pytest.mark.django_db
+class TestPostBulkAPI:
+
+    def test_bulk_requires_authentication(self, api_client, url):
+        response = api_client.post(url, [new_post('a')], format='json')
+        assert response.status_code == 401
+
+    def test_bulk_rejects_non_list_payload(self, api_client, user, url):
+        api_client.force_authenticate(user=user)
+        response = api_client.post(url, new_post('a'), format='json')
+        assert response.status_code == 400
+
+    def test_bulk_create(self, api_client, user, profile, category, url):
+        api_client.force_authenticate(user=user)
+        payload = [new_post(f'post {i}', category.id) for i in range(5)]
+        response = api_client.post(url, payload, format='json')
+        assert response.status_code == 200
+        assert response.data['created'] == 5
+        ids = [result['id'] for result in response.data['results']]
+        posts = Post.objects.filter(pk__in=ids)
+        assert posts.count() == 5
+        assert all(post.author_id == profile.id for post in posts)
+        assert all(post.category_id == category.id for post in posts)
+
+    def test_bulk_query_count_is_flat(
+        self, api_client, user, category, url, django_assert_max_num_queries
+    ):
+        api_client.force_authenticate(user=user)
+        payload = [new_post(f'post {i}', category.id) for i in range(50)]
+        with django_assert_max_num_queries(12):
+            response = api_client.post(url, payload, format='json')
+        assert response.status_code == 200
+
+    def test_bulk_update_own_posts_only(self, api_client, user, profile, url):
+        other = User.objects.create_user(email='other@test.com', password='zZ@12345')
+        mine = Post.objects.create(
+            author=profile, title='mine', content='c', status=True,
+            published_date=timezone.now()
+        )
+        theirs = Post.objects.create(
+            author=Profile.objects.get(user=other), title='theirs', content='c',
+            status=True, published_date=timezone.now()
+        )
+        api_client.force_authenticate(user=user)
+        payload = [
+            {'id': mine.id, 'title': 'changed'},
+            {'id': theirs.id, 'title': 'changed'},
+        ]
+        response = api_client.post(url, payload, format='json')
+        assert response.status_code == 207
+        assert response.data['updated'] == 1
+        assert response.data['results'][0]['status'] == 'updated'
+        assert response.data['results'][1]['errors'] == {'id': ['Not found.']}
+        mine.refresh_from_db()
+        theirs.refresh_from_db()
+        assert mine.title == 'changed'
+        assert theirs.title == 'theirs'
+
+    def test_bulk_reports_item_errors(self, api_client, user, category, url):
+        api_client.force_authenticate(user=user)
+        payload = [new_post('ok', category.id), {'title': 'missing fields'}, new_post('x', 999)]
+        response = api_client.post(url, payload, format='json')
+        assert response.status_code == 207
+        statuses = [result['status'] for result in response.data['results']]
+        assert statuses == ['created', 'error', 'error']
+        assert 'category' in response.data['results'][2]['errors']
+        assert Post.objects.count() == 1
+
+    def test_bulk_created_posts_are_searchable(self, api_client, user, url):
+        api_client.force_authenticate(user=user)
+        api_client.post(url, [new_post('unusualword')], format='json')
+        response = api_client.get(
+            reverse('blog:api-v2:post-search'), {'q': 'unusualword'}
+        )
+        assert len(response.data['results']) == 1
+
+    def test_bulk_invalidates_cached_list(self, api_client, user, url):
+        list_url = reverse('blog:api-v2:post-list')
+        api_client.get(list_url)
+        api_client.force_authenticate(user=user)
+        api_client.post(url, [new_post('fresh')], format='json')
+        api_client.force_authenticate(user=None)
+        response = api_client.get(list_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.data['count'] == 1
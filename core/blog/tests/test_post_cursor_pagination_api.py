@@ -0,0 +1,131 @@
+from rest_framework.test import APIClient
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Post, Category
+from accounts.models import User, Profile
+import pytest
+
+@pytest.fixture
+def api_client():
+    client = APIClient()
+    return client
+
+@pytest.fixture
+def profile():
+    user = User.objects.create_user(
+        email='test@test.com',
+        password='zZ@12345'
+    )
+    return Profile.objects.get(user=user)
+
+@pytest.fixture
+def category():
+    return Category.objects.create(name='IT')
+
+@pytest.fixture
+def posts(profile, category):
+    return [
+        Post.objects.create(
+            author=profile,
+            title=f'test {i}',
+            content='desc',
+            category=category if i % 2 else None,
+            status=True,
+            published_date=timezone.now()
+        )
+        for i in range(8)
+    ]
+
+@pytest.fixture
+def url():
+    return reverse('blog:api-v2:post-list')
+
+
+def walk(client, url, params=None):
+    """
+    Follow next links from the first cursor page and collect post ids.
+    """
+    response = client.get(url, {'pagination': 'cursor', **(params or {})})
+    ids = [item['id'] for item in response.data['results']]
+    while response.data['next']:
+        response = client.get(response.data['next'])
+        ids += [item['id'] for item in response.data['results']]
+    return ids
+
+
+@pytest.mark.django_db
+class TestPostCursorPaginationAPI:
+
+    def test_page_number_is_still_the_default(self, api_client, url, posts):
+        response = api_client.get(url)
+        assert response.status_code == 200
+        assert response.data['count'] == len(posts)
+
+    def test_cursor_page_has_no_count(self, api_client, url, posts):
+        response = api_client.get(url, {'pagination': 'cursor'})
+        assert response.status_code == 200
+        assert 'count' not in response.data
+        assert response.data['previous'] is None
+        assert len(response.data['results']) == 3
+
+    def test_walk_returns_every_post_newest_first(self, api_client, url, posts):
+        expected = [
+            post.id for post in
+            Post.objects.order_by('-created_date', '-id')
+        ]
+        assert walk(api_client, url) == expected
+
+    def test_concurrent_insert_does_not_shift_pages(
+            self, api_client, url, posts, profile
+        ):
+        first = api_client.get(url, {'pagination': 'cursor'})
+        Post.objects.create(
+            author=profile,
+            title='newer',
+            content='desc',
+            status=True,
+            published_date=timezone.now()
+        )
+        second = api_client.get(first.data['next'])
+        seen = [item['id'] for item in first.data['results']]
+        seen += [item['id'] for item in second.data['results']]
+        expected = [
+            post.id for post in
+            sorted(posts, key=lambda p: (p.created_date, p.id), reverse=True)
+        ]
+        assert seen == expected[:6]
+
+    def test_previous_link_returns_previous_page(self, api_client, url, posts):
+        first = api_client.get(url, {'pagination': 'cursor'})
+        second = api_client.get(first.data['next'])
+        back = api_client.get(second.data['previous'])
+        assert back.data['results'] == first.data['results']
+        assert back.data['previous'] is None
+
+    def test_cursor_respects_category_filter(
+            self, api_client, url, posts, category
+        ):
+        ids = walk(api_client, url, {'category': category.id})
+        assert ids == [
+            post.id for post in
+            Post.objects.filter(category=category).order_by('-created_date', '-id')
+        ]
+
+    def test_invalid_cursor_returns_404(self, api_client, url, posts):
+        response = api_client.get(url, {'pagination': 'cursor', 'cursor': 'bad'})
+        assert response.status_code == 404
+
+    def test_cursor_rejects_other_orderings(self, api_client, url, posts):
+        params = {'pagination': 'cursor', 'ordering': 'comment_count'}
+        response = api_client.get(url, params)
+        assert response.status_code == 400
+        assert 'pagination' in response.data
+        assert walk(api_client, url, {'ordering': '-created_date'}) == [
+            post.id for post in reversed(posts)
+        ]
+
+    def test_cursor_rejects_search(self, api_client, posts):
+        url = reverse('blog:api-v2:post-search')
+        response = api_client.get(url, {'q': 'test', 'pagination': 'cursor'})
+        assert response.status_code == 400
@@ -0,0 +1,91 @@
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Post
+from accounts.models import User, Profile
+from comment.models import Comment
+import pytest
+
+@pytest.fixture
+def author():
+    return User.objects.create_user(email='author@test.com', password='zZ@12345')
+
+@pytest.fixture
+def reader():
+    return User.objects.create_user(email='reader@test.com', password='zZ@12345')
+
+@pytest.fixture
+def post(author):
+    return Post.objects.create(
+        author=Profile.objects.get(user=author),
+        title='post',
+        content='description',
+        status=True,
+        published_date=timezone.now(),
+    )
+
+@pytest.fixture
+def comments(post, author, reader):
+    return [
+        Comment.objects.create(
+            post=post, author=reader if i % 2 else author, body=f'comment {i}'
+        )
+        for i in range(6)
+    ]
+
+
+def render(user, post):
+    client = Client()
+    client.force_login(user)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse('blog:blog-detail', kwargs={'pk': post.pk}))
+    assert response.status_code == 200
+    return response.content.decode(), len(queries)
+
+
+@pytest.mark.django_db
+class TestPostDetailView:
+
+    def test_comment_thread_is_cached(self, reader, post, comments):
+        content, cold = render(reader, post)
+        assert 'comment 5' in content
+        content, warm = render(reader, post)
+        assert 'comment 5' in content
+        # The joined comments query is skipped once the thread is cached
+        assert warm == cold - 1
+
+    def test_cold_render_query_count_does_not_grow(self, reader, post, author):
+        Comment.objects.create(post=post, author=reader, body='first')
+        _, few = render(reader, post)
+        for i in range(5):
+            Comment.objects.create(post=post, author=author, body=f'more {i}')
+        _, many = render(reader, post)
+        assert many == few
+
+    def test_new_comment_invalidates_thread(self, reader, post, comments):
+        render(reader, post)
+        Comment.objects.create(post=post, author=reader, body='brand new')
+        content, _ = render(reader, post)
+        assert 'brand new' in content
+
+    def test_deleted_comment_leaves_thread(self, reader, post, comments):
+        render(reader, post)
+        comments[0].delete()
+        content, _ = render(reader, post)
+        assert 'comment 0' not in content
+
+    def test_delete_links_are_per_user(self, author, reader, post, comments):
+        content, _ = render(author, post)
+        own = [c for c in comments if c.author == author]
+        others = [c for c in comments if c.author == reader]
+        # The reader's render below comes from the cached thread
+        reader_content, _ = render(reader, post)
+        for comment in own:
+            url = reverse('comment:delete', args=[comment.id])
+            assert url in content
+            assert url not in reader_content
+        for comment in others:
+            assert reverse('comment:delete', args=[comment.id]) in reader_content
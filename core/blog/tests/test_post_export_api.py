@@ -0,0 +1,56 @@
+from rest_framework.test import APIClient
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Post
+from accounts.models import User, Profile
+import json
+import pytest
+
+@pytest.fixture
+def api_client():
+    client = APIClient()
+    return client
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(email='test@test.com', password='zZ@12345')
+
+@pytest.fixture
+def posts(user):
+    profile = Profile.objects.get(user=user)
+    return Post.objects.bulk_create(
+        Post(
+            author=profile,
+            title=f'post {i}',
+            content='description',
+            status=True,
+            published_date=timezone.now(),
+        )
+        for i in range(5)
+    )
+
+@pytest.fixture
+def url():
+    return reverse('blog:api-v1:blog-export')
+
+
+@pytest.mark.django_db
+class TestPostExportAPI:
+
+    def test_export_requires_authentication(self, api_client, url):
+        response = api_client.get(url)
+        assert response.status_code == 401
+
+    def test_export_streams_one_post_per_line(self, api_client, user, posts, url):
+        api_client.force_authenticate(user=user)
+        response = api_client.get(url)
+        assert response.status_code == 200
+        assert response.streaming
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        assert [row['id'] for row in rows] == [post.id for post in posts]
+        assert set(rows[0]) == {
+            'id', 'title', 'content', 'status', 'author', 'published_date'
+        }
@@ -0,0 +1,69 @@
+from rest_framework.test import APIClient
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Post, Category
+from accounts.models import User, Profile
+import pytest
+
+@pytest.fixture
+def api_client():
+    client = APIClient()
+    return client
+
+@pytest.fixture
+def profiles():
+    return [
+        Profile.objects.get(
+            user=User.objects.create_user(
+                email=f'test{i}@test.com', password='zZ@12345'
+            )
+        )
+        for i in range(3)
+    ]
+
+@pytest.fixture
+def make_posts(profiles, category_registry):
+    def make_posts(count):
+        for i in range(count):
+            Post.objects.create(
+                author=profiles[i % len(profiles)],
+                title=f'test {i}',
+                content='desc',
+                category=Category.objects.create(name=f'category {i}'),
+                status=True,
+                published_date=timezone.now()
+            )
+        # Nested categories come from the per-process registry, which
+        # loads once per worker; count the queries of a warm worker
+        category_registry.all()
+    return make_posts
+
+@pytest.fixture
+def url():
+    return reverse('blog:api-v2:post-list')
+
+
+@pytest.mark.django_db
+class TestPostListQueries:
+
+    @pytest.mark.parametrize('count', [1, 3, 9])
+    def test_page_number_list_query_count_is_constant(
+            self, api_client, url, make_posts, django_assert_num_queries, count
+        ):
+        make_posts(count)
+        # Validator aggregate, COUNT(*) and one joined SELECT for the page
+        with django_assert_num_queries(3):
+            response = api_client.get(url)
+        assert response.status_code == 200
+        assert all(item['category'] for item in response.data['results'])
+
+    @pytest.mark.parametrize('count', [1, 3, 9])
+    def test_cursor_list_query_count_is_constant(
+            self, api_client, url, make_posts, django_assert_num_queries, count
+        ):
+        make_posts(count)
+        # One joined SELECT for the page, no validator aggregate
+        with django_assert_num_queries(1):
+            response = api_client.get(url, {'pagination': 'cursor'})
+        assert response.status_code == 200
@@ -0,0 +1,115 @@
+from rest_framework.test import APIClient
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Post, Category
+from ..search import search
+from accounts.models import User, Profile
+import pytest
+
+@pytest.fixture
+def api_client():
+    client = APIClient()
+    return client
+
+@pytest.fixture
+def profile():
+    user = User.objects.create_user(
+        email='test@test.com',
+        password='zZ@12345'
+    )
+    return Profile.objects.get(user=user)
+
+@pytest.fixture
+def make_post(profile):
+    def make_post(title, content, category=None):
+        return Post.objects.create(
+            author=profile,
+            title=title,
+            content=content,
+            category=category,
+            status=True,
+            published_date=timezone.now()
+        )
+    return make_post
+
+@pytest.fixture
+def url():
+    return reverse('blog:api-v2:post-search')
+
+
+def result_ids(response):
+    return [item['id'] for item in response.data['results']]
+
+
+@pytest.mark.django_db
+class TestPostSearchAPI:
+
+    def test_search_requires_query(self, api_client, url):
+        response = api_client.get(url)
+        assert response.status_code == 400
+
+    def test_title_match_ranks_above_content_match(self, api_client, url, make_post):
+        in_content = make_post('weekly notes', 'a short django tip')
+        in_title = make_post('django tips', 'about web frameworks')
+        make_post('unrelated', 'nothing to see')
+        response = api_client.get(url, {'q': 'django'})
+        assert response.status_code == 200
+        assert result_ids(response) == [in_title.id, in_content.id]
+
+    def test_all_words_must_match(self, api_client, url, make_post):
+        both = make_post('django caching', 'redis')
+        make_post('django', 'signals')
+        response = api_client.get(url, {'q': 'django redis'})
+        assert result_ids(response) == [both.id]
+
+    def test_query_syntax_is_escaped(self, api_client, url, make_post):
+        make_post('quotes', 'say "hello" OR NOT')
+        response = api_client.get(url, {'q': '"hello" OR ('})
+        assert response.status_code == 200
+
+    def test_index_follows_update_and_delete(self, api_client, url, make_post):
+        post = make_post('old title', 'body')
+        post.title = 'fresh title'
+        post.save()
+        assert result_ids(api_client.get(url, {'q': 'old'})) == []
+        assert result_ids(api_client.get(url, {'q': 'fresh'})) == [post.id]
+        post.delete()
+        assert result_ids(api_client.get(url, {'q': 'fresh'})) == []
+
+    def test_search_respects_category_filter(self, api_client, url, make_post):
+        category = Category.objects.create(name='IT')
+        inside = make_post('django', 'body', category=category)
+        make_post('django', 'body')
+        response = api_client.get(url, {'q': 'django', 'category': category.id})
+        assert result_ids(response) == [inside.id]
+
+    def test_search_composes_like_a_queryset(self, make_post):
+        category = Category.objects.create(name='IT')
+        inside = make_post('django', 'body', category=category)
+        content = make_post('other', 'django', category=category)
+        make_post('django', 'body')
+        results = search(Post.objects.all(), 'django').filter(category=category)
+        assert results.count() == 2
+        assert list(results.values_list('id', flat=True)) == [inside.id, content.id]
+        # Extra tables used to be dropped from the UPDATE statement
+        assert results.update(status=False) == 2
+        assert Post.objects.filter(status=True).count() == 1
+
+    def test_rebuild_indexes_bulk_created_posts(
+            self, api_client, url, make_post, profile
+        ):
+        Post.objects.bulk_create([
+            Post(
+                author=profile,
+                title='imported post',
+                content='body',
+                status=True,
+                published_date=timezone.now()
+            )
+        ])
+        assert result_ids(api_client.get(url, {'q': 'imported'})) == []
+        call_command('rebuild_search_index', batch_size=1)
+        response = api_client.get(url, {'q': 'imported'})
+        assert response.data['count'] == 1
@@ -0,0 +1,95 @@
+from rest_framework.test import APIClient
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+
+from ..models import Post
+from ..tasks import publish_due_posts
+from accounts.models import User, Profile
+import pytest
+
+@pytest.fixture
+def api_client():
+    client = APIClient()
+    return client
+
+@pytest.fixture
+def profile():
+    user = User.objects.create_user(email='test@test.com', password='zZ@12345')
+    return Profile.objects.get(user=user)
+
+@pytest.fixture
+def make_post(profile):
+    def make_post(title, published_date, status=True):
+        return Post.objects.create(
+            author=profile,
+            title=title,
+            content='description',
+            status=status,
+            published_date=published_date,
+        )
+    return make_post
+
+
+def html_titles():
+    response = Client().get(reverse('blog:blog-list'))
+    return [post.title for post in response.context['object_list']]
+
+
+@pytest.mark.django_db
+class TestScheduledPublishing:
+
+    def test_live_state_follows_status_and_date(self, make_post):
+        now = timezone.now()
+        assert make_post('past', now - timedelta(minutes=1)).is_live
+        assert not make_post('future', now + timedelta(hours=1)).is_live
+        assert not make_post('draft', now - timedelta(minutes=1), status=False).is_live
+
+    def test_scheduled_posts_are_hidden_until_due(self, make_post):
+        make_post('past', timezone.now() - timedelta(minutes=1))
+        make_post('future', timezone.now() + timedelta(hours=1))
+        assert html_titles() == ['past']
+
+    def test_publish_due_posts_in_batches(self, make_post):
+        due = [make_post(f'due {i}', timezone.now()) for i in range(5)]
+        future = make_post('future', timezone.now() + timedelta(hours=1))
+        draft = make_post('draft', timezone.now() - timedelta(hours=1), status=False)
+        # Saved while still scheduled
+        Post.objects.filter(pk__in=[post.pk for post in due]).update(is_live=False)
+
+        assert publish_due_posts(batch_size=2) == 5
+        assert Post.objects.filter(is_live=True).count() == 5
+        future.refresh_from_db()
+        draft.refresh_from_db()
+        assert not future.is_live
+        assert not draft.is_live
+        assert publish_due_posts() == 0
+
+    def test_publishing_invalidates_cached_lists(self, api_client, make_post):
+        post = make_post('scheduled', timezone.now() + timedelta(hours=1))
+        url = reverse('blog:api-v2:post-list')
+        assert api_client.get(url).data['results'][0]['is_live'] is False
+        Post.objects.filter(pk=post.pk).update(published_date=timezone.now())
+
+        assert publish_due_posts() == 1
+        response = api_client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.data['results'][0]['is_live'] is True
+
+    def test_bulk_endpoint_sets_live_state(self, api_client, profile):
+        api_client.force_authenticate(user=profile.user)
+        payload = [
+            {'title': title, 'content': 'c', 'status': True, 'published_date': date}
+            for title, date in (
+                ('now', timezone.now().isoformat()),
+                ('later', (timezone.now() + timedelta(days=1)).isoformat()),
+            )
+        ]
+        response = api_client.post(
+            reverse('blog:api-v2:post-bulk'), payload, format='json'
+        )
+        assert response.status_code == 200
+        assert dict(Post.objects.values_list('title', 'is_live')) == {
+            'now': True, 'later': False
+        }
@@ -5,6 +5,7 @@ app_name = "blog"
 
 urlpatterns = [
     path("post/", views.BlogListView.as_view(), name="blog-list"),
+    path("async/post/", views.AsyncBlogListView.as_view(), name="blog-list-async"),
     path("post/<int:pk>/", views.BlogDetailView.as_view(), name="blog-detail"),
     path("post/create/", views.BlogCreateView.as_view(), name="blog-create"),
     path("post/<int:pk>/edit/", views.BlogEditView.as_view(), name="blog-edit"),
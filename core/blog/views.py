@@ -7,27 +7,35 @@ from django.views.generic import (
 )
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse
-from django.shortcuts import get_object_or_404
+from django.http import Http404
+from django.core.paginator import InvalidPage
+from asgiref.sync import sync_to_async
 
 from comment.forms import CommentForm
-from .models import Post, Category
+from .models import Post
+from .paginators import PostCountPaginator
+from . import cache as list_cache
+from .categories import registry as category_registry
 from .forms import PostForm
-from accounts.models import Profile
 
 
 class BlogListView(ListView):
     """
-    Displays the list of blog posts with True status
+    Displays the list of live blog posts: published, with a past published_date
     """
     model = Post
     paginate_by = 2
+    # Cached page count; EstimatedPostCountPaginator suits very large tables
+    paginator_class = PostCountPaginator
     ordering = "-created_date"
 
     def get_queryset(self):
-        queryset = super().get_queryset().filter(status=True)
+        queryset = super().get_queryset().filter(is_live=True)
         category_name = self.request.GET.get('category')
         if category_name:
-            self.category = get_object_or_404(Category, name=category_name)
+            self.category = category_registry.get_by_name(category_name)
+            if self.category is None:
+                raise Http404("No Category matches the given query.")
             queryset = queryset.filter(category=self.category)
         else:
             self.category = None
@@ -35,11 +43,47 @@ class BlogListView(ListView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['categories'] = Category.objects.all()
+        context['categories'] = category_registry.all()
         context['current_category'] = self.category
         return context
 
 
+class AsyncBlogListView(BlogListView):
+    """
+    BlogListView for ASGI deployments. The page count and the posts are
+    awaited with the async ORM; category registry lookups run in a thread.
+    """
+    # Can't be derived from the fetched page, which is a list
+    template_name = "blog/post_list.html"
+
+    async def get(self, request, *args, **kwargs):
+        queryset = await sync_to_async(self.get_queryset)()
+        # The template shows author names
+        paginator = self.get_paginator(
+            queryset.select_related("author"), self.paginate_by
+        )
+        await paginator.acount()
+        page_number = request.GET.get(self.page_kwarg) or 1
+        if page_number == "last":
+            page_number = paginator.num_pages
+        try:
+            page = await paginator.apage(page_number)
+        except InvalidPage as exc:
+            raise Http404(f"Invalid page ({page_number}): {exc}")
+        self.object_list = page.object_list
+        context = {
+            "paginator": paginator,
+            "page_obj": page,
+            "is_paginated": page.has_other_pages(),
+            "object_list": page.object_list,
+            "post_list": page.object_list,
+            "categories": await sync_to_async(category_registry.all)(),
+            "current_category": self.category,
+            "view": self,
+        }
+        return self.render_to_response(context)
+
+
 class BlogDetailView(LoginRequiredMixin, DetailView):
     """
     Displays the detail page of a blog post.
@@ -47,13 +91,33 @@ class BlogDetailView(LoginRequiredMixin, DetailView):
     """
     model = Post
     context_object_name = 'post'
+    # The comment thread fragment also shows author names, which change
+    # without bumping the thread version; bound how long they can lag
+    comment_cache_timeout = 60 * 60
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("author__user", "category")
 
     def get_context_data(self, **kwargs):
         """
-        Injects the comment form into the template contenxt.
+        Injects the comment form and the comment thread into the template
+        context. The thread is cached as a fragment keyed on the post and
+        its comment version; the comments queryset is lazy, so authors and
+        profiles are only fetched when the fragment has to be rendered.
         """
         context = super().get_context_data(**kwargs)
+        post = self.object
         context['comment_form'] = CommentForm
+        context['comment_version'] = list_cache.get_version(
+            list_cache.COMMENT_THREAD, post.pk
+        )
+        context['comment_cache_timeout'] = self.comment_cache_timeout
+        context['comments'] = post.comments.select_related('author__profile')
+        # Per-user delete links are rendered outside the shared fragment
+        deletable = post.comments.all()
+        if not self.request.user.is_superuser:
+            deletable = deletable.filter(author=self.request.user)
+        context['deletable_comments'] = deletable.only('id', 'post_id', 'created_date')
         return context
 
 
@@ -70,7 +134,7 @@ class BlogCreateView(LoginRequiredMixin, CreateView):
         """
         Add user instance of post automatically from request data.
         """
-        form.instance.author = Profile.objects.get(user=self.request.user)
+        form.instance.author = self.request.profile
         return super().form_valid(form)
 
 
@@ -84,8 +148,8 @@ class BlogEditView(LoginRequiredMixin, UpdateView):
     form_class = PostForm
 
     def get_queryset(self):
-        author = Profile.objects.get(user=self.request.user)
-        return super().get_queryset().filter(author=author)
+        # Joined ownership check, no separate profile query
+        return super().get_queryset().filter(author__user_id=self.request.user.pk)
     
     def get_success_url(self):
         return reverse("blog:blog-detail", kwargs={"pk": self.object.id})
@@ -100,5 +164,5 @@ class BlogDeleteView(LoginRequiredMixin, DeleteView):
     success_url = "/blog/post/"
 
     def get_queryset(self):
-        author = Profile.objects.get(user=self.request.user)
-        return super().get_queryset().filter(author=author)
+        # Joined ownership check, no separate profile query
+        return super().get_queryset().filter(author__user_id=self.request.user.pk)
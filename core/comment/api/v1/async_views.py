@@ -0,0 +1,97 @@
+from django.http import StreamingHttpResponse
+
+import asyncio
+
+from blog.api.v2.async_views import AsyncReadView
+from blog.models import Post
+from . import fast
+from .paginations import AsyncDefaultPagination
+from ... import events
+from ...models import Comment
+
+
+class CommentListView(AsyncReadView):
+    """
+    Async comment list of a post for ASGI deployments, with the output
+    of CommentCreateAPIView's list. Buffered comments still pending are
+    only shown by the sync endpoint.
+    """
+    pagination_class = AsyncDefaultPagination
+
+    async def get(self, request, post_id):
+        rows = fast.comment_rows(Comment.objects.filter(post_id=post_id))
+        return await self.paginated_response(request, rows, fast.build_comments)
+
+
+class CommentStreamView(AsyncReadView):
+    """
+    Server-Sent Events stream of the new comments of a post, for ASGI
+    deployments. Events carry their Redis stream id, so a reconnecting
+    EventSource resumes after the last one it saw (Last-Event-ID).
+    Idle connections get a comment line every ``heartbeat_interval``
+    seconds and are ended after ``max_age``, as Django 4.2 does not
+    notice clients that went away; browsers reconnect on their own.
+    """
+    heartbeat_interval = 15
+    max_age = 60 * 5
+    # Milliseconds clients wait before reconnecting
+    retry = 3000
+
+    async def get(self, request, post_id):
+        if not await Post.objects.filter(pk=post_id).aexists():
+            return self.render({"detail": "Not found."}, status=404)
+        last_event_id = request.headers.get("Last-Event-ID")
+        if events.parse_event_id(last_event_id) is None:
+            last_event_id = None
+        response = StreamingHttpResponse(
+            self.stream(post_id, last_event_id), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # Tell nginx not to buffer the stream
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, post_id, last_event_id):
+        dispatcher = events.dispatcher
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_age
+        queue = dispatcher.subscribe(post_id)
+        try:
+            client = dispatcher.client
+            if last_event_id is None:
+                last_event_id = await events.latest_event_id(client, post_id)
+            try:
+                await asyncio.wait_for(dispatcher.wait_ready(), self.heartbeat_interval)
+            except asyncio.TimeoutError:
+                return
+            yield f"retry: {self.retry}\n\n"
+            # Subscribed first, so nothing falls between replay and live events
+            last = events.parse_event_id(last_event_id)
+            for event_id, data in await events.replay(client, post_id, last_event_id):
+                last = events.parse_event_id(event_id)
+                yield self.format_event(event_id, data)
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return
+                try:
+                    item = await asyncio.wait_for(
+                        queue.get(), min(self.heartbeat_interval, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if item is None:
+                    return
+                event_id, data = item
+                position = events.parse_event_id(event_id)
+                if position <= last:
+                    continue
+                last = position
+                yield self.format_event(event_id, data)
+        finally:
+            dispatcher.unsubscribe(post_id, queue)
+
+    @staticmethod
+    def format_event(event_id, data):
+        return f"id: {event_id}\nevent: comment\ndata: {data}\n\n"
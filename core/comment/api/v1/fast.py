@@ -0,0 +1,43 @@
+"""
+Plain-dict builder of the comment list, for the async comment endpoint.
+
+Rows are read with .values() and turned into the list output of
+CommentSerializers without instantiating the serializer.
+"""
+from rest_framework import serializers
+
+# Foreign keys are read as ids under the serializer field names
+COMMENT_LIST_FIELDS = (
+    "id",
+    "post",
+    "parent",
+    "depth",
+    "author",
+    "body",
+    "created_date",
+)
+
+_datetime_field = serializers.DateTimeField()
+
+
+def comment_rows(queryset):
+    return queryset.values(*COMMENT_LIST_FIELDS)
+
+
+def build_comments(rows, request):
+    # build_absolute_uri(pk) resolves the id against the list path
+    prefix = request.build_absolute_uri(".")
+    to_datetime = _datetime_field.to_representation
+    return [
+        {
+            "id": row["id"],
+            "post": row["post"],
+            "parent": row["parent"],
+            "depth": row["depth"],
+            "author": row["author"],
+            "body": row["body"],
+            "absolute_url": f"{prefix}{row['id']}",
+            "created_date": to_datetime(row["created_date"]),
+        }
+        for row in rows
+    ]
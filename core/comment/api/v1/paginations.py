@@ -1,7 +1,47 @@
+from functools import partial
 from rest_framework import pagination
+from blog.paginators import CommentCountPaginator
+from core.pagination import AsyncPaginationMixin, KeysetPagination
 
 
 class DefaultPagination(pagination.PageNumberPagination):
     page_size = 3
     page_size_query_param = "page_size"
     max_page_size = 3
+    # Page counts are cached per post
+    django_paginator_class = CommentCountPaginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.use_post_version(view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def use_post_version(self, view):
+        """
+        Key the cached count on the version of the view's post, which
+        comment writes on that post bump.
+        """
+        post_id = getattr(view, "kwargs", {}).get("post_id")
+        if post_id is not None:
+            self.django_paginator_class = partial(
+                CommentCountPaginator, version_part=post_id
+            )
+
+
+class ThreadPagination(pagination.CursorPagination):
+    # Depth-first thread order; paths are unique, so they make stable cursors
+    ordering = "path"
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class CommentKeysetPagination(KeysetPagination):
+    # Oldest comments first, matching Comment.Meta.ordering
+    ordering = ("created_date", "id")
+
+
+class AsyncDefaultPagination(AsyncPaginationMixin, DefaultPagination):
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.use_post_version(view)
+        return await super().apaginate_queryset(queryset, request, view)
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from ... import models
 from ...models import Comment
 from accounts.models import User
 
@@ -16,6 +17,8 @@ class CommentSerializers(serializers.ModelSerializer):
         fields = [
             "id",
             "post",
+            "parent",
+            "depth",
             "author",
             "body",
             "absolute_url",
@@ -23,6 +26,20 @@ class CommentSerializers(serializers.ModelSerializer):
         ]
         read_only_fields = ["author", "post"]
 
+    def validate_parent(self, parent):
+        """
+        Replies must stay on the post of the comment they answer and
+        within the maximum thread depth.
+        """
+        post_id = self.context["view"].kwargs.get("post_id")
+        if parent is not None and parent.post_id != post_id:
+            raise serializers.ValidationError("Parent comment belongs to another post.")
+        if parent is not None and parent.depth >= models.COMMENT_MAX_DEPTH:
+            raise serializers.ValidationError(
+                "Replies are limited to {} levels.".format(models.COMMENT_MAX_DEPTH)
+            )
+        return parent
+
     def get_absolute_url(self, obj):
         """
         Builds an absolute URL for the post detail endpoints.
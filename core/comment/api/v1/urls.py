@@ -1,9 +1,13 @@
 from django.urls import path, include
-from . import views
+from . import views, async_views
 
 app_name = "api-v1"
 
 urlpatterns = [
     path("post/<int:post_id>/comments/", views.CommentCreateAPIView.as_view(), name="post-comments"),
+    path("post/<int:post_id>/comments/stream/", async_views.CommentStreamView.as_view(), name="post-comments-stream"),
+    path("post/<int:post_id>/thread/", views.CommentThreadAPIView.as_view(), name="post-thread"),
+    path("comment/<int:comment_id>/replies/", views.CommentThreadAPIView.as_view(), name="comment-replies"),
     path("delete/<int:pk>/", views.CommentDeleteAPIView.as_view(), name="api-delete"),
+    path("async/post/<int:post_id>/comments/", async_views.CommentListView.as_view(), name="async-post-comments"),
 ]
@@ -1,22 +1,36 @@
-from rest_framework.generics import ListCreateAPIView, DestroyAPIView
+from rest_framework.generics import ListAPIView, ListCreateAPIView, DestroyAPIView
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+from rest_framework import status
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 
 from .permissions import IsOwner
-from .paginations import DefaultPagination
+from .paginations import DefaultPagination, CommentKeysetPagination, ThreadPagination
 from .serializers import CommentSerializers
+from ... import buffer
 from ...models import Comment
 from blog.models import Post
+from core.pagination import KeysetPaginationMixin
+from blog.api.v2.mixins import ConditionalGetMixin
 
 
-class CommentCreateAPIView(ListCreateAPIView):
+class CommentCreateAPIView(
+    ConditionalGetMixin, KeysetPaginationMixin, ListCreateAPIView
+):
     """
     List and Create comments for a specific post.
     Read access in public; creation requires authentication.
+    With settings.COMMENT_BUFFERED_WRITES new comments are buffered and
+    answered with 202; their author sees them under 'pending' until
+    they are written.
     """
     permission_classes = [IsAuthenticatedOrReadOnly]
     serializer_class = CommentSerializers
     pagination_class = DefaultPagination
+    # Opt-in keyset pagination with ?pagination=cursor
+    keyset_pagination_class = CommentKeysetPagination
 
     def get_queryset(self):
         """
@@ -24,7 +38,43 @@ class CommentCreateAPIView(ListCreateAPIView):
         """
         post_id = self.kwargs.get('post_id')
         return Comment.objects.filter(post_id=post_id)
-    
+
+    def get_pending_comments(self):
+        user = self.request.user
+        if not settings.COMMENT_BUFFERED_WRITES or not user.is_authenticated:
+            return []
+        return buffer.pending(self.kwargs.get('post_id'), user.id)
+
+    def get_list_fingerprint(self, queryset):
+        # Pending comments change the author's response, not the queryset
+        fingerprint = super().get_list_fingerprint(queryset)
+        fingerprint['pending'] = [item['token'] for item in self.pending_comments]
+        return fingerprint
+
+    def list(self, request, *args, **kwargs):
+        self.pending_comments = self.get_pending_comments()
+        response = super().list(request, *args, **kwargs)
+        pending = self.pending_comments
+        if pending and response.status_code == status.HTTP_200_OK:
+            response.data['pending'] = pending
+        return response
+
+    def create(self, request, *args, **kwargs):
+        if not settings.COMMENT_BUFFERED_WRITES:
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        post_id = self.kwargs.get('post_id')
+        get_object_or_404(Post.objects.only('pk'), pk=post_id)
+        parent = serializer.validated_data.get('parent')
+        item = buffer.enqueue(
+            post_id,
+            request.user.id,
+            serializer.validated_data['body'],
+            parent_id=parent.pk if parent is not None else None,
+        )
+        return Response(item, status=status.HTTP_202_ACCEPTED)
+
     def perform_create(self, serializer):
         """
         Automatically associate the authenticated user and the target post 
@@ -33,6 +83,51 @@ class CommentCreateAPIView(ListCreateAPIView):
         post = get_object_or_404(Post, pk=self.kwargs.get('post_id'))
         serializer.save(author=self.request.user, post=post)
     
+
+class CommentThreadAPIView(ListAPIView):
+    """
+    List a comment thread in depth-first order: every comment of a post,
+    or the replies below one comment. Each page is a single range query
+    on the materialized path, whatever the depth of the thread.
+    ``?max_depth=N`` limits how many levels are returned.
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    serializer_class = CommentSerializers
+    pagination_class = ThreadPagination
+    max_depth_query_param = 'max_depth'
+
+    def get_max_depth(self):
+        value = self.request.query_params.get(self.max_depth_query_param)
+        if value is None:
+            return None
+        try:
+            max_depth = int(value)
+        except ValueError:
+            max_depth = -1
+        if max_depth < 0:
+            raise ValidationError(
+                {self.max_depth_query_param: 'Expected a non-negative integer.'}
+            )
+        return max_depth
+
+    def get_queryset(self):
+        """
+        Return the subtree of the comment in the URL, or the thread of the post.
+        """
+        max_depth = self.get_max_depth()
+        comment_id = self.kwargs.get('comment_id')
+        if comment_id is not None:
+            root = get_object_or_404(Comment, pk=comment_id)
+            # Levels are counted from the first replies
+            if max_depth is not None:
+                max_depth += 1
+            return root.get_descendants(max_depth=max_depth)
+        queryset = Comment.objects.filter(post_id=self.kwargs.get('post_id'))
+        if max_depth is not None:
+            queryset = queryset.filter(depth__lte=max_depth)
+        return queryset.order_by('path')
+
+
 class CommentDeleteAPIView(DestroyAPIView):
     # limited to the post owner
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwner]
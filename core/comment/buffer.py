@@ -0,0 +1,195 @@
+"""
+Write-behind buffer for comment creation (settings.COMMENT_BUFFERED_WRITES).
+
+Validated comments are pushed to a Redis list and acknowledged right away;
+the flush_comment_buffer task pops them in batches and writes each batch
+with one bulk_create instead of one insert, and one write lock, per
+comment. Until its comment is flushed, the author sees it through a
+short-lived per-post pending hash, so they can read their own writes.
+
+Flushed comments are dated at flush time, which is at most a few
+seconds after they were accepted.
+
+A flush moves its batch to a processing list and removes it only once
+the batch is committed, so a worker dying mid-flush loses nothing: the
+next flush writes the leftovers first. Delivery is at least once, a
+crash between commit and cleanup writes that batch twice. Comments
+that fail even when written one by one go to a dead-letter list
+instead of blocking the buffer.
+"""
+from collections import Counter
+from functools import partial
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+import json
+import logging
+import uuid
+
+from blog.cache import bump_comment_lists, bump_comment_thread
+from blog.models import Post
+from . import events
+from .models import Comment, User
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "comment:buffer"
+PROCESSING_KEY = "comment:buffer:processing"
+DEAD_LETTER_KEY = "comment:buffer:dead"
+# Only one flush runs at a time, so processing leftovers are from a crash
+LOCK_KEY = "comment:buffer:lock"
+LOCK_TIMEOUT = 60
+FLUSH_BATCH_SIZE = 500
+# Pending comments stay visible to their author at most this long
+PENDING_TIMEOUT = 60 * 5
+
+
+def pending_key(post_id, author_id):
+    return f"comment:pending:{post_id}:{author_id}"
+
+
+def enqueue(post_id, author_id, body, parent_id=None):
+    """
+    Buffer a validated comment and return its pending representation.
+    A full batch schedules a flush without waiting for the beat interval.
+    """
+    item = {
+        "token": uuid.uuid4().hex,
+        "post": post_id,
+        "parent": parent_id,
+        "author": author_id,
+        "body": body,
+        "queued_date": timezone.now().isoformat(),
+    }
+    payload = json.dumps(item)
+    client = get_redis_connection("default")
+    key = pending_key(post_id, author_id)
+    with client.pipeline() as pipe:
+        pipe.rpush(QUEUE_KEY, payload)
+        pipe.hset(key, item["token"], payload)
+        pipe.expire(key, PENDING_TIMEOUT)
+        length = pipe.execute()[0]
+    if length == FLUSH_BATCH_SIZE:
+        from .tasks import flush_comment_buffer
+
+        flush_comment_buffer.delay()
+    return item
+
+
+def pending(post_id, author_id):
+    """
+    Comments of an author on a post that are accepted but not written yet,
+    oldest first.
+    """
+    client = get_redis_connection("default")
+    values = client.hvals(pending_key(post_id, author_id))
+    items = [json.loads(value) for value in values]
+    return sorted(items, key=lambda item: item["queued_date"])
+
+
+def flush(batch_size=FLUSH_BATCH_SIZE):
+    """
+    Write one batch of buffered comments. Returns the number of comments
+    taken from the buffer, 0 once it is empty or while another flush
+    holds the lock.
+    """
+    client = get_redis_connection("default")
+    lock = client.lock(LOCK_KEY, timeout=LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return 0
+    try:
+        # Leftovers of a flush that died before cleaning up come first
+        raw = client.lrange(PROCESSING_KEY, 0, -1)
+        if not raw:
+            with client.pipeline() as pipe:
+                for _ in range(batch_size):
+                    pipe.lmove(QUEUE_KEY, PROCESSING_KEY, "LEFT", "RIGHT")
+                raw = [value for value in pipe.execute() if value is not None]
+        if not raw:
+            return 0
+        items = [json.loads(value) for value in raw]
+        try:
+            write(items)
+        except Exception:
+            logger.exception("Failed to write a comment batch, writing one by one")
+            write_each(client, raw, items)
+        with client.pipeline() as pipe:
+            pipe.delete(PROCESSING_KEY)
+            for item in items:
+                pipe.hdel(pending_key(item["post"], item["author"]), item["token"])
+            pipe.execute()
+        return len(items)
+    finally:
+        if lock.owned():
+            lock.release()
+
+
+def write_each(client, raw, items):
+    """
+    Write comments one by one, moving those that still fail to the
+    dead-letter list.
+    """
+    dead = []
+    for value, item in zip(raw, items):
+        try:
+            write([item])
+        except Exception:
+            logger.exception("Moved buffered comment %s to dead letters", item["token"])
+            dead.append(value)
+    if dead:
+        client.rpush(DEAD_LETTER_KEY, *dead)
+
+
+def write(items):
+    """
+    Insert buffered comments with bulk queries, doing the work the model
+    save and signals do for a single comment: thread placement, post
+    comment counts, cache invalidation and live events. Comments whose
+    post, parent or author was deleted in the meantime are dropped.
+    """
+    post_ids = set(
+        Post.objects.filter(pk__in={item["post"] for item in items}).values_list(
+            "pk", flat=True
+        )
+    )
+    author_ids = set(
+        User.objects.filter(pk__in={item["author"] for item in items}).values_list(
+            "pk", flat=True
+        )
+    )
+    parents = Comment.objects.in_bulk(
+        {item["parent"] for item in items if item["parent"] is not None}
+    )
+    comments = []
+    for item in items:
+        parent = parents.get(item["parent"])
+        if item["post"] not in post_ids or item["author"] not in author_ids:
+            continue
+        if item["parent"] and parent is None:
+            continue
+        comment = Comment(
+            post_id=item["post"], author_id=item["author"], body=item["body"]
+        )
+        comment.place_under(parent)
+        comments.append(comment)
+    if not comments:
+        return 0
+
+    counts = Counter(comment.post_id for comment in comments)
+    with transaction.atomic():
+        Comment.objects.bulk_create(comments)
+        for comment in comments:
+            comment.path = comment.build_path()
+        Comment.objects.bulk_update(comments, ["path"])
+        for post_id, count in counts.items():
+            Post.objects.filter(pk=post_id).update(
+                comment_count=F("comment_count") + count
+            )
+        # A failed publish must not put the written batch back
+        transaction.on_commit(partial(events.publish, comments), robust=True)
+    for post_id in counts:
+        bump_comment_lists(post_id)
+        bump_comment_thread(post_id)
+    return len(comments)
@@ -0,0 +1,220 @@
+"""
+Live comment events for the Server-Sent Events stream of a post.
+
+Every new comment is appended to a bounded Redis stream of its post,
+which Last-Event-ID resumes replay from, and announced on one pub/sub
+channel. Each ASGI process holds a single subscription to that channel
+(``dispatcher``) and fans events out to in-memory queues, so an idle
+subscriber costs a queue and a suspended coroutine, not a connection.
+"""
+from collections import defaultdict
+from django.conf import settings
+from django_redis import get_redis_connection
+from rest_framework import serializers
+
+import asyncio
+import json
+import logging
+import re
+
+import redis.asyncio
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "comment:events"
+# Events kept per post for Last-Event-ID resume, trimmed approximately
+STREAM_MAXLEN = 1000
+# Streams of posts nobody comments on any more expire
+STREAM_TIMEOUT = 60 * 60 * 24
+EVENT_ID_PATTERN = re.compile(r"^\d+-\d+$")
+
+_datetime_field = serializers.DateTimeField()
+
+
+def stream_key(post_id):
+    return f"comment:events:{post_id}"
+
+
+def parse_event_id(value):
+    """
+    Stream ids as sortable (milliseconds, sequence) pairs, None if invalid.
+    """
+    if not value or not EVENT_ID_PATTERN.match(value):
+        return None
+    milliseconds, sequence = value.split("-")
+    return int(milliseconds), int(sequence)
+
+
+def comment_event(comment):
+    """
+    Event payload of a comment, the comment list item without absolute_url.
+    """
+    return {
+        "id": comment.pk,
+        "post": comment.post_id,
+        "parent": comment.parent_id,
+        "depth": comment.depth,
+        "author": comment.author_id,
+        "body": comment.body,
+        "created_date": _datetime_field.to_representation(comment.created_date),
+    }
+
+
+def publish(comments):
+    """
+    Append events of new comments to their post streams and announce them.
+    Meant to run once the comments are committed.
+    """
+    comments = list(comments)
+    if not comments:
+        return
+    client = get_redis_connection("default")
+    payloads = [json.dumps(comment_event(comment)) for comment in comments]
+    with client.pipeline(transaction=False) as pipe:
+        for comment, data in zip(comments, payloads):
+            key = stream_key(comment.post_id)
+            pipe.xadd(key, {"data": data}, maxlen=STREAM_MAXLEN, approximate=True)
+            pipe.expire(key, STREAM_TIMEOUT)
+        event_ids = pipe.execute()[::2]
+    with client.pipeline(transaction=False) as pipe:
+        for comment, data, event_id in zip(comments, payloads, event_ids):
+            message = {
+                "post": comment.post_id,
+                "id": event_id.decode(),
+                "data": data,
+            }
+            pipe.publish(CHANNEL, json.dumps(message))
+        pipe.execute()
+
+
+def get_async_redis():
+    """
+    Async client on the Redis server of the default cache.
+    """
+    return redis.asyncio.Redis.from_url(settings.CACHES["default"]["LOCATION"])
+
+
+async def latest_event_id(client, post_id):
+    entries = await client.xrevrange(stream_key(post_id), count=1)
+    return entries[0][0].decode() if entries else "0-0"
+
+
+async def replay(client, post_id, after):
+    """
+    Events of a post stored after the ``after`` event id, oldest first.
+    Only the last STREAM_MAXLEN events can be replayed.
+    """
+    entries = await client.xrange(stream_key(post_id), min=f"({after}", max="+")
+    return [
+        (event_id.decode(), fields[b"data"].decode()) for event_id, fields in entries
+    ]
+
+
+class CommentEventDispatcher:
+    """
+    Routes the events of the pub/sub channel to the subscribers of their
+    post in this process. Subscribers that fall ``queue_size`` events
+    behind are closed; clients reconnect and resume with Last-Event-ID.
+    """
+    queue_size = 100
+    # Seconds between attempts to resubscribe after losing Redis
+    retry_interval = 1
+
+    def __init__(self):
+        self.loop = None
+        self.client = None
+        self.listener = None
+        self.ready = None
+        self.subscribers = defaultdict(set)
+
+    def subscribe(self, post_id):
+        """
+        Return a queue of ``(event id, data)`` pairs of the post's new
+        comments. A None item means the subscription was closed.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:
+            # Tasks and queues are bound to the loop that created them
+            self.loop = loop
+            # Pooled client for stream replays, shared by all subscribers
+            self.client = get_async_redis()
+            self.listener = None
+            self.ready = asyncio.Event()
+            self.subscribers = defaultdict(set)
+        queue = asyncio.Queue(self.queue_size)
+        self.subscribers[post_id].add(queue)
+        if self.listener is None or self.listener.done():
+            self.listener = loop.create_task(self.listen())
+        return queue
+
+    def unsubscribe(self, post_id, queue):
+        queues = self.subscribers.get(post_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[post_id]
+
+    async def wait_ready(self):
+        """
+        Wait until the channel subscription is active.
+        """
+        await self.ready.wait()
+
+    async def listen(self):
+        while True:
+            client = get_async_redis()
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(CHANNEL)
+                self.ready.set()
+                async for message in pubsub.listen():
+                    self.dispatch(message["data"])
+            except (redis.ConnectionError, OSError):
+                logger.warning("Lost the comment event subscription", exc_info=True)
+                # Events published meanwhile are only in the streams
+                self.ready.clear()
+                self.close_all()
+            finally:
+                await pubsub.aclose()
+                await client.aclose()
+            await asyncio.sleep(self.retry_interval)
+
+    def dispatch(self, raw):
+        message = json.loads(raw)
+        for queue in list(self.subscribers.get(message["post"], ())):
+            try:
+                queue.put_nowait((message["id"], message["data"]))
+            except asyncio.QueueFull:
+                self.unsubscribe(message["post"], queue)
+                self.close(queue)
+
+    def close(self, queue):
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    def close_all(self):
+        for queues in self.subscribers.values():
+            for queue in queues:
+                self.close(queue)
+        self.subscribers.clear()
+
+    async def stop(self):
+        """
+        Close every subscriber and the channel subscription.
+        """
+        self.close_all()
+        if self.listener is not None:
+            self.listener.cancel()
+            try:
+                await self.listener
+            except asyncio.CancelledError:
+                pass
+            self.listener = None
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        self.loop = None
+
+
+dispatcher = CommentEventDispatcher()
@@ -0,0 +1,112 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from base64 import b64encode
+from urllib import parse
+
+import statistics
+import time
+
+from accounts.models import User, Profile
+from blog.models import Post
+from ...api.v1.paginations import ThreadPagination
+from ...models import Comment
+
+
+class Command(BaseCommand):
+    """
+    Time subtree reads on a thread of replies nested --size levels deep
+    (capped at COMMENT_MAX_DEPTH, deeper replies continue as siblings)
+    and on one comment with --size direct replies. Rows are created
+    inside a transaction that is rolled back at the end.
+    """
+    help = 'benchmark materialized-path comment thread queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        size, repeat = options['size'], options['repeat']
+        with transaction.atomic():
+            user = User.objects.create_user(
+                email='benchmark@benchmark.com', password='Zz@12345'
+            )
+            post = Post.objects.create(
+                author=Profile.objects.get(user=user),
+                title='benchmark',
+                content='benchmark',
+                status=True,
+                published_date=timezone.now(),
+            )
+            client = APIClient()
+            for shape in ('deep', 'wide'):
+                root = self.build_thread(post, user, size, deep=shape == 'deep')
+                url = reverse(
+                    'comment:api-v1:comment-replies', kwargs={'comment_id': root.id}
+                )
+                timings = {
+                    'whole subtree': lambda: list(root.get_descendants()),
+                    'two levels': lambda: list(root.get_descendants(max_depth=1)),
+                    'api first page': lambda: client.get(url),
+                    'api last page': lambda: client.get(
+                        url, {'cursor': self.last_page_cursor(root)}
+                    ),
+                }
+                with CaptureQueriesContext(connection) as queries:
+                    rows = len(root.get_descendants())
+                self.stdout.write(
+                    self.style.MIGRATE_HEADING(
+                        f'{shape}: {rows} replies, depth '
+                        f'{root.get_descendants().last().depth}, '
+                        f'{len(queries)} query per subtree'
+                    )
+                )
+                for label, func in timings.items():
+                    self.stdout.write(
+                        f'{label:>15}: {self.measure(func, repeat):8.2f} ms'
+                    )
+            transaction.set_rollback(True)
+
+    def build_thread(self, post, user, size, deep):
+        """
+        Insert ``size`` replies below a new root with bulk queries,
+        placing them the way Comment.save would.
+        """
+        root = Comment.objects.create(post=post, author=user, body='root')
+        replies = Comment.objects.bulk_create(
+            (Comment(post=post, author=user, body=f'reply {i}') for i in range(size)),
+            batch_size=2000,
+        )
+        parent = root
+        for reply in replies:
+            reply.place_under(parent)
+            reply.path = reply.build_path()
+            if deep:
+                parent = reply
+        Comment.objects.bulk_update(
+            replies, ['parent', 'depth', 'path'], batch_size=2000
+        )
+        return root
+
+    def last_page_cursor(self, root):
+        """
+        Cursor a client would hold on the last page of the replies.
+        """
+        page_size = ThreadPagination.page_size
+        position = root.get_descendants().reverse().values_list(
+            'path', flat=True
+        )[page_size]
+        querystring = parse.urlencode({'p': position})
+        return b64encode(querystring.encode('ascii')).decode('ascii')
+
+    def measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Post
+from ...models import Comment
+
+
+class Command(BaseCommand):
+    """
+    Repair drift between Post.comment_count and the real number of
+    comments, walking the post table in primary key batches.
+    """
+    help = 'reconcile denormalized post comment counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        counts = (
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        last_id = 0
+        repaired = 0
+        while True:
+            ids = list(
+                Post.objects.filter(pk__gt=last_id)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                drifted = list(
+                    Post.objects.filter(pk__in=ids)
+                    .annotate(actual=Coalesce(Subquery(counts), 0))
+                    .exclude(comment_count=F('actual'))
+                    .select_for_update()
+                    .only('pk')
+                )
+                for post in drifted:
+                    post.comment_count = post.actual
+                Post.objects.bulk_update(drifted, ['comment_count'])
+                repaired += len(drifted)
+            last_id = ids[-1]
+        self.stdout.write(self.style.SUCCESS(f'{repaired} posts repaired'))
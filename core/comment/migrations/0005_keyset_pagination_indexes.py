@@ -0,0 +1,20 @@
+# Generated by Django 4.2.9 on 2026-10-18 20:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comment", "0004_remove_comment_subject"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["post", "created_date", "id"],
+                name="comment_post_created_id_idx",
+            ),
+        ),
+    ]
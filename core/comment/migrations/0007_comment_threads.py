@@ -0,0 +1,68 @@
+# Generated by Django 4.2.9 on 2026-10-18 20:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+PATH_SEGMENT_WIDTH = 7
+PATH_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def path_segment(pk):
+    digits = ""
+    while pk:
+        pk, remainder = divmod(pk, len(PATH_ALPHABET))
+        digits = PATH_ALPHABET[remainder] + digits
+    return digits.rjust(PATH_SEGMENT_WIDTH, "0")
+
+
+def backfill_paths(apps, schema_editor):
+    """
+    Existing comments are all top-level
+    """
+    Comment = apps.get_model("comment", "Comment")
+    batch = []
+    for comment in Comment.objects.only("pk").iterator(chunk_size=2000):
+        comment.path = path_segment(comment.pk)
+        batch.append(comment)
+        if len(batch) == 2000:
+            Comment.objects.bulk_update(batch, ["path"])
+            batch = []
+    Comment.objects.bulk_update(batch, ["path"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comment", "0006_backfill_post_comment_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="replies",
+                to="comment.comment",
+            ),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.CharField(
+                editable=False, max_length=2107, null=True, unique=True
+            ),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["post", "path"], name="comment_post_path_idx"),
+        ),
+    ]
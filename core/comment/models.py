@@ -1,10 +1,50 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import F, QuerySet
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from blog.models import Post
+from blog.cache import bump_comment_lists, bump_comment_thread
 from django.contrib.auth import get_user_model
+from functools import partial
+
+from . import events
 
 # getting user model object
 User = get_user_model()
 
+# Reply threads are stored as a materialized path: one fixed-width base36
+# segment of each ancestor's id, root first. Sorting by path gives the
+# depth-first thread order and a subtree is one contiguous path range.
+# This relies on digits sorting before lowercase letters, as they do in
+# the C and common locale collations.
+PATH_SEGMENT_WIDTH = 7
+PATH_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+# Replies below this depth attach to their parent's parent, keeping the
+# indexed path well under the PostgreSQL btree entry limit (~2700 bytes)
+COMMENT_MAX_DEPTH = 300
+
+
+def path_segment(pk):
+    digits = ""
+    while pk:
+        pk, remainder = divmod(pk, len(PATH_ALPHABET))
+        digits = PATH_ALPHABET[remainder] + digits
+    return digits.rjust(PATH_SEGMENT_WIDTH, "0")
+
+
+def path_upper_bound(path):
+    """
+    The smallest path sorting after every path that starts with ``path``,
+    or None when there is none.
+    """
+    digits = list(path)
+    for index in reversed(range(len(digits))):
+        position = PATH_ALPHABET.index(digits[index])
+        if position + 1 < len(PATH_ALPHABET):
+            digits[index] = PATH_ALPHABET[position + 1]
+            return "".join(digits[: index + 1])
+    return None
+
 
 class Comment(models.Model):
     """
@@ -13,15 +53,138 @@ class Comment(models.Model):
     """
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="comments")
     author = models.ForeignKey(User, on_delete=models.CASCADE)
+    # The comment this one replies to; None for top-level comments
+    parent = models.ForeignKey(
+        "self", on_delete=models.CASCADE, null=True, blank=True, related_name="replies"
+    )
+    # Materialized path, set right after the first insert once the id is known
+    path = models.CharField(
+        max_length=PATH_SEGMENT_WIDTH * (COMMENT_MAX_DEPTH + 1),
+        unique=True,
+        null=True,
+        editable=False,
+    )
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
     body = models.TextField()
     created_date = models.DateTimeField(auto_now_add=True)
     updated_date = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["created_date"]
+        indexes = [
+            # Seek index for keyset pagination of a post's comments
+            models.Index(
+                fields=["post", "created_date", "id"], name="comment_post_created_id_idx"
+            ),
+            # Whole thread of a post in depth-first order
+            models.Index(fields=["post", "path"], name="comment_post_path_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            self.place_under(self.parent)
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        # A comment must never be left without its path
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+            if self.path is None:
+                self.path = self.build_path()
+                type(self).objects.using(using).filter(pk=self.pk).update(
+                    path=self.path
+                )
+
+    def place_under(self, parent):
+        """
+        Attach a new comment below ``parent``, or at the top when None.
+        The API rejects replies to comments at COMMENT_MAX_DEPTH; internal
+        writers that get here anyway continue the thread next to the parent.
+        """
+        if parent is not None and parent.depth >= COMMENT_MAX_DEPTH:
+            # Too deep; continue the thread next to the parent
+            parent = parent.parent
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent is not None else 0
+
+    def build_path(self):
+        """
+        Path of a placed comment, once it has an id.
+        """
+        parent_path = self.parent.path if self.parent is not None else ""
+        return parent_path + path_segment(self.pk)
+
+    def get_descendants(self, max_depth=None):
+        """
+        Replies below this comment in thread order, as one path range query.
+        ``max_depth`` limits how many levels below this comment are returned.
+        """
+        queryset = type(self).objects.filter(path__gt=self.path)
+        upper = path_upper_bound(self.path)
+        if upper is not None:
+            queryset = queryset.filter(path__lt=upper)
+        if max_depth is not None:
+            queryset = queryset.filter(depth__lte=self.depth + max_depth)
+        return queryset.order_by("path")
 
     def __str__(self):
         """
         Show comment body and author name.
         """
         return "Comment {} by {}".format(self.body, self.name)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    """
+    Atomically count a new comment on its post and invalidate the cached
+    comment list counts of that post. Cached anonymous post lists are left to expire
+    on their own rather than being invalidated by every comment on a
+    busy post.
+    """
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F("comment_count") + 1
+        )
+        bump_comment_lists(instance.post_id)
+
+
+def is_post_deletion(origin):
+    """
+    Whether a comment is deleted in cascade from its post.
+    """
+    return isinstance(origin, Post) or (
+        isinstance(origin, QuerySet) and origin.model is Post
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, origin=None, **kwargs):
+    """
+    Atomically uncount a deleted comment from its post,
+    unless the post itself is being deleted.
+    """
+    if is_post_deletion(origin):
+        return
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F("comment_count") - 1
+    )
+    bump_comment_lists(instance.post_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_thread(sender, instance, origin=None, **kwargs):
+    """
+    Drop the cached comment thread of the post detail page
+    """
+    if is_post_deletion(origin):
+        return
+    bump_comment_thread(instance.post_id)
+
+
+@receiver(post_save, sender=Comment)
+def publish_comment_event(sender, instance, created, **kwargs):
+    """
+    Push a new comment to the live streams of its post once committed
+    """
+    if created:
+        transaction.on_commit(partial(events.publish, [instance]), robust=True)
@@ -0,0 +1,18 @@
+from celery import shared_task
+
+from . import buffer
+
+
+@shared_task(ignore_result=True)
+def flush_comment_buffer():
+    """
+    Drain the buffered comments in batches.
+    Runs from celery beat and whenever a full batch is buffered.
+    Returns the number of flushed comments.
+    """
+    total = 0
+    while True:
+        flushed = buffer.flush()
+        if not flushed:
+            return total
+        total += flushed
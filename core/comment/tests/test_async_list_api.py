@@ -0,0 +1,61 @@
+from rest_framework.test import APIClient
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Post
+from accounts.models import User, Profile
+from ..api.v1.async_views import CommentListView
+from ..models import Comment
+import json
+import pytest
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(email='test@test.com', password='zZ@12345')
+
+@pytest.fixture
+def post(user):
+    post = Post.objects.create(
+        author=Profile.objects.get(user=user),
+        title='test',
+        content='desc',
+        status=True,
+        published_date=timezone.now(),
+    )
+    parent = Comment.objects.create(post=post, author=user, body='first')
+    for body in ('second', 'third'):
+        Comment.objects.create(post=post, author=user, body=body, parent=parent)
+    Comment.objects.create(post=post, author=user, body='fourth')
+    return post
+
+
+def fetch(client, name, post_id, params):
+    url = reverse(f'comment:api-v1:{name}', kwargs={'post_id': post_id})
+    response = client.get(url, params)
+    return response.status_code, json.loads(
+        response.content.decode().replace('/async/', '/')
+    )
+
+
+@pytest.mark.django_db
+class TestAsyncCommentListAPI:
+
+    def test_view_is_async(self):
+        assert CommentListView.view_is_async
+
+    @pytest.mark.parametrize('params', [{}, {'page': 2}, {'page': 9}])
+    def test_matches_sync_view(self, api_client, post, params):
+        sync = fetch(api_client, 'post-comments', post.id, params)
+        asynchronous = fetch(api_client, 'async-post-comments', post.id, params)
+        assert asynchronous == sync
+
+    def test_queries(self, api_client, post, django_assert_num_queries):
+        url = reverse('comment:api-v1:async-post-comments', kwargs={'post_id': post.id})
+        # Count and page rows
+        with django_assert_num_queries(2):
+            response = api_client.get(url)
+        assert response.json()['count'] == 4
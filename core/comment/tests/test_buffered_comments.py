@@ -0,0 +1,160 @@
+from rest_framework.test import APIClient
+from django.urls import reverse
+from django.utils import timezone
+from django_redis import get_redis_connection
+from unittest import mock
+
+from blog.models import Post
+from accounts.models import User, Profile
+from .. import buffer
+from ..models import Comment
+from ..tasks import flush_comment_buffer
+import json
+import pytest
+
+@pytest.fixture(autouse=True)
+def buffered_writes(settings):
+    settings.COMMENT_BUFFERED_WRITES = True
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(email='test@test.com', password='zZ@12345')
+
+@pytest.fixture
+def post(user):
+    return Post.objects.create(
+        author=Profile.objects.get(user=user),
+        title='test',
+        content='desc',
+        status=True,
+        published_date=timezone.now(),
+    )
+
+@pytest.fixture
+def url(post):
+    return reverse('comment:api-v1:post-comments', kwargs={'post_id': post.id})
+
+
+@pytest.mark.django_db
+class TestBufferedComments:
+
+    def test_create_is_accepted_without_writing(
+        self, api_client, user, url, django_assert_num_queries
+    ):
+        api_client.force_authenticate(user=user)
+        # Post lookup only; nothing is inserted
+        with django_assert_num_queries(1):
+            response = api_client.post(url, {'body': 'hello'})
+        assert response.status_code == 202
+        assert response.data['body'] == 'hello'
+        assert Comment.objects.count() == 0
+
+    def test_author_reads_own_pending_comments(self, api_client, user, url):
+        api_client.force_authenticate(user=user)
+        api_client.post(url, {'body': 'hello'})
+        response = api_client.get(url)
+        assert [item['body'] for item in response.data['pending']] == ['hello']
+        etag = response['ETag']
+        api_client.post(url, {'body': 'again'})
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert len(response.data['pending']) == 2
+        # Other readers do not see them
+        api_client.force_authenticate(user=None)
+        assert 'pending' not in api_client.get(url).data
+
+    def test_flush_writes_in_batches(self, api_client, user, post, url):
+        api_client.force_authenticate(user=user)
+        for i in range(5):
+            api_client.post(url, {'body': f'comment {i}'})
+        with mock.patch.object(buffer, 'FLUSH_BATCH_SIZE', 2):
+            assert flush_comment_buffer() == 5
+        assert list(
+            Comment.objects.order_by('id').values_list('body', flat=True)
+        ) == [f'comment {i}' for i in range(5)]
+        post.refresh_from_db()
+        assert post.comment_count == 5
+        assert all(comment.path for comment in Comment.objects.all())
+        response = api_client.get(url)
+        assert 'pending' not in response.data
+        assert response.data['count'] == 5
+
+    def test_flush_places_replies(self, api_client, user, post, url):
+        parent = Comment.objects.create(post=post, author=user, body='parent')
+        api_client.force_authenticate(user=user)
+        api_client.post(url, {'body': 'reply', 'parent': parent.id})
+        flush_comment_buffer()
+        reply = Comment.objects.get(body='reply')
+        assert reply.parent == parent
+        assert reply.depth == 1
+        assert reply.path.startswith(parent.path)
+
+    def test_flush_drops_comments_of_deleted_posts(self, api_client, user, post, url):
+        api_client.force_authenticate(user=user)
+        api_client.post(url, {'body': 'orphan'})
+        post.delete()
+        assert flush_comment_buffer() == 1
+        assert Comment.objects.count() == 0
+
+    def test_flush_drops_comments_of_deleted_authors(
+        self, api_client, user, post, url
+    ):
+        other = User.objects.create_user(email='other@test.com', password='zZ@12345')
+        api_client.force_authenticate(user=other)
+        api_client.post(url, {'body': 'gone'})
+        api_client.force_authenticate(user=user)
+        api_client.post(url, {'body': 'kept'})
+        other.delete()
+        assert flush_comment_buffer() == 2
+        assert list(Comment.objects.values_list('body', flat=True)) == ['kept']
+
+    def test_failing_comment_goes_to_dead_letters(self, api_client, user, post, url):
+        api_client.force_authenticate(user=user)
+        for body in ['first', 'poison', 'last']:
+            api_client.post(url, {'body': body})
+        build_path = Comment.build_path
+
+        def failing_build_path(comment):
+            # Fails after the batch insert, inside the write transaction
+            if comment.body == 'poison':
+                raise RuntimeError('poison')
+            return build_path(comment)
+
+        with mock.patch.object(Comment, 'build_path', failing_build_path):
+            assert flush_comment_buffer() == 3
+        assert list(
+            Comment.objects.order_by('id').values_list('body', flat=True)
+        ) == ['first', 'last']
+        post.refresh_from_db()
+        assert post.comment_count == 2
+        client = get_redis_connection('default')
+        dead = client.lrange(buffer.DEAD_LETTER_KEY, 0, -1)
+        assert [json.loads(value)['body'] for value in dead] == ['poison']
+        assert client.llen(buffer.QUEUE_KEY) == client.llen(buffer.PROCESSING_KEY) == 0
+
+    def test_batch_of_crashed_flush_is_written(self, api_client, user, url):
+        api_client.force_authenticate(user=user)
+        api_client.post(url, {'body': 'first'})
+        api_client.post(url, {'body': 'second'})
+        # A worker died after taking the batch, before writing it
+        client = get_redis_connection('default')
+        for _ in range(2):
+            client.lmove(buffer.QUEUE_KEY, buffer.PROCESSING_KEY, 'LEFT', 'RIGHT')
+        assert flush_comment_buffer() == 2
+        assert list(
+            Comment.objects.order_by('id').values_list('body', flat=True)
+        ) == ['first', 'second']
+        assert client.llen(buffer.PROCESSING_KEY) == 0
+
+    def test_concurrent_flush_is_skipped(self, api_client, user, url):
+        api_client.force_authenticate(user=user)
+        api_client.post(url, {'body': 'first'})
+        lock = get_redis_connection('default').lock(buffer.LOCK_KEY)
+        lock.acquire()
+        assert buffer.flush() == 0
+        lock.release()
+        assert buffer.flush() == 1
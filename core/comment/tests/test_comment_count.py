@@ -0,0 +1,89 @@
+from rest_framework.test import APIClient
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Post
+from accounts.models import User, Profile
+from ..models import Comment
+import pytest
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+@pytest.fixture
+def user():
+    user = User.objects.create_user(
+        email='test@test.com',
+        password='zZ@12345'
+    )
+    return user
+
+@pytest.fixture
+def post(user):
+    profile = Profile.objects.get(user=user)
+    return Post.objects.create(
+        author=profile,
+        title='test',
+        content='desc',
+        status=True,
+        published_date=timezone.now()
+    )
+
+@pytest.fixture
+def comment(user, post):
+    return Comment.objects.create(
+        post=post,
+        author=user,
+        body='good post!'
+    )
+
+def comment_count(post):
+    post.refresh_from_db(fields=['comment_count'])
+    return post.comment_count
+
+@pytest.mark.django_db
+class TestCommentCount:
+
+    def test_api_create_and_delete_update_count(self, api_client, user, post):
+        api_client.force_authenticate(user=user)
+        url = reverse(
+            "comment:api-v1:post-comments", kwargs={'post_id': post.id}
+        )
+        response = api_client.post(url, {'body': 'first'})
+        assert comment_count(post) == 1
+        url = reverse(
+            "comment:api-v1:api-delete", kwargs={'pk': response.data['id']}
+        )
+        api_client.delete(url)
+        assert comment_count(post) == 0
+
+    def test_html_create_and_delete_update_count(self, user, post):
+        client = Client()
+        client.force_login(user)
+        client.post(reverse('comment:create', kwargs={'post_id': post.id}), {'body': 'hi'})
+        assert comment_count(post) == 1
+        comment = Comment.objects.get()
+        client.post(reverse('comment:delete', kwargs={'pk': comment.id}))
+        assert comment_count(post) == 0
+
+    def test_count_is_serialized_and_sortable(self, api_client, user, post, comment):
+        profile = Profile.objects.get(user=user)
+        Post.objects.create(
+            author=profile,
+            title='quiet',
+            content='desc',
+            status=True,
+            published_date=timezone.now()
+        )
+        url = reverse('blog:api-v2:post-list')
+        response = api_client.get(url, {'ordering': '-comment_count'})
+        counts = [item['comment_count'] for item in response.data['results']]
+        assert counts == [1, 0]
+
+    def test_reconcile_repairs_drift(self, post, comment):
+        Post.objects.filter(pk=post.pk).update(comment_count=7)
+        call_command('reconcile_comment_counts', batch_size=1)
+        assert comment_count(post) == 1
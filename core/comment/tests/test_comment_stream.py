@@ -0,0 +1,168 @@
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from django_redis import get_redis_connection
+from fakeredis import aioredis
+from rest_framework.test import APIClient
+
+from blog.models import Post
+from accounts.models import User, Profile
+from .. import buffer, events
+from ..api.v1.async_views import CommentStreamView
+from ..models import Comment
+import asyncio
+import json
+import pytest
+import redis
+
+@pytest.fixture(autouse=True)
+def async_redis(monkeypatch, settings):
+    """
+    Serve the async client from the fake server behind the cache.
+    """
+    def get_async_redis():
+        pool = redis.asyncio.ConnectionPool.from_url(
+            settings.CACHES['default']['LOCATION'],
+            connection_class=aioredis.FakeConnection,
+        )
+        return redis.asyncio.Redis(connection_pool=pool)
+    monkeypatch.setattr(events, 'get_async_redis', get_async_redis)
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(email='test@test.com', password='zZ@12345')
+
+@pytest.fixture
+def post(user):
+    return Post.objects.create(
+        author=Profile.objects.get(user=user),
+        title='test',
+        content='desc',
+        status=True,
+        published_date=timezone.now(),
+    )
+
+@pytest.fixture
+def comment(post, user):
+    def comment(body):
+        return Comment.objects.create(post=post, author=user, body=body)
+    return comment
+
+
+def stream_ids(post):
+    entries = get_redis_connection('default').xrange(events.stream_key(post.id))
+    return [event_id.decode() for event_id, _ in entries]
+
+
+def read_stream(post, reads, headers=None, during=None):
+    """
+    Open the stream of ``post`` and return its first ``reads`` chunks,
+    calling ``during`` once the first chunk arrived.
+    """
+    async def run():
+        url = reverse(
+            'comment:api-v1:post-comments-stream', kwargs={'post_id': post.id}
+        )
+        request = RequestFactory().get(url, headers=headers or {})
+        response = await CommentStreamView.as_view()(request, post_id=post.id)
+        assert response['Content-Type'] == 'text/event-stream'
+        content = response.streaming_content
+        chunks = []
+        try:
+            for _ in range(reads):
+                chunk = await asyncio.wait_for(content.__anext__(), 2)
+                chunks.append(chunk.decode())
+                if during is not None and len(chunks) == 1:
+                    await sync_to_async(during)()
+        finally:
+            await content.aclose()
+            await events.dispatcher.stop()
+        return chunks
+    return async_to_sync(run)()
+
+
+def parse(chunk):
+    fields = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+    return fields['id'], json.loads(fields['data'])
+
+
+@pytest.mark.django_db
+class TestCommentStream:
+
+    def test_new_comments_are_published_on_commit(
+        self, post, comment, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            created = comment('hello')
+        assert len(stream_ids(post)) == 1
+        entries = get_redis_connection('default').xrange(events.stream_key(post.id))
+        data = json.loads(entries[0][1][b'data'])
+        assert data['id'] == created.id
+        assert data['body'] == 'hello'
+
+    def test_buffered_comments_are_published_on_commit(
+        self, post, user, django_capture_on_commit_callbacks
+    ):
+        buffer.enqueue(post.id, user.id, 'first')
+        buffer.enqueue(post.id, user.id, 'second')
+        with django_capture_on_commit_callbacks(execute=True):
+            buffer.flush()
+        assert len(stream_ids(post)) == 2
+
+    def test_streams_new_comments(self, post, comment):
+        old = comment('old')
+        events.publish([old])
+        new = comment('new')
+        chunks = read_stream(post, 2, during=lambda: events.publish([new]))
+        assert chunks[0].startswith('retry:')
+        event_id, data = parse(chunks[1])
+        # Earlier events are not replayed without Last-Event-ID
+        assert data['id'] == new.id
+        assert event_id == stream_ids(post)[-1]
+
+    def test_resumes_after_last_event_id(self, post, comment):
+        comments = [comment(f'comment {i}') for i in range(3)]
+        events.publish(comments)
+        first = stream_ids(post)[0]
+        chunks = read_stream(post, 3, headers={'Last-Event-ID': first})
+        assert [parse(chunk)[1]['id'] for chunk in chunks[1:]] == [
+            comment.id for comment in comments[1:]
+        ]
+
+    def test_other_posts_are_not_streamed(self, post, user, comment):
+        other = Post.objects.create(
+            author=post.author, title='other', content='desc', status=True,
+            published_date=timezone.now(),
+        )
+        foreign = Comment.objects.create(post=other, author=user, body='elsewhere')
+        mine = comment('mine')
+        chunks = read_stream(
+            post, 2, during=lambda: events.publish([foreign, mine])
+        )
+        assert parse(chunks[1])[1]['id'] == mine.id
+
+    def test_heartbeat(self, post, monkeypatch):
+        monkeypatch.setattr(CommentStreamView, 'heartbeat_interval', 0.05)
+        chunks = read_stream(post, 2)
+        assert chunks[1] == ': heartbeat\n\n'
+
+    def test_unknown_post(self):
+        response = APIClient().get(
+            reverse('comment:api-v1:post-comments-stream', kwargs={'post_id': 999})
+        )
+        assert response.status_code == 404
+
+    def test_slow_subscribers_are_closed(self):
+        dispatcher = events.CommentEventDispatcher()
+
+        async def run():
+            queue = asyncio.Queue(2)
+            dispatcher.subscribers[1].add(queue)
+            for i in range(3):
+                message = {'post': 1, 'id': f'1-{i}', 'data': '{}'}
+                dispatcher.dispatch(json.dumps(message))
+            return queue.get_nowait(), dispatcher.subscribers
+        item, subscribers = async_to_sync(run)()
+        assert item is None
+        assert not subscribers
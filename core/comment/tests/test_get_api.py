@@ -1,5 +1,7 @@
 from rest_framework.test import APIClient
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from datetime import datetime
 
 from blog.models import Post
@@ -81,4 +83,54 @@ class TestGetAPI:
             "comment:api-v1:post-comments", kwargs={'post_id': post.id}
         )
         response = api_client.get(url)
-        assert response.data['count'] == 1
\ No newline at end of file
+        assert response.data['count'] == 1
+
+    def test_get_comments_with_cursor_pagination(self, api_client, post, user):
+        '''
+        Cursor mode returns comments oldest first without a count
+        '''
+        comments = [
+            Comment.objects.create(post=post, author=user, body=f'comment {i}')
+            for i in range(5)
+        ]
+        url = reverse(
+            "comment:api-v1:post-comments", kwargs={'post_id': post.id}
+        )
+        response = api_client.get(url, {'pagination': 'cursor'})
+        assert 'count' not in response.data
+        ids = [item['id'] for item in response.data['results']]
+        response = api_client.get(response.data['next'])
+        ids += [item['id'] for item in response.data['results']]
+        assert ids == [comment.id for comment in comments]
+        assert response.data['next'] is None
+
+    def test_get_comments_if_none_match(self, api_client, post, user, comment):
+        '''
+        Unchanged comments answer 304, a new comment changes the ETag
+        '''
+        url = reverse(
+            "comment:api-v1:post-comments", kwargs={'post_id': post.id}
+        )
+        etag = api_client.get(url)['ETag']
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        Comment.objects.create(post=post, author=user, body='another one')
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+    def test_cached_count_is_versioned_per_post(
+            self, api_client, post, another_post, user, comment
+        ):
+        '''
+        A comment on another post keeps this post's cached count
+        '''
+        url = reverse(
+            "comment:api-v1:post-comments", kwargs={'post_id': post.id}
+        )
+        api_client.get(url)
+        Comment.objects.create(post=another_post, author=user, body='elsewhere')
+        with CaptureQueriesContext(connection) as queries:
+            assert api_client.get(url).data['count'] == 1
+        assert not [q for q in queries.captured_queries if '__count' in q['sql']]
+        Comment.objects.create(post=post, author=user, body='here')
+        assert api_client.get(url).data['count'] == 2
@@ -0,0 +1,158 @@
+from rest_framework.test import APIClient
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Post
+from accounts.models import User, Profile
+from .. import models
+from ..models import Comment, path_upper_bound
+from unittest.mock import patch
+import pytest
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(email='test@test.com', password='zZ@12345')
+
+@pytest.fixture
+def make_post(user):
+    def make_post():
+        return Post.objects.create(
+            author=Profile.objects.get(user=user),
+            title='test',
+            content='desc',
+            status=True,
+            published_date=timezone.now(),
+        )
+    return make_post
+
+@pytest.fixture
+def post(make_post):
+    return make_post()
+
+@pytest.fixture
+def reply(post, user):
+    def reply(body, parent=None):
+        return Comment.objects.create(post=post, author=user, body=body, parent=parent)
+    return reply
+
+@pytest.fixture
+def thread(reply):
+    """
+    a
+    ├── a1
+    │   └── a1x
+    └── a2
+    b
+    """
+    a = reply('a')
+    a1 = reply('a1', a)
+    b = reply('b')
+    a2 = reply('a2', a)
+    a1x = reply('a1x', a1)
+    return {'a': a, 'a1': a1, 'a1x': a1x, 'a2': a2, 'b': b}
+
+
+def bodies(response):
+    return [item['body'] for item in response.data['results']]
+
+
+@pytest.mark.django_db
+class TestCommentThreadAPI:
+
+    def test_paths_encode_ancestry(self, thread):
+        assert thread['a'].depth == 0
+        assert thread['a1x'].depth == 2
+        assert thread['a1x'].path.startswith(thread['a1'].path)
+        assert len(thread['a1x'].path) == 3 * models.PATH_SEGMENT_WIDTH
+
+    def test_path_upper_bound(self):
+        assert path_upper_bound('000000a') == '000000b'
+        assert path_upper_bound('00000az') == '00000b'
+        assert path_upper_bound('zzz') is None
+
+    def test_post_thread_is_depth_first(self, api_client, post, thread):
+        url = reverse('comment:api-v1:post-thread', kwargs={'post_id': post.id})
+        response = api_client.get(url)
+        assert response.status_code == 200
+        assert bodies(response) == ['a', 'a1', 'a1x', 'a2', 'b']
+
+    def test_post_thread_max_depth(self, api_client, post, thread):
+        url = reverse('comment:api-v1:post-thread', kwargs={'post_id': post.id})
+        assert bodies(api_client.get(url, {'max_depth': 0})) == ['a', 'b']
+        assert bodies(api_client.get(url, {'max_depth': 1})) == ['a', 'a1', 'a2', 'b']
+        assert api_client.get(url, {'max_depth': -1}).status_code == 400
+
+    def test_replies_is_one_range_query(
+        self, api_client, thread, django_assert_num_queries
+    ):
+        url = reverse(
+            'comment:api-v1:comment-replies', kwargs={'comment_id': thread['a'].id}
+        )
+        # The root comment and the subtree page
+        with django_assert_num_queries(2):
+            response = api_client.get(url)
+        assert bodies(response) == ['a1', 'a1x', 'a2']
+        assert bodies(api_client.get(url, {'max_depth': 0})) == ['a1', 'a2']
+
+    def test_thread_pages_follow_cursor(self, api_client, post, thread):
+        url = reverse('comment:api-v1:post-thread', kwargs={'post_id': post.id})
+        first = api_client.get(url, {'page_size': 3})
+        second = api_client.get(first.data['next'])
+        assert bodies(first) + bodies(second) == ['a', 'a1', 'a1x', 'a2', 'b']
+
+    def test_create_reply_through_api(self, api_client, user, post, thread):
+        api_client.force_authenticate(user=user)
+        url = reverse('comment:api-v1:post-comments', kwargs={'post_id': post.id})
+        response = api_client.post(url, {'body': 'a2x', 'parent': thread['a2'].id})
+        assert response.status_code == 201
+        assert response.data['depth'] == 2
+        created = Comment.objects.get(body='a2x')
+        assert created.path.startswith(thread['a2'].path)
+
+    def test_reply_must_stay_on_post(self, api_client, user, make_post, thread):
+        api_client.force_authenticate(user=user)
+        other = make_post()
+        url = reverse('comment:api-v1:post-comments', kwargs={'post_id': other.id})
+        response = api_client.post(url, {'body': 'x', 'parent': thread['a'].id})
+        assert response.status_code == 400
+
+    def test_replies_beyond_max_depth_continue_as_siblings(
+        self, reply, monkeypatch
+    ):
+        monkeypatch.setattr(models, 'COMMENT_MAX_DEPTH', 2)
+        parent = reply('0')
+        chain = [parent]
+        for i in range(1, 5):
+            chain.append(reply(str(i), chain[-1]))
+        assert [comment.depth for comment in chain] == [0, 1, 2, 2, 2]
+        assert chain[4].parent_id == chain[1].id
+
+    def test_api_rejects_replies_beyond_max_depth(
+        self, api_client, user, post, thread, monkeypatch
+    ):
+        monkeypatch.setattr(models, 'COMMENT_MAX_DEPTH', 2)
+        api_client.force_authenticate(user=user)
+        url = reverse('comment:api-v1:post-comments', kwargs={'post_id': post.id})
+        response = api_client.post(url, {'body': 'x', 'parent': thread['a1x'].id})
+        assert response.status_code == 400
+        assert 'parent' in response.data
+        response = api_client.post(url, {'body': 'x', 'parent': thread['a1'].id})
+        assert response.status_code == 201
+
+    def test_failed_path_update_rolls_back_insert(self, post, user, reply):
+        with patch.object(Comment, 'build_path', side_effect=RuntimeError):
+            with pytest.raises(RuntimeError):
+                reply('lost')
+        assert not Comment.objects.exists()
+        post.refresh_from_db()
+        assert post.comment_count == 0
+
+    def test_deleting_a_comment_removes_its_subtree(self, post, thread):
+        thread['a'].delete()
+        assert list(Comment.objects.values_list('body', flat=True)) == ['b']
+        post.refresh_from_db()
+        assert post.comment_count == 1
@@ -0,0 +1,49 @@
+from django.core.cache import cache
+import fakeredis
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def fake_redis_cache(settings):
+    """
+    Point the Redis cache at an in-process fake server so tests run
+    without a Redis instance, and start every test with an empty cache.
+    """
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": "redis://localhost:6379/2",
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                "CONNECTION_POOL_KWARGS": {
+                    "connection_class": fakeredis.FakeConnection,
+                },
+            },
+        }
+    }
+    cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def category_registry():
+    """
+    Test transactions roll back without firing signals, so drop the
+    categories a previous test left in the per-process registry.
+    """
+    from blog.categories import registry
+
+    registry.clear()
+    yield registry
+
+
+@pytest.fixture(autouse=True)
+def celery_eager():
+    """
+    Run celery tasks in-process instead of sending them to a broker.
+    """
+    from core.celery import app
+
+    app.conf.update(task_always_eager=True, task_eager_propagates=True)
+    yield
+    app.conf.update(task_always_eager=False, task_eager_propagates=False)
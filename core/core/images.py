@@ -0,0 +1,99 @@
+"""
+Resized JPEG and WebP renditions of uploaded images.
+
+Renditions are written next to the original in its storage and described
+by a JSON-serializable mapping kept on the model instance:
+``{"320": {"jpeg": "<name>", "webp": "<name>"}, ...}`` keyed by width.
+"""
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+import io
+import os
+
+RENDITION_WIDTHS = (320, 640, 1280)
+# (Pillow format, file extension, save options)
+RENDITION_FORMATS = (
+    ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+    ("WEBP", "webp", {"quality": 80, "method": 4}),
+)
+
+
+def generate_renditions(field_file, widths=RENDITION_WIDTHS):
+    """
+    Write every rendition of ``field_file`` and return their mapping.
+    Images are never upscaled; widths beyond the original collapse into
+    one rendition at the original width.
+    """
+    with field_file.open("rb"):
+        image = Image.open(field_file)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    storage = field_file.storage
+    base, _ = os.path.splitext(field_file.name)
+    renditions = {}
+    for width in sorted({min(width, image.width) for width in widths}):
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS)
+        formats = {}
+        for image_format, extension, options in RENDITION_FORMATS:
+            # JPEG has no alpha channel
+            source = resized.convert("RGB") if image_format == "JPEG" else resized
+            buffer = io.BytesIO()
+            source.save(buffer, image_format, **options)
+            name = f"renditions/{base}-{width}w.{extension}"
+            formats[image_format.lower()] = storage.save(
+                name, ContentFile(buffer.getvalue())
+            )
+        renditions[str(width)] = formats
+    return renditions
+
+
+def delete_renditions(storage, renditions):
+    for formats in (renditions or {}).values():
+        for name in formats.values():
+            storage.delete(name)
+
+
+def rendition_urls(storage, renditions, request=None):
+    """
+    Turn stored rendition names into (absolute, given a request) URLs.
+    """
+    urls = {}
+    for width, formats in (renditions or {}).items():
+        urls[width] = {
+            image_format: (
+                request.build_absolute_uri(storage.url(name))
+                if request is not None
+                else storage.url(name)
+            )
+            for image_format, name in formats.items()
+        }
+    return urls
+
+
+def refresh_renditions(model, pk):
+    """
+    Regenerate the renditions of the ``model`` row ``pk`` and store them
+    in its ``image_renditions`` field, replacing the previous files.
+    Returns the instance, or None when the row is gone or its image was
+    replaced in the meantime (the replacement schedules its own run).
+    """
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return None
+    storage = instance.image.storage
+    renditions = generate_renditions(instance.image) if instance.image else {}
+    # updated_date moves so ETags reflect the new output
+    updated = model.objects.filter(pk=pk, image=instance.image.name).update(
+        image_renditions=renditions, updated_date=timezone.now()
+    )
+    if not updated:
+        delete_renditions(storage, renditions)
+        return None
+    delete_renditions(storage, instance.image_renditions)
+    return instance
@@ -0,0 +1,228 @@
+"""
+Pagination classes shared by the blog and comment APIs.
+"""
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from urllib import parse
+
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class AsyncPaginationMixin:
+    """
+    ``apaginate_queryset`` for async views on page-number pagination
+    classes whose django_paginator_class is a CachedCountPaginator: the
+    count and the page rows are awaited with the async ORM.
+    """
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        # The page number may be "last", which needs the count
+        await paginator.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = await paginator.apage(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+        return list(self.page)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over a ``(created_date, id)`` pair.
+    Each page seeks past the last row of the previous one instead of
+    running COUNT(*) plus OFFSET, so page 10,000 costs the same as page 1
+    and rows inserted while a client is paging never shift later pages.
+    """
+    page_size = 3
+    page_size_query_param = "page_size"
+    max_page_size = 3
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    # (date field, id field); both must share the same direction
+    ordering = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        assert self.ordering is not None, (
+            "Using keyset pagination, but no ordering attribute was declared "
+            "on the pagination class."
+        )
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[2]
+
+        queryset = queryset.order_by(*self.get_ordering(reverse))
+        if cursor is not None:
+            queryset = queryset.filter(
+                self.get_seek_filter(cursor[0], cursor[1], reverse)
+            )
+
+        # Fetch one extra row to know whether there is a page beyond this one
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, reverse=False):
+        """
+        Return the ``order_by`` arguments, flipped when paging backwards.
+        """
+        if not reverse:
+            return self.ordering
+        return tuple(
+            field[1:] if field.startswith("-") else "-" + field
+            for field in self.ordering
+        )
+
+    def get_seek_filter(self, date_value, pk, reverse=False):
+        """
+        Rows that come strictly after ``(date_value, pk)`` in page order.
+        """
+        date_field, id_field = (field.lstrip("-") for field in self.ordering)
+        descending = self.ordering[0].startswith("-")
+        lookup = "lt" if descending != reverse else "gt"
+        return Q(**{f"{date_field}__{lookup}": date_value}) | Q(
+            **{date_field: date_value, f"{id_field}__{lookup}": pk}
+        )
+
+    def get_position(self, item):
+        date_field, id_field = (field.lstrip("-") for field in self.ordering)
+        # Rows of a .values() queryset are dicts
+        if isinstance(item, dict):
+            return item[date_field], item[id_field]
+        return getattr(item, date_field), getattr(item, id_field)
+
+    def decode_cursor(self, request):
+        """
+        Return ``(date, id, reverse)`` from the request cursor, or None.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            date_value = parse_datetime(tokens["c"][0])
+            pk = int(tokens["i"][0])
+            reverse = bool(int(tokens.get("r", ["0"])[0]))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if date_value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return date_value, pk, reverse
+
+    def encode_cursor(self, position, reverse=False):
+        tokens = {"c": position[0].isoformat(), "i": position[1]}
+        if reverse:
+            tokens["r"] = "1"
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+
+
+class KeysetPaginationMixin:
+    """
+    Lets clients opt in to keyset pagination with ``?pagination=cursor``.
+    Page-number pagination stays the default, so existing clients that
+    rely on ``count`` and ``?page=`` are unaffected.
+
+    Keyset pages always follow the ordering of the pagination class, so
+    requests asking for another ``?ordering=`` or hitting an action in
+    ``keyset_excluded_actions`` get a 400 instead of silently reordered
+    results.
+    """
+    keyset_pagination_class = None
+    # Actions whose results have an order of their own, like a search rank
+    keyset_excluded_actions = ()
+    pagination_mode_query_param = "pagination"
+
+    @property
+    def paginator(self):
+        if (
+            not hasattr(self, "_paginator")
+            and self.keyset_pagination_class is not None
+            and getattr(self, "request", None) is not None
+            and self.request.query_params.get(self.pagination_mode_query_param)
+            == "cursor"
+        ):
+            self._paginator = self.keyset_pagination_class()
+        return super().paginator
+
+    def paginate_queryset(self, queryset):
+        if isinstance(self.paginator, KeysetPagination):
+            self.check_keyset_ordering()
+        return super().paginate_queryset(queryset)
+
+    def check_keyset_ordering(self):
+        params = self.request.query_params.get(api_settings.ORDERING_PARAM, "")
+        terms = [
+            term.strip()
+            for term in params.split(",")
+            if term.strip()
+        ]
+        ordering = list(self.paginator.ordering)
+        if (
+            getattr(self, "action", None) in self.keyset_excluded_actions
+            or terms not in ([], ordering[:1], ordering)
+        ):
+            raise ValidationError(
+                {
+                    self.pagination_mode_query_param: [
+                        "Cursor pagination only supports the default ordering "
+                        "and can't be combined with search."
+                    ]
+                }
+            )
@@ -60,6 +60,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "accounts.middleware.ProfileMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -146,12 +147,49 @@ AUTH_USER_MODEL = "accounts.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
+        "accounts.authentication.ChainedAuthentication",
+    ],
+    # Sliding windows of accounts.throttling, per client address and per
+    # email named in the request, for the views with a throttle_scope
+    # Proxies in front of the app whose X-Forwarded-For entries are
+    # trusted for client addresses: 0 uses REMOTE_ADDR, 1 behind nginx
+    "NUM_PROXIES": config("DRF_NUM_PROXIES", cast=int, default=0),
+    "DEFAULT_THROTTLE_RATES": {
+        "registration_ip": config("THROTTLE_REGISTRATION_IP", default="20/hour"),
+        "registration_email": config("THROTTLE_REGISTRATION_EMAIL", default="5/hour"),
+        "login_ip": config("THROTTLE_LOGIN_IP", default="30/min"),
+        "login_email": config("THROTTLE_LOGIN_EMAIL", default="10/min"),
+        "activation-resend_ip": config(
+            "THROTTLE_ACTIVATION_RESEND_IP", default="10/hour"
+        ),
+        "activation-resend_email": config(
+            "THROTTLE_ACTIVATION_RESEND_EMAIL", default="3/hour"
+        ),
+        "reset-password_ip": config("THROTTLE_RESET_PASSWORD_IP", default="10/hour"),
+        "reset-password_email": config(
+            "THROTTLE_RESET_PASSWORD_EMAIL", default="3/hour"
+        ),
+    },
+}
+# Authentication classes tried per view, keyed by chain name; a view
+# picks one with authentication_chain, else by URL namespace (e.g.
+# "api-v2" or "blog:api-v2"), else "default". Cheap checks come first,
+# Basic pays a full password hash per request and comes last.
+API_AUTHENTICATION_CHAINS = {
+    "default": [
+        "accounts.authentication.CachedJWTAuthentication",
+        "accounts.authentication.CachedTokenAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.BasicAuthentication",
+    ],
+    # JWT only, plus sessions for the browsable API
+    "api-v2": [
+        "accounts.authentication.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ]
+    ],
 }
+# Seconds authenticated users and tokens stay cached, see accounts.authentication
+ACCOUNTS_AUTH_CACHE_TIMEOUT = config("ACCOUNTS_AUTH_CACHE_TIMEOUT", cast=int, default=60)
 
 # Email configuration
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -160,9 +198,24 @@ EMAIL_HOST = 'smtp4dev'
 EMAIL_HOST_USER = ''
 EMAIL_HOST_PASSWORD = ''
 EMAIL_PORT = 25
+# Celery rate limit of account emails. Celery enforces it per worker
+# instance, so only the email_worker compose service consumes the
+# ACCOUNTS_EMAIL_QUEUE and the limit is the global cap
+ACCOUNTS_EMAIL_RATE_LIMIT = config("ACCOUNTS_EMAIL_RATE_LIMIT", default="100/m")
+ACCOUNTS_EMAIL_QUEUE = "email"
 
 # Celery configs
 CELERY_BROKER_URL = 'redis://redis:6379/1'
+CELERY_TASK_ROUTES = {
+    'accounts.tasks.send_templated_email': {'queue': ACCOUNTS_EMAIL_QUEUE},
+}
+CELERY_BEAT_SCHEDULE = {
+    # Put scheduled posts live once their published_date passes
+    'publish-due-posts': {
+        'task': 'blog.tasks.publish_due_posts',
+        'schedule': config('BLOG_PUBLISH_INTERVAL', cast=float, default=60.0),
+    },
+}
 
 # Cors headers configs
 CORS_ALLOW_ALL_ORIGINS = True
@@ -176,4 +229,18 @@ CACHES = {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
         }
     }
-}
\ No newline at end of file
+}
+# Blog API configs
+# Build read-only v2 list responses from .values() rows instead of serializers
+BLOG_FAST_LIST = config("BLOG_FAST_LIST", cast=bool, default=False)
+
+# Comment configs
+# Buffer new API comments in Redis and write them in batches from celery
+COMMENT_BUFFERED_WRITES = config("COMMENT_BUFFERED_WRITES", cast=bool, default=False)
+if COMMENT_BUFFERED_WRITES:
+    # Write buffered comments. Before turning buffering off, drain what
+    # is left with comment.tasks.flush_comment_buffer
+    CELERY_BEAT_SCHEDULE['flush-comment-buffer'] = {
+        'task': 'comment.tasks.flush_comment_buffer',
+        'schedule': config('COMMENT_FLUSH_INTERVAL', cast=float, default=2.0),
+    }
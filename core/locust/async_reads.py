@@ -0,0 +1,62 @@
+import os
+import random
+
+from locust import HttpUser, between, task
+
+POST_IDS = range(1, int(os.environ.get("POST_COUNT", "100")) + 1)
+
+
+class Reader(HttpUser):
+    """
+    Anonymous reader of the hot read paths, to compare the gunicorn WSGI
+    deployment with the uvicorn ASGI one (the asgi compose profile).
+    Both runs hit the async read views, so every response is built by the
+    same fast builders and only the server differs; WSGI workers run each
+    async view in an event loop of its own.
+
+        locust -f locust/async_reads.py --headless -u 500 -r 50 -t 3m \
+            -H http://backend:8000 --csv reads-wsgi
+        locust -f locust/async_reads.py --headless -u 500 -r 50 -t 3m \
+            -H http://backend_asgi:8001 --csv reads-asgi
+
+    Compare requests per second and the p95/p99 columns of both runs.
+    """
+    wait_time = between(0.5, 1.5)
+
+    @task(4)
+    def post_list(self):
+        """
+        Fetch a page of the v2 post list.
+        """
+        self.client.get(
+            "/blog/api/v2/async/post/",
+            params={"page": random.randint(1, 5)},
+            name="/blog/api/v2/async/post/",
+        )
+
+    @task(3)
+    def post_detail(self):
+        """
+        Fetch a single post.
+        """
+        self.client.get(
+            f"/blog/api/v2/async/post/{random.choice(POST_IDS)}/",
+            name="/blog/api/v2/async/post/[id]/",
+        )
+
+    @task(2)
+    def comment_list(self):
+        """
+        Fetch the comments of a post.
+        """
+        self.client.get(
+            f"/comment/api/v1/async/post/{random.choice(POST_IDS)}/comments/",
+            name="/comment/api/v1/async/post/[id]/comments/",
+        )
+
+    @task(1)
+    def html_list(self):
+        """
+        Render the HTML post list.
+        """
+        self.client.get("/blog/async/post/")
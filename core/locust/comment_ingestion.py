@@ -0,0 +1,54 @@
+import os
+
+from locust import HttpUser, constant, task
+
+VIRAL_POST_ID = os.environ.get("VIRAL_POST_ID", "1")
+
+
+class CommentWriter(HttpUser):
+    """
+    Hammers the comment endpoint of a single post to measure sustained
+    write throughput. Run it once with COMMENT_BUFFERED_WRITES off and
+    once with it on (and a Celery worker plus beat running), then compare
+    the requests per second and latency percentiles of both runs:
+
+        LOCUST_EMAIL=loadtest0@example.com LOCUST_PASSWORD=Zz@12345 \
+        locust -f locust/comment_ingestion.py --headless -u 200 -r 20 \
+            -t 2m -H http://localhost:8000 --csv comments-sync
+
+    The account comes from the seed_loadtest_users command. Buffered
+    writes answer 202, synchronous writes 201. Requests still in flight
+    when locust stops are written too, so compare the comment rows of the
+    post with the accepted requests only after the server drained.
+    """
+    wait_time = constant(0)
+
+    def on_start(self):
+        """
+        Authenticate once and attach the JWT token to all future requests.
+        """
+        url = "/accounts/api/v1/jwt/create/"
+        data = {
+            "email": os.environ.get("LOCUST_EMAIL", "kia@gmail.com"),
+            "password": os.environ.get("LOCUST_PASSWORD", "Zz12345@"),
+        }
+        response = self.client.post(url, data=data).json()
+        self.client.headers = {
+            "Authorization": f"Bearer {response.get('access')}"
+        }
+
+    @task
+    def create_comment(self):
+        """
+        Post a comment to the viral post.
+        """
+        with self.client.post(
+            f"/comment/api/v1/post/{VIRAL_POST_ID}/comments/",
+            data={"body": "load test comment"},
+            name="/comment/api/v1/post/[id]/comments/",
+            catch_response=True,
+        ) as response:
+            if response.status_code in (201, 202):
+                response.success()
+            else:
+                response.failure(f"unexpected status {response.status_code}")
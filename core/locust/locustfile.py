@@ -1,36 +1,394 @@
-from locust import HttpUser, task
+"""
+Scenario suite of the blog: weighted personas that together resemble
+production traffic, with service level gates on the whole run.
 
-class QuickstartUser(HttpUser):
+Seed the users the personas log in with, then run the suite headless
+with the settings of locust.conf:
+
+    python manage.py seed_loadtest_users --output locust/credentials.csv
+    locust -f locust/locustfile.py --config locust/locust.conf
+
+The run exits with code 1 when the p95 latency of all requests exceeds
+--slo-p95-ms or their error ratio exceeds --slo-error-rate. The
+``loadtest`` profile of docker-compose.yml runs the same suite with one
+master and several workers against the local stack.
+"""
+import csv
+import logging
+import os
+import random
+import time
+
+from locust import HttpUser, between, events, task
+from locust.exception import StopUser
+from locust.runners import WorkerRunner
+
+logger = logging.getLogger(__name__)
+
+CREDENTIALS_FILE = os.environ.get(
+    "LOCUST_CREDENTIALS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "credentials.csv"),
+)
+# Access tokens live five minutes, refresh them a little earlier
+ACCESS_TOKEN_REFRESH_AFTER = 240
+SEARCH_TERMS = ["python", "django", "movie", "photo", "fun", "travel"]
+
+
+def load_credentials(path):
+    """
+    Email and password pairs written by the seed_loadtest_users command.
+    """
+    try:
+        with open(path, newline="") as credentials:
+            rows = csv.DictReader(credentials)
+            return [(row["email"], row["password"]) for row in rows]
+    except FileNotFoundError:
+        logger.warning("No credentials at %s, only anonymous readers run", path)
+        return []
+
+
+CREDENTIALS = load_credentials(CREDENTIALS_FILE)
+
+
+def pick_credentials():
+    if not CREDENTIALS:
+        raise StopUser()
+    return random.choice(CREDENTIALS)
+
+
+def results(response):
+    """
+    Items of a paginated or plain list response.
+    """
+    data = response.json()
+    return data.get("results", []) if isinstance(data, dict) else data
+
+
+@events.init_command_line_parser.add_listener
+def add_slo_arguments(parser):
+    parser.add_argument(
+        "--slo-p95-ms",
+        type=float,
+        env_var="LOCUST_SLO_P95_MS",
+        default=500,
+        help="Fail the run when the p95 response time of all requests is higher",
+    )
+    parser.add_argument(
+        "--slo-error-rate",
+        type=float,
+        env_var="LOCUST_SLO_ERROR_RATE",
+        default=0.01,
+        help="Fail the run when the ratio of failed requests is higher",
+    )
+
+
+@events.quitting.add_listener
+def check_slo(environment, **kwargs):
+    """
+    Set a failing exit code when the run missed its service level
+    objectives. Workers only hold partial stats, the master decides.
+    """
+    if isinstance(environment.runner, WorkerRunner):
+        return
+    options = environment.parsed_options
+    total = environment.stats.total
+    if not total.num_requests:
+        logger.error("SLO failed: no requests were made")
+        environment.process_exit_code = 1
+        return
+
+    p95 = total.get_response_time_percentile(0.95)
+    failures = []
+    if p95 > options.slo_p95_ms:
+        failures.append(f"p95 {p95:.0f} ms > {options.slo_p95_ms:.0f} ms")
+    if total.fail_ratio > options.slo_error_rate:
+        failures.append(
+            f"error rate {total.fail_ratio:.2%} > {options.slo_error_rate:.2%}"
+        )
+    if not failures:
+        logger.info(
+            "SLO passed: p95 %.0f ms, error rate %.2f%%", p95, total.fail_ratio * 100
+        )
+        return
+
+    logger.error("SLO failed: %s", ", ".join(failures))
+    slowest = sorted(
+        environment.stats.entries.values(),
+        key=lambda entry: entry.get_response_time_percentile(0.95),
+        reverse=True,
+    )[:5]
+    for entry in slowest:
+        logger.error(
+            "  %s %s: p95 %.0f ms, %d of %d failed",
+            entry.method,
+            entry.name,
+            entry.get_response_time_percentile(0.95),
+            entry.num_failures,
+            entry.num_requests,
+        )
+    environment.process_exit_code = 1
+
+
+class BlogUser(HttpUser):
+    """
+    Shared reads of the personas. Post ids seen in list responses are
+    remembered, so detail and comment requests hit existing posts.
+    """
+    abstract = True
+    wait_time = between(1, 3)
+
+    def on_start(self):
+        self.post_ids = []
+
+    def remember_posts(self, response):
+        if response.status_code == 200:
+            ids = [post["id"] for post in results(response)]
+            self.post_ids = (ids + self.post_ids)[:50]
+
+    def some_post(self):
+        if not self.post_ids:
+            self.post_list()
+        return random.choice(self.post_ids) if self.post_ids else None
+
+    def post_list(self, params=None):
+        params = params or {"page": random.randint(1, 3)}
+        with self.client.get(
+            "/blog/api/v2/post/",
+            params=params,
+            name="/blog/api/v2/post/",
+            catch_response=True,
+        ) as response:
+            # Pages past the end are a valid answer for small datasets
+            if response.status_code == 404:
+                response.success()
+            self.remember_posts(response)
+
+    def post_detail(self):
+        post_id = self.some_post()
+        if post_id is not None:
+            self.client.get(
+                f"/blog/api/v2/post/{post_id}/", name="/blog/api/v2/post/[id]/"
+            )
+
+    def comment_list(self):
+        post_id = self.some_post()
+        if post_id is not None:
+            self.client.get(
+                f"/comment/api/v1/post/{post_id}/comments/",
+                name="/comment/api/v1/post/[id]/comments/",
+            )
+
+
+class AuthenticatedUser(BlogUser):
     """
-    Simulates an authenticated user for load testing API endpoints.
-    Retrieves a JWT token on start and uses it for subsequent requests.
+    Logs in with seeded credentials and keeps its JWT access token fresh.
     """
+    abstract = True
 
     def on_start(self):
-        """
-        Authenticate once at the beginning of the test
-        and attach the JWT token to all future requests.
-        """
-        url = "/accounts/api/v1/jwt/create/"
+        super().on_start()
+        self.access_issued = 0
+        self.refresh = None
+        self.email, self.password = pick_credentials()
+        self.login()
+
+    def login(self):
+        response = self.client.post(
+            "/accounts/api/v1/jwt/create/",
+            data={"email": self.email, "password": self.password},
+        )
+        if response.status_code == 200:
+            self.use_tokens(response.json())
+
+    def use_tokens(self, data):
+        self.client.headers["Authorization"] = f"Bearer {data['access']}"
+        self.refresh = data.get("refresh", self.refresh)
+        self.access_issued = time.monotonic()
+
+    def ensure_token(self):
+        if time.monotonic() - self.access_issued < ACCESS_TOKEN_REFRESH_AFTER:
+            return
+        if self.refresh is None:
+            self.login()
+            return
+        response = self.client.post(
+            "/accounts/api/v1/jwt/refresh/", data={"refresh": self.refresh}
+        )
+        if response.status_code == 200:
+            self.use_tokens(response.json())
+        else:
+            self.login()
+
+
+class AnonymousReader(BlogUser):
+    """
+    The bulk of the traffic: browsing lists, posts and their comments.
+    """
+    weight = 12
+
+    @task(4)
+    def browse_posts(self):
+        self.post_list()
+
+    @task(2)
+    def browse_category(self):
+        response = self.client.get("/blog/api/v2/category/")
+        if response.status_code == 200 and results(response):
+            category = random.choice(results(response))
+            self.post_list({"category": category["id"]})
+
+    @task(4)
+    def read_post(self):
+        self.post_detail()
+
+    @task(2)
+    def read_comments(self):
+        self.comment_list()
+
+    @task(1)
+    def search(self):
+        self.client.get(
+            "/blog/api/v2/post/search/",
+            params={"q": random.choice(SEARCH_TERMS)},
+            name="/blog/api/v2/post/search/",
+        )
+
+    @task(1)
+    def html_list(self):
+        self.client.get("/blog/post/")
+
+
+class Commenter(AuthenticatedUser):
+    """
+    Signed-in readers who comment on the posts they read.
+    """
+    weight = 4
+
+    @task(3)
+    def read_post(self):
+        self.ensure_token()
+        self.post_detail()
+        self.comment_list()
+
+    @task(1)
+    def comment(self):
+        self.ensure_token()
+        post_id = self.some_post()
+        if post_id is None:
+            return
+        with self.client.post(
+            f"/comment/api/v1/post/{post_id}/comments/",
+            data={"body": "load test comment"},
+            name="/comment/api/v1/post/[id]/comments/",
+            catch_response=True,
+        ) as response:
+            # Buffered writes answer 202
+            if response.status_code in (201, 202):
+                response.success()
+            else:
+                response.failure(f"unexpected status {response.status_code}")
+
+
+class Author(AuthenticatedUser):
+    """
+    Authors writing new posts and editing or deleting their own.
+    """
+    weight = 1
+
+    def on_start(self):
+        super().on_start()
+        self.own_post_ids = []
+        response = self.client.get("/blog/api/v2/category/")
+        self.category_ids = []
+        if response.status_code == 200:
+            self.category_ids = [category["id"] for category in results(response)]
+
+    @task(3)
+    def create_post(self):
+        self.ensure_token()
         data = {
-            "email": "kia@gmail.com",
-            "password": "Zz12345@",
-        }
-        response = self.client.post(url, data=data).json()
-        self.client.headers = {
-            "Authorization": f"Bearer {response.get('access')}"
+            "title": "load test post",
+            "content": "written by the locust suite",
+            "status": True,
+            "published_date": "2024-01-01T00:00:00Z",
         }
+        if self.category_ids:
+            data["category"] = random.choice(self.category_ids)
+        response = self.client.post("/blog/api/v2/post/", data=data)
+        if response.status_code == 201:
+            self.own_post_ids.append(response.json()["id"])
+
+    @task(5)
+    def edit_post(self):
+        if not self.own_post_ids:
+            return
+        self.ensure_token()
+        post_id = random.choice(self.own_post_ids)
+        self.client.patch(
+            f"/blog/api/v2/post/{post_id}/",
+            data={"title": f"edited at {time.time():.0f}"},
+            name="/blog/api/v2/post/[id]/",
+        )
+
+    @task(1)
+    def delete_post(self):
+        if len(self.own_post_ids) < 5:
+            return
+        self.ensure_token()
+        post_id = self.own_post_ids.pop(0)
+        self.client.delete(
+            f"/blog/api/v2/post/{post_id}/", name="/blog/api/v2/post/[id]/"
+        )
+
+
+class LoginChurn(HttpUser):
+    """
+    Clients that log in, refresh and log out over and over, the path
+    the account throttles guard. 429 answers count as expected; raise
+    the THROTTLE_LOGIN_* rates of the backend to measure raw capacity.
+    """
+    weight = 1
+    wait_time = between(2, 5)
+
+    def on_start(self):
+        self.email, self.password = pick_credentials()
+
+    def expect(self, method, url, accepted, **kwargs):
+        with self.client.request(
+            method, url, catch_response=True, **kwargs
+        ) as response:
+            if response.status_code in accepted or response.status_code == 429:
+                response.success()
+            else:
+                response.failure(f"unexpected status {response.status_code}")
+            return response
+
+    @task(2)
+    def jwt_cycle(self):
+        credentials = {"email": self.email, "password": self.password}
+        response = self.expect(
+            "POST", "/accounts/api/v1/jwt/create/", (200,), data=credentials
+        )
+        if response.status_code != 200:
+            return
+        self.expect(
+            "POST",
+            "/accounts/api/v1/jwt/refresh/",
+            (200,),
+            data={"refresh": response.json()["refresh"]},
+        )
 
-    @task
-    def post_list(self):
-        """
-        Fetch list of blog posts.
-        """
-        self.client.get("/blog/api/v2/post/")
-
-    @task
-    def category_list(self):
-        """
-        Fetch list of categories.
-        """
-        self.client.get("/blog/api/v2/category/")
\ No newline at end of file
+    @task(1)
+    def token_cycle(self):
+        credentials = {"email": self.email, "password": self.password}
+        response = self.expect(
+            "POST", "/accounts/api/v1/token/login/", (200,), data=credentials
+        )
+        if response.status_code != 200:
+            return
+        headers = {"Authorization": f"Token {response.json()['token']}"}
+        # Users sharing the account may have logged the token out already
+        self.expect("GET", "/accounts/api/v1/profile/", (200, 401), headers=headers)
+        self.expect(
+            "POST", "/accounts/api/v1/token/logout/", (204, 401), headers=headers
+        )